@@ -0,0 +1,95 @@
+"""Benchmark of bulk user inserts with random and time-ordered keys.
+
+Run against the development database:
+
+    python -m benchmarks.user_ids --rows 200000 --batch 1000
+
+Both variants insert into identical temporary copies of the `users`
+table (UUID primary key plus unique username and email), so the only
+difference is the key generator.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from typing import Callable
+
+import asyncpg  # type: ignore
+
+from eventapi.config import config
+from eventapi.infrastructure.utils.uuid7 import uuid7
+
+TABLE_DDL = """
+    CREATE TEMPORARY TABLE {name} (
+        id uuid PRIMARY KEY,
+        username varchar UNIQUE,
+        email varchar UNIQUE,
+        password varchar,
+        role varchar
+    )
+"""
+
+
+async def run_variant(
+        connection: asyncpg.Connection,
+        name: str,
+        generate: Callable[[], uuid.UUID],
+        rows: int,
+        batch: int,
+) -> None:
+    """Function inserting the rows and printing the throughput.
+
+    Args:
+        connection (asyncpg.Connection): The DB connection.
+        name (str): The name of the temporary table.
+        generate (Callable[[], uuid.UUID]): The key generator.
+        rows (int): The number of rows to insert.
+        batch (int): The number of rows per transaction.
+    """
+    await connection.execute(TABLE_DDL.format(name=name))
+    query = f"INSERT INTO {name} (id, username, email, password, role) VALUES ($1, $2, $3, $4, $5)"
+
+    started = time.perf_counter()
+    for offset in range(0, rows, batch):
+        records = [
+            (generate(), f"user{i}", f"user{i}@example.com", "x" * 60, "USER")
+            for i in range(offset, min(offset + batch, rows))
+        ]
+        async with connection.transaction():
+            await connection.executemany(query, records)
+    elapsed = time.perf_counter() - started
+
+    index_size = await connection.fetchval(
+        "SELECT pg_relation_size($1::regclass)", f"{name}_pkey"
+    )
+    print(
+        f"{name:>10}: {rows / elapsed:10.0f} rows/s, "
+        f"{elapsed:7.2f} s, pkey {index_size / 1024 / 1024:7.2f} MiB"
+    )
+
+
+async def main() -> None:
+    """The benchmark entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=1_000)
+    args = parser.parse_args()
+
+    host, _, port = (config.DB_HOST or "localhost").partition(":")
+    connection = await asyncpg.connect(
+        host=host,
+        port=int(port or 5432),
+        user=config.DB_USER,
+        password=config.DB_PASSWORD,
+        database=config.DB_NAME,
+    )
+    try:
+        await run_variant(connection, "users_v4", uuid.uuid4, args.rows, args.batch)
+        await run_variant(connection, "users_v7", uuid7, args.rows, args.batch)
+    finally:
+        await connection.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,153 +1,193 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
-from pydantic import UUID4
-
-from eventapi.infrastructure.services.ireview import IReviewService
-from eventapi.infrastructure.services.review import ReviewService
-from eventapi.infrastructure.dto.reviewdto import ReviewDTO
-from eventapi.core.domain.review import ReviewIn, ReviewBroker, Review
-from eventapi.container import Container
-from eventapi.infrastructure.utils import consts
-from jose import jwt
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from dependency_injector.wiring import inject, Provide
-
-bearer_scheme = HTTPBearer()
-
-router = APIRouter()
-
-# Dependency injection: ReviewService
-def get_review_service() -> ReviewService:
-    return Container.review_service()
-
-
-@router.get("/create", response_model=List[ReviewDTO])
-async def get_all_reviews(service: ReviewService = Depends(get_review_service)):
-    """Retrieve all reviews."""
-    return await service.get_all_reviews()
-
-
-@router.get("/review/{review_id}", response_model=ReviewDTO)
-async def get_review_by_id(review_id: int, service: ReviewService = Depends(get_review_service)):
-    """Retrieve a review by its ID."""
-    review = await service.get_review_by_id(review_id)
-    if not review:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Review not found",
-        )
-    return review
-
-
-@router.get("/user/{user_id}", response_model=List[ReviewDTO])
-async def get_reviews_by_user(
-    user_id: UUID4,  # Zmieniono z int na UUID4
-    service: ReviewService = Depends(get_review_service),
-):
-    """Retrieve all reviews by a specific user."""
-    return await service.get_reviews_by_user(user_id)
-
-
-@router.get("/event/{event_id}", response_model=List[ReviewDTO])
-async def get_reviews_by_event(event_id: int, service: ReviewService = Depends(get_review_service)):
-    """Retrieve all reviews for a specific event."""
-    return await service.get_reviews_by_event(event_id)
-
-
-@router.post("/create", response_model=ReviewDTO, status_code=status.HTTP_201_CREATED)
-async def create_review(
-    data: ReviewIn,
-    service: ReviewService = Depends(get_review_service),
-    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-):
-    token = credentials.credentials
-    token_payload = jwt.decode(
-        token,
-        key=consts.SECRET_KEY,
-        algorithms=[consts.ALGORITHM],
-    )
-    user_uuid = token_payload.get("sub")
-
-    if not user_uuid:
-        raise HTTPException(status_code=403, detail="Unauthorized")
-
-    # Extend data with user_id
-    extended_review_data = ReviewBroker(user_id=user_uuid, **data.model_dump())
-    return await service.create_review(extended_review_data)
-
-@router.put("/update/{review_id}", response_model=Review)
-@inject
-async def update_review(
-        review_id: int,
-        updated_review: ReviewIn,
-        service: IReviewService = Depends(Provide[Container.review_service]),
-        credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-) -> dict:
-    """
-    Update a review. Only the owner of the review can perform this operation.
-
-    Args:
-        review_id (int): ID of the review to update.
-        updated_review (ReviewIn): The updated review data.
-        service (IReviewService): Review service.
-        credentials (HTTPAuthorizationCredentials): User credentials.
-
-    Returns:
-        dict: Updated review details.
-    """
-    # Decode token and retrieve user UUID
-    token = credentials.credentials
-    token_payload = jwt.decode(token, key=consts.SECRET_KEY, algorithms=[consts.ALGORITHM])
-    user_uuid = token_payload.get("sub")
-
-    if not user_uuid:
-        raise HTTPException(status_code=403, detail="Unauthorized")
-
-    # Check if review exists and belongs to the user
-    review = await service.get_review_by_id(review_id)
-    if not review:
-        raise HTTPException(status_code=404, detail="Review not found")
-
-    if str(review.user_id) != user_uuid:
-        raise HTTPException(status_code=403, detail="You are not allowed to update this review")
-
-    # Update review
-    updated_review_data = await service.update_review(review_id, ReviewBroker(user_id=user_uuid, **updated_review.model_dump()))
-    return updated_review_data.model_dump() if updated_review_data else {}
-
-@router.delete("/delete/{review_id}", status_code=204)
-@inject
-async def delete_review(
-        review_id: int,
-        service: IReviewService = Depends(Provide[Container.review_service]),
-        credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-):
-    """
-    Delete a review. Only the owner of the review can perform this operation.
-
-    Args:
-        review_id (int): ID of the review to delete.
-        service (IReviewService): Review service.
-        credentials (HTTPAuthorizationCredentials): User credentials.
-
-    Raises:
-        HTTPException: If the review is not found or the user is not authorized.
-    """
-    # Decode token and retrieve user UUID
-    token = credentials.credentials
-    token_payload = jwt.decode(token, key=consts.SECRET_KEY, algorithms=[consts.ALGORITHM])
-    user_uuid = token_payload.get("sub")
-
-    if not user_uuid:
-        raise HTTPException(status_code=403, detail="Unauthorized")
-
-    # Check if review exists and belongs to the user
-    review = await service.get_review_by_id(review_id)
-    if not review:
-        raise HTTPException(status_code=404, detail="Review not found")
-
-    if str(review.user_id) != user_uuid:
-        raise HTTPException(status_code=403, detail="You are not allowed to delete this review")
-
-    # Delete review
-    await service.delete_review(review_id)
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
+from typing import List
+from uuid import UUID
+
+from eventapi.infrastructure.services.ireview import IReviewService
+from eventapi.infrastructure.services.review import ReviewService
+from eventapi.config import config
+from eventapi.infrastructure.dto.reviewdto import BulkReviewResultDTO, ReviewDTO
+from eventapi.core.domain.review import ReviewIn, ReviewBroker, Review
+from eventapi.core.domain.user import Principal
+from eventapi.container import Container
+from eventapi.api.utils.auth import get_current_principal, get_current_user
+from eventapi.infrastructure.dto.userdto import UserDTO
+from eventapi.infrastructure.utils.cursor import decode_cursor, encode_cursor
+from eventapi.api.utils.enums import ReviewOrder
+from dependency_injector.wiring import inject, Provide
+
+router = APIRouter()
+
+# Dependency injection: ReviewService
+def get_review_service() -> ReviewService:
+    return Container.review_service()
+
+
+@router.get("/create", response_model=List[ReviewDTO])
+async def get_all_reviews(service: ReviewService = Depends(get_review_service)):
+    """Retrieve all reviews."""
+    return await service.get_all_reviews()
+
+
+@router.get("/review/{review_id}", response_model=ReviewDTO)
+async def get_review_by_id(review_id: int, service: ReviewService = Depends(get_review_service)):
+    """Retrieve a review by its ID."""
+    review = await service.get_review_by_id(review_id)
+    if not review:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Review not found",
+        )
+    return review
+
+
+@router.get("/user/{user_id}", response_model=List[ReviewDTO])
+async def get_reviews_by_user(
+    user_id: UUID,  # Zmieniono z int na UUID
+    service: ReviewService = Depends(get_review_service),
+):
+    """Retrieve all reviews by a specific user."""
+    return await service.get_reviews_by_user(user_id)
+
+
+@router.get("/event/{event_id}", response_model=List[ReviewDTO])
+async def get_reviews_by_event(event_id: int, service: ReviewService = Depends(get_review_service)):
+    """Retrieve all reviews for a specific event."""
+    return await service.get_reviews_by_event(event_id)
+
+
+@router.get("/event/{event_id}/feed", response_model=List[ReviewDTO])
+async def get_event_review_feed(
+    event_id: int,
+    response: Response,
+    order: ReviewOrder = ReviewOrder.NEWEST,
+    cursor: str | None = Query(None, description="X-Next-Cursor of the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    service: ReviewService = Depends(get_review_service),
+):
+    """Retrieve a page of reviews for a specific event, newest or best rated first."""
+    reviews = await service.get_event_feed(event_id, order, _after(cursor, order), limit + 1)
+    return _page(response, list(reviews), order, limit)
+
+
+@router.get("/user/{user_id}/feed", response_model=List[ReviewDTO])
+async def get_user_review_feed(
+    user_id: UUID,
+    response: Response,
+    order: ReviewOrder = ReviewOrder.NEWEST,
+    cursor: str | None = Query(None, description="X-Next-Cursor of the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    service: ReviewService = Depends(get_review_service),
+):
+    """Retrieve a page of reviews by a specific user, newest or best rated first."""
+    reviews = await service.get_user_feed(user_id, order, _after(cursor, order), limit + 1)
+    return _page(response, list(reviews), order, limit)
+
+
+def _sort_key(review: Review, order: ReviewOrder) -> tuple:
+    """Get the values reviews in the given order are sorted by."""
+    return (review.rating, review.id) if order == ReviewOrder.RATING else (review.id,)
+
+
+def _after(cursor: str | None, order: ReviewOrder) -> tuple | None:
+    """Decode the sort key of the last review of the previous page."""
+    if not cursor:
+        return None
+
+    key = decode_cursor(cursor, 2 if order == ReviewOrder.RATING else 1)
+    if not all(isinstance(value, int) for value in key):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return tuple(key)
+
+
+def _page(response: Response, reviews: list[Review], order: ReviewOrder, limit: int) -> list[Review]:
+    """Trim the extra review fetched past the limit into the next page cursor."""
+    # Jeden wiersz ponad limit mówi, czy istnieje następna strona
+    if len(reviews) > limit:
+        reviews = reviews[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(*_sort_key(reviews[-1], order))
+
+    return reviews
+
+
+@router.post("/create", response_model=ReviewDTO, status_code=status.HTTP_201_CREATED)
+async def create_review(
+    data: ReviewIn,
+    service: ReviewService = Depends(get_review_service),
+    principal: Principal = Depends(get_current_principal),
+):
+    # Extend data with user_id
+    extended_review_data = ReviewBroker(user_id=principal.id, **data.model_dump())
+    return await service.create_review(extended_review_data)
+
+@router.post("/bulk", response_model=List[BulkReviewResultDTO])
+async def create_reviews(
+    data: List[ReviewIn] = Body(..., min_length=1, max_length=config.REVIEW_BULK_MAX_ITEMS),
+    service: ReviewService = Depends(get_review_service),
+    principal: Principal = Depends(get_current_principal),
+):
+    """Create many reviews at once, reporting the status of every item."""
+    return await service.create_reviews(
+        [ReviewBroker(user_id=principal.id, **review.model_dump()) for review in data]
+    )
+
+@router.put("/update/{review_id}", response_model=Review)
+@inject
+async def update_review(
+        review_id: int,
+        updated_review: ReviewIn,
+        service: IReviewService = Depends(Provide[Container.review_service]),
+        user: UserDTO = Depends(get_current_user),
+) -> dict:
+    """
+    Update a review. Only the owner of the review can perform this operation.
+
+    Args:
+        review_id (int): ID of the review to update.
+        updated_review (ReviewIn): The updated review data.
+        service (IReviewService): Review service.
+        user (UserDTO): The authenticated user.
+
+    Returns:
+        dict: Updated review details.
+    """
+    # Check if review exists and belongs to the user
+    review = await service.get_review_by_id(review_id)
+    if not review:
+        raise HTTPException(status_code=404, detail="Review not found")
+
+    if review.user_id != user.id:
+        raise HTTPException(status_code=403, detail="You are not allowed to update this review")
+
+    # Update review
+    updated_review_data = await service.update_review(review_id, ReviewBroker(user_id=user.id, **updated_review.model_dump()))
+    return updated_review_data.model_dump() if updated_review_data else {}
+
+@router.delete("/delete/{review_id}", status_code=204)
+@inject
+async def delete_review(
+        review_id: int,
+        service: IReviewService = Depends(Provide[Container.review_service]),
+        user: UserDTO = Depends(get_current_user),
+):
+    """
+    Delete a review. Only the owner of the review can perform this operation.
+
+    Args:
+        review_id (int): ID of the review to delete.
+        service (IReviewService): Review service.
+        user (UserDTO): The authenticated user.
+
+    Raises:
+        HTTPException: If the review is not found or the user is not authorized.
+    """
+    # Check if review exists and belongs to the user
+    review = await service.get_review_by_id(review_id)
+    if not review:
+        raise HTTPException(status_code=404, detail="Review not found")
+
+    if review.user_id != user.id:
+        raise HTTPException(status_code=403, detail="You are not allowed to delete this review")
+
+    # Delete review
+    await service.delete_review(review_id)
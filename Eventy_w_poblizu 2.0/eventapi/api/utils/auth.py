@@ -0,0 +1,74 @@
+"""A module containing authentication dependencies."""
+
+from dependency_injector.wiring import inject, Provide
+from fastapi import Depends, HTTPException, Security
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from eventapi.api.utils.enums import UserRole
+from eventapi.container import Container
+from eventapi.core.domain.user import Principal
+from eventapi.core.repositories.iuser import IUserRepository
+from eventapi.infrastructure.dto.userdto import UserDTO
+from eventapi.infrastructure.utils.token import decode_access_token
+
+bearer_scheme = HTTPBearer()
+
+
+async def get_current_principal(
+        credentials: HTTPAuthorizationCredentials = Security(bearer_scheme),
+) -> Principal:
+    """A dependency returning the user authenticated by the bearer token.
+
+    Args:
+        credentials (HTTPAuthorizationCredentials): The bearer credentials.
+
+    Raises:
+        HTTPException: 401 if the token is invalid or expired.
+
+    Returns:
+        Principal: The authenticated user.
+    """
+    return decode_access_token(credentials.credentials)
+
+
+@inject
+async def get_current_user(
+        principal: Principal = Depends(get_current_principal),
+        user_repository: IUserRepository = Depends(Provide[Container.user_repository]),
+) -> UserDTO:
+    """A dependency returning the still existing user of the bearer token.
+
+    Args:
+        principal (Principal): The authenticated user.
+        user_repository (IUserRepository): The injected user repository.
+
+    Raises:
+        HTTPException: 401 if the user no longer exists.
+
+    Returns:
+        UserDTO: The user data.
+    """
+    if user := await user_repository.get_principal(principal.id):
+        return user
+
+    raise HTTPException(status_code=401, detail="Invalid token or user not found")
+
+
+async def require_admin(
+        principal: Principal = Depends(get_current_principal),
+) -> Principal:
+    """A dependency allowing only administrators.
+
+    Args:
+        principal (Principal): The authenticated user.
+
+    Raises:
+        HTTPException: 403 if the user is not an administrator.
+
+    Returns:
+        Principal: The authenticated administrator.
+    """
+    if principal.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Forbidden: Admins only")
+
+    return principal
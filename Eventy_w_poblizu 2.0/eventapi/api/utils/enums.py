@@ -1,5 +1,13 @@
-from enum import Enum
-
-class UserRole(str,Enum):
-    USER = "user"
-    ADMIN = "admin"
\ No newline at end of file
+from enum import Enum
+
+class UserRole(str,Enum):
+    USER = "user"
+    ADMIN = "admin"
+
+class EventRanking(str,Enum):
+    RATING = "rating"
+    REVIEWS = "reviews"
+
+class ReviewOrder(str,Enum):
+    NEWEST = "newest"
+    RATING = "rating"
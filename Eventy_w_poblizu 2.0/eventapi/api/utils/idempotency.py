@@ -0,0 +1,153 @@
+"""A module containing the Idempotency-Key middleware."""
+
+import hashlib
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from eventapi.infrastructure.utils import idempotency
+
+IDEMPOTENT_ROUTES = {
+    ("POST", "/event/create"),
+    ("POST", "/location/create"),
+    ("POST", "/router/bulk"),
+    ("POST", "/router/create"),
+    ("POST", "/user/users"),
+}
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyMiddleware:
+    """An ASGI middleware replaying responses of retried create requests.
+
+    The key is scoped by the route and the Authorization header, so
+    clients cannot replay each other's responses. Responses with status
+    below 500 are stored, server errors release the key for a retry.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or (scope["method"], scope["path"]) not in IDEMPOTENT_ROUTES:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        client_key = headers.get("idempotency-key")
+        if client_key is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not client_key or len(client_key) > MAX_KEY_LENGTH:
+            response = JSONResponse({"detail": "Invalid Idempotency-Key"}, status_code=400)
+            await response(scope, receive, send)
+            return
+
+        body, receive = await self._buffer_body(receive)
+        key = hashlib.sha256(
+            "\n".join(
+                (scope["method"], scope["path"], headers.get("authorization", ""), client_key)
+            ).encode()
+        ).hexdigest()
+        request_hash = hashlib.sha256(body).hexdigest()
+
+        if not await idempotency.claim(key, request_hash):
+            await self._replay(key, request_hash, scope, receive, send)
+            return
+
+        status_code = 500
+        response_headers: list[tuple[bytes, bytes]] = []
+        chunks: list[bytes] = []
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_headers
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException:
+            await idempotency.release(key, request_hash)
+            raise
+
+        if status_code >= 500:
+            await idempotency.release(key, request_hash)
+        else:
+            await idempotency.complete(key, request_hash, status_code, response_headers, b"".join(chunks))
+
+    @staticmethod
+    async def _replay(
+            key: str,
+            request_hash: str,
+            scope: Scope,
+            receive: Receive,
+            send: Send,
+    ) -> None:
+        """A private method answering a request whose key is already claimed.
+
+        Args:
+            key (str): The scoped idempotency key.
+            request_hash (str): The hash of the request body.
+            scope (Scope): The ASGI connection scope.
+            receive (Receive): The ASGI receive channel.
+            send (Send): The ASGI send channel.
+        """
+        stored = await idempotency.get_stored(key)
+        if stored is None or stored.status_code is None:
+            response = JSONResponse(
+                {"detail": "A request with this Idempotency-Key is in progress"},
+                status_code=409,
+                headers={"Retry-After": "1"},
+            )
+        elif stored.request_hash != request_hash:
+            response = JSONResponse(
+                {"detail": "Idempotency-Key was already used with a different request"},
+                status_code=422,
+            )
+        else:
+            await send({
+                "type": "http.response.start",
+                "status": stored.status_code,
+                "headers": [*stored.headers, (b"idempotent-replayed", b"true")],
+            })
+            await send({"type": "http.response.body", "body": stored.body})
+            return
+
+        await response(scope, receive, send)
+
+    @staticmethod
+    async def _buffer_body(receive: Receive) -> tuple[bytes, Receive]:
+        """A private method reading the whole request body.
+
+        Args:
+            receive (Receive): The ASGI receive channel.
+
+        Returns:
+            tuple[bytes, Receive]: The body and a channel replaying it.
+        """
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+
+        body = b"".join(chunks)
+        replayed = False
+
+        async def replay() -> Message:
+            nonlocal replayed
+            if replayed:
+                return await receive()
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        return body, replay
@@ -0,0 +1,56 @@
+"""A module containing request-scoped batch loader dependencies."""
+
+from typing import Iterable
+
+from dependency_injector.wiring import inject, Provide
+from fastapi import Depends
+
+from eventapi.config import config
+from eventapi.container import Container
+from eventapi.core.domain.review import Review
+from eventapi.core.repositories.ireview import IReviewRepository
+from eventapi.infrastructure.dto.eventdto import EventDTO
+from eventapi.infrastructure.dto.reviewdto import ReviewDTO
+from eventapi.infrastructure.utils.dataloader import BatchLoader
+
+
+@inject
+def get_review_loader(
+        review_repository: IReviewRepository = Depends(Provide[Container.review_repository]),
+) -> BatchLoader[int, list[Review]]:
+    """A dependency returning the loader of the newest reviews per event.
+
+    FastAPI resolves a dependency once per request, so every consumer in
+    the request shares the loader and its batches.
+
+    Args:
+        review_repository (IReviewRepository): The injected review repository.
+
+    Returns:
+        BatchLoader[int, list[Review]]: The loader keyed by event id.
+    """
+    async def batch(event_ids: list[int]) -> dict[int, list[Review]]:
+        return await review_repository.get_by_event_ids(event_ids, config.EVENT_LIST_REVIEWS)
+
+    return BatchLoader(batch, default=list)
+
+
+async def attach_reviews(
+        events: Iterable[EventDTO],
+        loader: BatchLoader[int, list[Review]],
+) -> list[EventDTO]:
+    """A function filling in the newest reviews of the events.
+
+    Args:
+        events (Iterable[EventDTO]): The events.
+        loader (BatchLoader[int, list[Review]]): The review loader.
+
+    Returns:
+        list[EventDTO]: The events with their reviews.
+    """
+    events = list(events)
+    reviews = await loader.load_many(event.id for event in events)
+    for event, event_reviews in zip(events, reviews):
+        event.reviews = [ReviewDTO.model_validate(review) for review in event_reviews]
+
+    return events
@@ -0,0 +1,163 @@
+"""A module containing the request rate limiting middleware."""
+
+import math
+import time
+from enum import Enum
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from eventapi.config import config
+from eventapi.infrastructure.utils.token import decode_access_token
+
+
+class RouteClass(str, Enum):
+    """Classes of routes sharing a rate limit budget."""
+    AUTH = "auth"
+    WRITE = "write"
+    HEAVY_READ = "heavy_read"
+
+
+AUTH_ROUTES = {("POST", "/user/token"), ("POST", "/user/users")}
+HEAVY_READ_ROUTES = {"/event/all", "/event/recommendations"}
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+def classify(method: str, path: str) -> RouteClass | None:
+    """A function assigning a request to its rate limit class.
+
+    Args:
+        method (str): The HTTP method.
+        path (str): The request path.
+
+    Returns:
+        RouteClass | None: The route class or None if not limited.
+    """
+    if (method, path) in AUTH_ROUTES:
+        return RouteClass.AUTH
+    if method in WRITE_METHODS:
+        return RouteClass.WRITE
+    if method == "GET" and path in HEAVY_READ_ROUTES:
+        return RouteClass.HEAVY_READ
+
+    return None
+
+
+class RateLimiter:
+    """A set of in-memory token buckets refilled lazily on access."""
+
+    def __init__(self, budgets: dict[RouteClass, int], sweep_seconds: float) -> None:
+        """The initializer of the limiter.
+
+        Args:
+            budgets (dict[RouteClass, int]): Requests per minute per class,
+                also used as the burst size.
+            sweep_seconds (float): The interval of dropping idle buckets.
+        """
+        self._budgets = budgets
+        self._sweep_seconds = sweep_seconds
+        self._next_sweep = time.monotonic() + sweep_seconds
+        # klucz -> (dostępne żetony, czas ostatniego uzupełnienia)
+        self._buckets: dict[tuple[RouteClass, str], tuple[float, float]] = {}
+
+    def take(self, route_class: RouteClass, client: str) -> float:
+        """A method consuming one token from the client's bucket.
+
+        Args:
+            route_class (RouteClass): The class of the requested route.
+            client (str): The subject or address of the client.
+
+        Returns:
+            float: 0 if the request is allowed, otherwise seconds until
+                the next token is available.
+        """
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+        capacity = self._budgets[route_class]
+        rate = capacity / 60
+        key = (route_class, client)
+        tokens, updated = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * rate)
+
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) / rate
+
+        self._buckets[key] = (tokens - 1, now)
+        return 0
+
+    def _sweep(self, now: float) -> None:
+        """A private method dropping buckets which would be full by now.
+
+        Args:
+            now (float): The current monotonic time.
+        """
+        self._buckets = {
+            key: (tokens, updated)
+            for key, (tokens, updated) in self._buckets.items()
+            if tokens + (now - updated) * self._budgets[key[0]] / 60 < self._budgets[key[0]]
+        }
+        self._next_sweep = now + self._sweep_seconds
+
+
+class RateLimitMiddleware:
+    """An ASGI middleware rejecting clients exceeding their budgets."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.limiter = RateLimiter(
+            {
+                RouteClass.AUTH: config.RATE_LIMIT_AUTH_PER_MINUTE,
+                RouteClass.WRITE: config.RATE_LIMIT_WRITE_PER_MINUTE,
+                RouteClass.HEAVY_READ: config.RATE_LIMIT_HEAVY_READ_PER_MINUTE,
+            },
+            config.RATE_LIMIT_SWEEP_SECONDS,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route_class = classify(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = self.limiter.take(route_class, self._client(scope, route_class))
+        if retry_after:
+            response = JSONResponse(
+                {"detail": "Too many requests"},
+                status_code=429,
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    def _client(scope: Scope, route_class: RouteClass) -> str:
+        """A private method getting the key of the requesting client.
+
+        Args:
+            scope (Scope): The ASGI connection scope.
+            route_class (RouteClass): The class of the requested route.
+
+        Returns:
+            str: The authenticated subject or the client address.
+        """
+        authorization = Headers(scope=scope).get("authorization", "")
+        scheme, _, token = authorization.partition(" ")
+        if route_class != RouteClass.AUTH and scheme.lower() == "bearer" and token:
+            try:
+                return f"user:{decode_access_token(token).id}"
+            except HTTPException:
+                pass  # nieprawidłowy token odrzuci później zależność auth
+
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
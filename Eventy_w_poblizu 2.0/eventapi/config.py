@@ -1,21 +1,62 @@
-"""A module providing configuration variables."""
-
-from typing import Optional
-from pydantic_settings import BaseSettings
-from pydantic import ConfigDict as SettingsConfigDict
-
-
-class BaseConfig(BaseSettings):
-    """A class containing base settings configuration."""
-    model_config = SettingsConfigDict(extra="ignore")
-
-
-class AppConfig(BaseConfig):
-    """A class containing app's configuration."""
-    DB_HOST: Optional[str] = None
-    DB_NAME: Optional[str] = None
-    DB_USER: Optional[str] = None
-    DB_PASSWORD: Optional[str] = None
-
-
+"""A module providing configuration variables."""
+
+from typing import Optional
+from pydantic_settings import BaseSettings
+from pydantic import ConfigDict as SettingsConfigDict
+
+
+class BaseConfig(BaseSettings):
+    """A class containing base settings configuration."""
+    model_config = SettingsConfigDict(extra="ignore")
+
+
+class AppConfig(BaseConfig):
+    """A class containing app's configuration."""
+    DB_HOST: Optional[str] = None
+    DB_NAME: Optional[str] = None
+    DB_USER: Optional[str] = None
+    DB_PASSWORD: Optional[str] = None
+    DB_FORCE_ROLLBACK: bool = False
+    DB_REPLICA_HOSTS: Optional[str] = None
+    DB_STICKY_PRIMARY_SECONDS: float = 5.0
+    EVENT_PARTITION_MONTHS_AHEAD: int = 3
+    EVENT_PARTITION_RETENTION_MONTHS: int = 12
+    EVENT_PARTITION_MAINTENANCE_SECONDS: int = 3600
+    EVENT_ACTIVE_LOOKBACK_DAYS: int = 31
+    GEO_REGION_PRECISION: int = 2
+    RECOMMENDATION_MAX_RADIUS_KM: float = 500
+    PASSWORD_POOL_SIZE: int = 2
+    PASSWORD_QUEUE_DEPTH: int = 16
+    BCRYPT_ROUNDS: int = 12
+    TOKEN_CACHE_SIZE: int = 10000
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: float = 300
+    USER_CACHE_NEGATIVE_TTL_SECONDS: float = 30
+    SUGGEST_INDEX_REFRESH_SECONDS: int = 300
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_LOCK_SECONDS: int = 60
+    IDEMPOTENCY_PRUNE_SECONDS: int = 3600
+    LEADERBOARD_PRIOR_WEIGHT: float = 10
+    LEADERBOARD_REFRESH_SECONDS: float = 5
+    LEADERBOARD_REFRESH_OVERLAP_SECONDS: int = 60
+    LEADERBOARD_REBUILD_SECONDS: int = 600
+    EVENT_LIST_REVIEWS: int = 5
+    REVIEW_BULK_MAX_ITEMS: int = 500
+    EVENT_COUNTER_FLUSH_SECONDS: float = 0.25
+    TRENDING_HALF_LIFE_SECONDS: float = 3600
+    TRENDING_SKETCH_WIDTH: int = 4096
+    TRENDING_SKETCH_DEPTH: int = 4
+    TRENDING_TOP_K: int = 100
+    TRENDING_SNAPSHOT_SECONDS: int = 60
+    TRENDING_VIEW_WEIGHT: float = 1
+    TRENDING_REVIEW_WEIGHT: float = 5
+    TRENDING_REGISTRATION_WEIGHT: float = 10
+    RATE_LIMIT_AUTH_PER_MINUTE: int = 10
+    RATE_LIMIT_WRITE_PER_MINUTE: int = 60
+    RATE_LIMIT_HEAVY_READ_PER_MINUTE: int = 30
+    RATE_LIMIT_SWEEP_SECONDS: float = 60
+    TOKEN_REVOCATION_PRUNE_SECONDS: float = 3600
+    TOKEN_REVOCATION_RECONNECT_SECONDS: float = 5
+
+
 config = AppConfig()
\ No newline at end of file
@@ -1,42 +1,63 @@
-"""Module providing containers injecting dependencies."""
-
-from dependency_injector.containers import DeclarativeContainer
-from dependency_injector.providers import Factory, Singleton
-
-from eventapi.infrastructure.repositories.user import UserRepository
-from eventapi.infrastructure.repositories.eventdb import \
-    EventRepository
-from eventapi.infrastructure.repositories.locationdb import \
-    LocationRepository
-from eventapi.infrastructure.repositories.reviewdb import ReviewRepository
-
-from eventapi.infrastructure.services.event import EventService
-from eventapi.infrastructure.services.location import LocationService
-from eventapi.infrastructure.services.user import UserService
-from eventapi.infrastructure.services.review import ReviewService
-
-
-class Container(DeclarativeContainer):
-    """Container class for dependency injecting purposes."""
-    location_repository = Singleton(LocationRepository)
-    event_repository = Singleton(EventRepository)
-    user_repository = Singleton(UserRepository)
-    review_repository = Singleton(ReviewRepository)
-
-    location_service = Factory(
-        LocationService,
-        repository=location_repository,
-    )
-
-    event_service = Factory(
-        EventService,
-        repository=event_repository,
-    )
-    user_service = Factory(
-        UserService,
-        repository=user_repository,
-    )
-    review_service = Factory(
-        ReviewService,
-        repository=review_repository,
-    )
+"""Module providing containers injecting dependencies."""
+
+from dependency_injector.containers import DeclarativeContainer
+from dependency_injector.providers import Factory, Singleton
+
+from eventapi.config import config
+from eventapi.infrastructure.repositories.user import UserRepository
+from eventapi.infrastructure.repositories.eventdb import \
+    EventRepository
+from eventapi.infrastructure.repositories.locationdb import \
+    LocationRepository
+from eventapi.infrastructure.repositories.reviewdb import ReviewRepository
+
+from eventapi.infrastructure.services.event import EventService
+from eventapi.infrastructure.services.location import LocationService
+from eventapi.infrastructure.services.user import UserService
+from eventapi.infrastructure.services.review import ReviewService
+from eventapi.infrastructure.utils.cache import ExpiringLRUCache
+from eventapi.infrastructure.utils.counters import CounterBuffer
+from eventapi.infrastructure.utils.leaderboard import Leaderboard
+from eventapi.infrastructure.utils.trending import TrendingSketch
+from eventapi.infrastructure.utils.trie import PrefixIndex
+
+
+class Container(DeclarativeContainer):
+    """Container class for dependency injecting purposes."""
+    location_index = Singleton(PrefixIndex)
+    location_repository = Singleton(LocationRepository, index=location_index)
+    event_repository = Singleton(EventRepository)
+    user_cache = Singleton(ExpiringLRUCache, maxsize=config.USER_CACHE_SIZE)
+    user_index = Singleton(PrefixIndex)
+    user_repository = Singleton(UserRepository, cache=user_cache, index=user_index)
+    review_repository = Singleton(ReviewRepository)
+    leaderboard = Singleton(Leaderboard, prior_weight=config.LEADERBOARD_PRIOR_WEIGHT)
+    event_counters = Singleton(CounterBuffer)
+    trending = Singleton(
+        TrendingSketch,
+        width=config.TRENDING_SKETCH_WIDTH,
+        depth=config.TRENDING_SKETCH_DEPTH,
+        top_k=config.TRENDING_TOP_K,
+        half_life=config.TRENDING_HALF_LIFE_SECONDS,
+    )
+
+    location_service = Factory(
+        LocationService,
+        repository=location_repository,
+    )
+
+    event_service = Factory(
+        EventService,
+        repository=event_repository,
+        leaderboard=leaderboard,
+        trending=trending,
+    )
+    user_service = Factory(
+        UserService,
+        repository=user_repository,
+    )
+    review_service = Factory(
+        ReviewService,
+        repository=review_repository,
+        trending=trending,
+    )
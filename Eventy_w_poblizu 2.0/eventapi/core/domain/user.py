@@ -1,16 +1,29 @@
-"""Module containing user-related domain models."""
-
-from pydantic import BaseModel, ConfigDict, UUID4
-from eventapi.api.utils.enums import UserRole
-
-class UserIn(BaseModel):
-    """Model representing user's DTO attributes."""
-    username: str
-    email: str
-    password: str
-
-class User(UserIn):
-    """Model representing user's attributes in the database."""
-    id: UUID4
-    role: UserRole = UserRole.USER
-    model_config = ConfigDict(from_attributes=True, extra="ignore")
\ No newline at end of file
+"""Module containing user-related domain models."""
+
+from datetime import datetime
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict
+from eventapi.api.utils.enums import UserRole
+
+class UserIn(BaseModel):
+    """Model representing user's DTO attributes."""
+    username: str
+    email: str
+    password: str
+
+class User(UserIn):
+    """Model representing user's attributes in the database."""
+    id: UUID
+    role: UserRole = UserRole.USER
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
+
+
+class Principal(BaseModel):
+    """Model representing the authenticated user of a request."""
+    id: UUID
+    role: UserRole
+    expires: datetime
+    jti: str
+    issued_at: float
+
+    model_config = ConfigDict(frozen=True)
\ No newline at end of file
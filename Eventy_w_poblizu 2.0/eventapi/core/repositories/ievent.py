@@ -1,99 +1,190 @@
-"""Module containing event repository abstractions."""
-
-from abc import ABC, abstractmethod
-from typing import Iterable, Any
-from datetime import datetime
-from eventapi.core.domain.event import EventBroker
-from pydantic import UUID4
-
-class IEventRepository(ABC):
-    """An abstract class representing protocol of event repository."""
-
-    @abstractmethod
-    async def get_all_events(self) -> Iterable[Any]:
-        """The abstract getting all events from the data storage.
-
-        Returns:
-            Iterable[Event]: Events in the data storage.
-        """
-
-    @abstractmethod
-    async def get_by_id(self, event_id: int) -> Any | None:
-        """The abstract getting event by provided id.
-
-        Args:
-            event_id (int): The id of the event.
-
-        Returns:
-            Event | None: The event details.
-        """
-
-    @abstractmethod
-    async def get_by_location(
-        self,
-        location_id: int
-    ) -> Iterable[Any]:
-        """The abstract getting events by location.
-
-        Args:
-            location_id: ide of location
-
-        Returns:
-            Iterable[Any]: The result event collection.
-        """
-
-    @abstractmethod
-    async def get_by_date_range(
-        self,
-        start_date: datetime,
-        end_date: datetime
-    ) -> Iterable[Any]:
-        """The abstract getting events within a date range.
-
-        Args:
-            start_date (datetime): Start date of the range.
-            end_date (datetime): End date of the range.
-
-        Returns:
-            Iterable[Event]: Events in the specified range.
-        """
-
-    @abstractmethod
-    async def add_event(self, data: EventBroker) -> Any | None:
-        """The abstract adding a new event to the data storage.
-
-        Args:
-            data (EventIn): The details of the new event.
-        """
-
-    @abstractmethod
-    async def update_event(self, event_id: int, data: EventBroker) -> Any | None:
-        """The abstract updating event data in the data storage.
-
-        Args:
-            event_id (int): The id of the event.
-            data (EventIn): The updated event details.
-
-        Returns:
-            Event | None: The updated event details.
-        """
-
-    @abstractmethod
-    async def delete_event(self, event_id: int) -> bool:
-        """The abstract removing an event from the data storage.
-
-        Args:
-            event_id (int): The id of the event.
-
-        Returns:
-            bool: Success of the operation.
-        """
-    async def get_by_user(self, user_id: UUID4) -> Iterable[Any]:
-        """The method getting events by user who added them.
-
-        Args:
-            user_id (UUID4): The UUID of the user.
-
-        Returns:
-            Iterable[Event]: The event collection.
-        """
+"""Module containing event repository abstractions."""
+
+from abc import ABC, abstractmethod
+from typing import Iterable, Any
+from datetime import datetime
+from eventapi.core.domain.event import EventBroker
+from uuid import UUID
+
+class IEventRepository(ABC):
+    """An abstract class representing protocol of event repository."""
+
+    @abstractmethod
+    async def get_all_events(self) -> Iterable[Any]:
+        """The abstract getting all events from the data storage.
+
+        Returns:
+            Iterable[Event]: Events in the data storage.
+        """
+
+    @abstractmethod
+    async def get_by_id(self, event_id: int) -> Any | None:
+        """The abstract getting event by provided id.
+
+        Args:
+            event_id (int): The id of the event.
+
+        Returns:
+            Event | None: The event details.
+        """
+
+    @abstractmethod
+    async def get_rating(self, event_id: int) -> Any | None:
+        """The abstract getting the rating aggregates of an event.
+
+        Args:
+            event_id (int): The id of the event.
+
+        Returns:
+            Any | None: The rating aggregates if the event exists.
+        """
+
+    @abstractmethod
+    async def get_by_ids(self, event_ids: list[int]) -> Iterable[Any]:
+        """The abstract getting events by their ids.
+
+        Args:
+            event_ids (list[int]): The ids of the events.
+
+        Returns:
+            Iterable[Event]: The existing events, in no particular order.
+        """
+
+    @abstractmethod
+    async def get_rating_changes(self, since: datetime | None) -> Iterable[Any]:
+        """The abstract getting rating aggregates changed since the moment.
+
+        Args:
+            since (datetime | None): The moment, None for all aggregates.
+
+        Returns:
+            Iterable[Any]: The aggregates with the regions of their events.
+        """
+
+    @abstractmethod
+    async def get_by_location(
+        self,
+        location_id: int
+    ) -> Iterable[Any]:
+        """The abstract getting events by location.
+
+        Args:
+            location_id: ide of location
+
+        Returns:
+            Iterable[Any]: The result event collection.
+        """
+
+    @abstractmethod
+    async def get_by_date_range(
+        self,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Iterable[Any]:
+        """The abstract getting events within a date range.
+
+        Args:
+            start_date (datetime): Start date of the range.
+            end_date (datetime): End date of the range.
+
+        Returns:
+            Iterable[Event]: Events in the specified range.
+        """
+
+    @abstractmethod
+    async def get_events_within_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius: float
+    ) -> Iterable[Any]:
+        """The abstract getting current events around given coordinates.
+
+        Args:
+            latitude (float): The geographical latitude.
+            longitude (float): The geographical longitude.
+            radius (float): The search radius in kilometers.
+
+        Returns:
+            Iterable[Any]: Events within the radius.
+        """
+
+    @abstractmethod
+    async def add_event(self, data: EventBroker) -> Any | None:
+        """The abstract adding a new event to the data storage.
+
+        Args:
+            data (EventIn): The details of the new event.
+        """
+
+    @abstractmethod
+    async def update_event(self, event_id: int, data: EventBroker) -> Any | None:
+        """The abstract updating event data in the data storage.
+
+        Args:
+            event_id (int): The id of the event.
+            data (EventIn): The updated event details.
+
+        Returns:
+            Event | None: The updated event details.
+        """
+
+    @abstractmethod
+    async def register_participant(self, event_id: int, user_id: UUID) -> Any:
+        """The abstract registering a user for an event within its capacity.
+
+        Users who find the event full join its waitlist.
+
+        Args:
+            event_id (int): The id of the event.
+            user_id (UUID): The UUID of the user.
+
+        Returns:
+            Any: The registration details or the waitlist entry.
+        """
+
+    @abstractmethod
+    async def get_waitlist_entry(self, event_id: int, user_id: UUID) -> Any | None:
+        """The abstract getting the place of a user in the waitlist of an event.
+
+        Args:
+            event_id (int): The id of the event.
+            user_id (UUID): The UUID of the user.
+
+        Returns:
+            Any | None: The waitlist entry if the user is waiting.
+        """
+
+    @abstractmethod
+    async def unregister_participant(self, event_id: int, user_id: UUID) -> bool:
+        """The abstract cancelling a registration or leaving the waitlist.
+
+        A freed seat goes to the head of the waitlist.
+
+        Args:
+            event_id (int): The id of the event.
+            user_id (UUID): The UUID of the user.
+
+        Returns:
+            bool: Success of the operation.
+        """
+
+    @abstractmethod
+    async def delete_event(self, event_id: int) -> bool:
+        """The abstract removing an event from the data storage.
+
+        Args:
+            event_id (int): The id of the event.
+
+        Returns:
+            bool: Success of the operation.
+        """
+    async def get_by_user(self, user_id: UUID) -> Iterable[Any]:
+        """The method getting events by user who added them.
+
+        Args:
+            user_id (UUID): The UUID of the user.
+
+        Returns:
+            Iterable[Event]: The event collection.
+        """
@@ -1,94 +1,165 @@
-"""Module containing event repository abstractions."""
-
-from abc import ABC, abstractmethod
-from typing import Iterable, Any
-from datetime import datetime
-from eventapi.core.domain.review import Review, ReviewIn
-from pydantic import UUID4
-
-
-class IReviewRepository(ABC):
-    """An abstract class representing protocol of event repository."""
-
-    @abstractmethod
-    async def get_all_reviews(self) -> Iterable[Any]:
-        """The abstract getting all reviews from the data storage.
-
-        Returns:
-            Iterable[Any]: Reviews in the data storage.
-        """
-
-    @abstractmethod
-    async def get_by_id(self, review_id: int) -> Any | None:
-        """The abstract getting review by provided id.
-
-        Args:
-            review_id (int): The id of the review.
-
-        Returns:
-            Any | None: The review details.
-        """
-
-    @abstractmethod
-    async def get_by_rating(self, rating: int) -> Any | None:
-        """The abstract getting review by rating.
-
-        Args:
-            rating (int): The rating.
-
-        Returns:
-            Any | None: All rating provided.
-        """
-
-    @abstractmethod
-    async def get_by_user(self, user: UUID4) -> Iterable[Any]:
-        """The abstract getting reviews placed by particular user.
-
-        Args:
-            user UUID1: user whose reviews we want to see
-
-        Returns:
-            Iterable[Any]: Reviews by provided user
-        """
-
-    @abstractmethod
-    async def get_by_event_id(self, event_id: int) -> Iterable[Any]:
-        """The abstract getting reviews of particular event.
-
-        Args:
-            event_id (int): event witch reviews we want to see
-
-        Returns:
-            Iterable[Any]: Reviews by event
-        """
-
-    @abstractmethod
-    async def add_review(self, data: ReviewIn) -> Any | None:do
-        """The abstract adding a new event to the data storage.
-
-        Args:
-            data (EventIn): The details of the new event.
-        """
-
-    @abstractmethod
-    async def update_review(self, review_id: int, data: ReviewIn) -> Any | None:
-        """The abstract updating event data in the data storage.
-
-        Args:
-            review_id (int): The id of the review.
-            data (ReviewIn): The updated review details.
-
-        Returns:
-            Any | None: The updated review details.
-        """
-
-    @abstractmethod
-    async def delete_review(self, review_id: int) -> bool:
-        """The abstract removing an event from the data storage.
-
-        Args:
-            review_id (int): The id of the event.
-
-        Returns:
-            bool: Success of the operation.
-        """
+"""Module containing event repository abstractions."""
+
+from abc import ABC, abstractmethod
+from typing import Iterable, Any
+from datetime import datetime
+from eventapi.api.utils.enums import ReviewOrder
+from eventapi.core.domain.review import Review, ReviewIn
+from uuid import UUID
+
+
+class IReviewRepository(ABC):
+    """An abstract class representing protocol of event repository."""
+
+    @abstractmethod
+    async def get_all_reviews(self) -> Iterable[Any]:
+        """The abstract getting all reviews from the data storage.
+
+        Returns:
+            Iterable[Any]: Reviews in the data storage.
+        """
+
+    @abstractmethod
+    async def get_by_id(self, review_id: int) -> Any | None:
+        """The abstract getting review by provided id.
+
+        Args:
+            review_id (int): The id of the review.
+
+        Returns:
+            Any | None: The review details.
+        """
+
+    @abstractmethod
+    async def get_by_rating(self, rating: int) -> Any | None:
+        """The abstract getting review by rating.
+
+        Args:
+            rating (int): The rating.
+
+        Returns:
+            Any | None: All rating provided.
+        """
+
+    @abstractmethod
+    async def get_by_user(self, user: UUID) -> Iterable[Any]:
+        """The abstract getting reviews placed by particular user.
+
+        Args:
+            user UUID1: user whose reviews we want to see
+
+        Returns:
+            Iterable[Any]: Reviews by provided user
+        """
+
+    @abstractmethod
+    async def get_by_event_id(self, event_id: int) -> Iterable[Any]:
+        """The abstract getting reviews of particular event.
+
+        Args:
+            event_id (int): event witch reviews we want to see
+
+        Returns:
+            Iterable[Any]: Reviews by event
+        """
+
+    @abstractmethod
+    async def get_by_event_ids(
+            self,
+            event_ids: list[int],
+            per_event: int | None = None,
+    ) -> dict[int, list[Any]]:
+        """The abstract getting reviews of many events at once.
+
+        Args:
+            event_ids (list[int]): The ids of the events.
+            per_event (int | None, optional): The number of the newest
+                reviews kept per event, None for all of them.
+
+        Returns:
+            dict[int, list[Any]]: Reviews by event id, newest first.
+        """
+
+    @abstractmethod
+    async def get_event_feed(
+            self,
+            event_id: int,
+            order: ReviewOrder,
+            after: tuple | None,
+            limit: int,
+    ) -> Iterable[Any]:
+        """The abstract getting a page of reviews of an event.
+
+        Args:
+            event_id (int): The id of the event.
+            order (ReviewOrder): The order of the reviews.
+            after (tuple | None): The (rating, id) or (id,) key of the last
+                review of the previous page.
+            limit (int): The maximum number of reviews.
+
+        Returns:
+            Iterable[Any]: The reviews in the requested order.
+        """
+
+    @abstractmethod
+    async def get_user_feed(
+            self,
+            user_id: UUID,
+            order: ReviewOrder,
+            after: tuple | None,
+            limit: int,
+    ) -> Iterable[Any]:
+        """The abstract getting a page of reviews written by a user.
+
+        Args:
+            user_id (UUID): The UUID of the user.
+            order (ReviewOrder): The order of the reviews.
+            after (tuple | None): The (rating, id) or (id,) key of the last
+                review of the previous page.
+            limit (int): The maximum number of reviews.
+
+        Returns:
+            Iterable[Any]: The reviews in the requested order.
+        """
+
+    @abstractmethod
+    async def add_review(self, data: ReviewIn) -> Any | None:
+        """The abstract adding a new event to the data storage.
+
+        Args:
+            data (EventIn): The details of the new event.
+        """
+
+    @abstractmethod
+    async def add_reviews(self, data: list[ReviewIn]) -> list[Any]:
+        """The abstract adding many reviews at once.
+
+        Args:
+            data (list[ReviewIn]): The details of the new reviews.
+
+        Returns:
+            list[Any]: The outcome of every review, in the order of `data`.
+        """
+
+    @abstractmethod
+    async def update_review(self, review_id: int, data: ReviewIn) -> Any | None:
+        """The abstract updating event data in the data storage.
+
+        Args:
+            review_id (int): The id of the review.
+            data (ReviewIn): The updated review details.
+
+        Returns:
+            Any | None: The updated review details.
+        """
+
+    @abstractmethod
+    async def delete_review(self, review_id: int) -> bool:
+        """The abstract removing an event from the data storage.
+
+        Args:
+            review_id (int): The id of the event.
+
+        Returns:
+            bool: Success of the operation.
+        """
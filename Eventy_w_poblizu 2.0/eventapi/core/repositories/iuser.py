@@ -1,85 +1,141 @@
-"""Module containing user repository abstractions."""
-
-from abc import ABC, abstractmethod
-from typing import Iterable, Any
-from eventapi.core.domain.user import User, UserIn
-from pydantic import UUID4
-
-
-class IUserRepository(ABC):
-    """An abstract class representing protocol of user repository."""
-
-    @abstractmethod
-    async def register_user(self, user: UserIn) -> Any | None:
-        """A method registering new user.
-
-        Args:
-            user (UserIn): The user input data.
-
-        Returns:
-            Any | None: The new user object.
-        """
-
-    @abstractmethod
-    async def get_by_uuid(self, uuid: UUID4) -> Any | None:
-        """A method getting user by UUID.
-
-        Args:
-            uuid (UUID5): UUID of the user.
-
-        Returns:
-            Any | None: The user object if exists.
-        """
-
-    @abstractmethod
-    async def get_by_username(self, username: str) -> Any | None:
-        """A method getting user by username.
-
-        Args:
-            username: str | name of the user.
-
-        Returns:
-            Any | None: The user object if exists.
-        """
-
-    @abstractmethod
-    async def get_by_email(self, email: str) -> Any | None:
-        """The abstract getting user by email address.
-
-        Args:
-            email (str): The email of the user.
-
-        Returns:
-            User | None: The user details.
-        """
-
-    @abstractmethod
-    async def update_user(self, user_id: UUID4, user_data: UserIn) -> Any | None:
-        """A method to update user data.
-
-        Args:
-            user_id (UUID5): UUID of the user.
-            user_data (UserIn): New data to update the user.
-
-        Returns:
-            Any | None: The updated user object or None if the user does not exist.
-        """
-
-    @abstractmethod
-    async def delete_user(self, user_id: UUID4) -> bool:
-        """A method to delete user by UUID.
-
-        Args:
-            user_id (UUID5): UUID of the user to delete.
-
-        Returns:
-            bool: True if the user was deleted, False if the user does not exist.
-        """
-
-    @abstractmethod
-    async def get_all_users(self) -> Iterable[Any]:
-        """A method to get all users.
-
-        Returns:
-            Iterable[Any]: list of all users.
-        """
\ No newline at end of file
+"""Module containing user repository abstractions."""
+
+from abc import ABC, abstractmethod
+from typing import Iterable, Any
+from eventapi.api.utils.enums import UserRole
+from eventapi.core.domain.user import User, UserIn
+from uuid import UUID
+
+
+class IUserRepository(ABC):
+    """An abstract class representing protocol of user repository."""
+
+    @abstractmethod
+    async def register_user(self, user: UserIn) -> Any | None:
+        """A method registering new user.
+
+        Args:
+            user (UserIn): The user input data with the password hashed.
+
+        Raises:
+            HTTPException: 409 if the email or the username is taken.
+
+        Returns:
+            Any | None: The new user object without the password.
+        """
+
+    @abstractmethod
+    async def get_by_uuid(self, uuid: UUID) -> Any | None:
+        """A method getting user by UUID.
+
+        Args:
+            uuid (UUID): UUID of the user.
+
+        Returns:
+            Any | None: The user object if exists.
+        """
+
+    @abstractmethod
+    async def get_principal(self, user_id: UUID) -> Any | None:
+        """A method getting the public user data for authorization.
+
+        Args:
+            user_id (UUID): UUID of the user.
+
+        Returns:
+            Any | None: The user data without the password if exists.
+        """
+
+    @abstractmethod
+    async def get_by_username(self, username: str) -> Any | None:
+        """A method getting user by username.
+
+        Args:
+            username: str | name of the user.
+
+        Returns:
+            Any | None: The user object if exists.
+        """
+
+    @abstractmethod
+    async def get_by_email(self, email: str) -> Any | None:
+        """The abstract getting user by email address.
+
+        Args:
+            email (str): The email of the user.
+
+        Returns:
+            User | None: The user details.
+        """
+
+    @abstractmethod
+    async def update_user(self, user_id: UUID, user_data: UserIn) -> Any | None:
+        """A method to update user data.
+
+        Args:
+            user_id (UUID): UUID of the user.
+            user_data (UserIn): New data to update the user.
+
+        Returns:
+            Any | None: The updated user object or None if the user does not exist.
+        """
+
+    @abstractmethod
+    async def update_password(self, user_id: UUID, old_hash: str, new_hash: str) -> bool:
+        """A method replacing the password hash if it was not changed meanwhile.
+
+        Args:
+            user_id (UUID): UUID of the user.
+            old_hash (str): The hash the new one replaces.
+            new_hash (str): The new password hash.
+
+        Returns:
+            bool: True if the hash was replaced.
+        """
+
+    @abstractmethod
+    async def delete_user(self, user_id: UUID) -> bool:
+        """A method to delete user by UUID.
+
+        Args:
+            user_id (UUID): UUID of the user to delete.
+
+        Returns:
+            bool: True if the user was deleted, False if the user does not exist.
+        """
+
+    @abstractmethod
+    async def get_all_users(
+            self,
+            after: UUID | None,
+            limit: int,
+            role: UserRole | None = None,
+            username_prefix: str | None = None,
+    ) -> Iterable[Any]:
+        """A method to get a page of users ordered by UUID.
+
+        Args:
+            after (UUID | None): UUID of the last user of the previous page.
+            limit (int): The maximum number of users.
+            role (UserRole | None, optional): The role to filter by.
+            username_prefix (str | None, optional): The prefix of the usernames.
+
+        Returns:
+            Iterable[Any]: The users without passwords.
+        """
+
+    @abstractmethod
+    async def load_suggestions(self) -> None:
+        """The abstract rebuilding the user autocomplete index."""
+
+    @abstractmethod
+    async def suggest(self, prefix: str, limit: int) -> Iterable[Any]:
+        """The abstract getting users whose username starts with the prefix.
+
+        Args:
+            prefix (str): The typed prefix, compared case-insensitively.
+            limit (int): The maximum number of suggestions.
+
+        Returns:
+            Iterable[Any]: The ids and usernames in alphabetical order.
+        """
@@ -1,116 +1,736 @@
-"""A module providing database access."""
-
-import asyncio
-
-import databases
-import sqlalchemy
-from sqlalchemy import UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.exc import OperationalError, DatabaseError
-from sqlalchemy.ext.asyncio import create_async_engine
-from sqlalchemy.ext.mutable import MutableList
-from asyncpg.exceptions import CannotConnectNowError, ConnectionDoesNotExistError
-
-from eventapi.api.utils.enums import UserRole
-from eventapi.config import config
-
-metadata = sqlalchemy.MetaData()
-
-event_table = sqlalchemy.Table(
-    "events",
-    metadata,
-    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
-    sqlalchemy.Column("name", sqlalchemy.String),
-    sqlalchemy.Column("start_time", sqlalchemy.TIMESTAMP(timezone=True)),
-    sqlalchemy.Column("end_time", sqlalchemy.TIMESTAMP(timezone=True)),
-    sqlalchemy.Column(
-        "location_id",
-        sqlalchemy.ForeignKey("locations.id"),
-        nullable=True,
-    ),
-    sqlalchemy.Column("max_participants", sqlalchemy.Integer, nullable=True),
-    sqlalchemy.Column("user_id", sqlalchemy.ForeignKey("users.id"), nullable=False),
-    sqlalchemy.Column("description", sqlalchemy.String, nullable=True),
-)
-
-location_table = sqlalchemy.Table(
-    "locations",
-    metadata,
-    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
-    sqlalchemy.Column("name", sqlalchemy.String),
-    sqlalchemy.Column("latitude", sqlalchemy.Float),
-    sqlalchemy.Column("longitude", sqlalchemy.Float),
-    sqlalchemy.Column("address", sqlalchemy.String, nullable=True),
-    UniqueConstraint("latitude", "longitude", name="unique_location_coordinates"),
-)
-
-review_table = sqlalchemy.Table(
-    "reviews",
-    metadata,
-    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
-    sqlalchemy.Column("content", sqlalchemy.String, nullable=True),
-    sqlalchemy.Column("rating", sqlalchemy.Integer),
-    sqlalchemy.Column(
-        "user_id",
-        sqlalchemy.ForeignKey("users.id"),  # Klucz obcy do tabeli `users`
-        nullable=False,
-    ),
-    sqlalchemy.Column("event_id", sqlalchemy.ForeignKey("events.id"), nullable=False),
-)
-
-user_table = sqlalchemy.Table(
-    "users",
-    metadata,
-    sqlalchemy.Column(
-        "id",
-        UUID(as_uuid=True),
-        primary_key=True,
-        server_default=sqlalchemy.text("gen_random_uuid()"),
-    ),
-    sqlalchemy.Column("username", sqlalchemy.String, unique=True),
-    sqlalchemy.Column("email", sqlalchemy.String, unique=True),
-    sqlalchemy.Column("password", sqlalchemy.String),
-    sqlalchemy.Column("role",sqlalchemy.Enum(UserRole),default=UserRole.USER),
-)
-
-db_uri = (
-    f"postgresql+asyncpg://{config.DB_USER}:{config.DB_PASSWORD}"
-    f"@{config.DB_HOST}/{config.DB_NAME}"
-)
-
-engine = create_async_engine(
-    db_uri,
-    echo=True,
-    future=True,
-    pool_pre_ping=True,
-)
-
-database = databases.Database(
-    db_uri,
-    force_rollback=True,
-)
-
-
-async def init_db(retries: int = 5, delay: int = 5) -> None:
-    """Function initializing the DB.
-
-    Args:
-        retries (int, optional): Number of retries of connect to DB.
-            Defaults to 5.
-        delay (int, optional): Delay of connect do DB. Defaults to 2.
-    """
-    for attempt in range(retries):
-        try:
-            async with engine.begin() as conn:
-                await conn.run_sync(metadata.create_all)
-            return
-        except (
-            OperationalError,
-            DatabaseError,
-            CannotConnectNowError,
-            ConnectionDoesNotExistError,
-        ) as e:
-            print(f"Attempt {attempt + 1} failed: {e}")
-            await asyncio.sleep(delay)
-
+"""A module providing database access."""
+
+import asyncio
+import itertools
+import logging
+import re
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any
+
+import databases
+import sqlalchemy
+from sqlalchemy import UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.exc import OperationalError, DatabaseError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.mutable import MutableList
+from asyncpg.exceptions import (
+    CannotConnectNowError,
+    ConnectionDoesNotExistError,
+    DuplicateTableError,
+    PostgresError,
+)
+
+from eventapi.api.utils.enums import UserRole
+from eventapi.config import config
+
+logger = logging.getLogger(__name__)
+
+metadata = sqlalchemy.MetaData()
+
+# Tabele dzielone na listę regionów (prefiks geohash współrzędnych),
+# wydarzenia dodatkowo miesięcznie po start_time w obrębie regionu.
+# Klucze partycji muszą wchodzić w skład klucza głównego
+location_table = sqlalchemy.Table(
+    "locations",
+    metadata,
+    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True, autoincrement=True),
+    sqlalchemy.Column("region", sqlalchemy.String, primary_key=True),
+    sqlalchemy.Column("name", sqlalchemy.String),
+    sqlalchemy.Column("latitude", sqlalchemy.Float),
+    sqlalchemy.Column("longitude", sqlalchemy.Float),
+    sqlalchemy.Column("address", sqlalchemy.String, nullable=True),
+    # Region wynika ze współrzędnych, więc unikalność się nie zmienia
+    UniqueConstraint("latitude", "longitude", "region", name="unique_location_coordinates"),
+    postgresql_partition_by="LIST (region)",
+)
+
+event_table = sqlalchemy.Table(
+    "events",
+    metadata,
+    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True, autoincrement=True),
+    sqlalchemy.Column("region", sqlalchemy.String, primary_key=True),
+    sqlalchemy.Column("name", sqlalchemy.String),
+    sqlalchemy.Column("start_time", sqlalchemy.TIMESTAMP(timezone=True), primary_key=True),
+    sqlalchemy.Column("end_time", sqlalchemy.TIMESTAMP(timezone=True)),
+    sqlalchemy.Column("location_id", sqlalchemy.Integer, nullable=True),
+    sqlalchemy.Column("max_participants", sqlalchemy.Integer, nullable=True),
+    # Utrzymywany razem z event_participants, limit sprawdza warunkowy UPDATE
+    sqlalchemy.Column("participant_count", sqlalchemy.Integer, nullable=False, server_default="0"),
+    sqlalchemy.Column(
+        "user_id",
+        sqlalchemy.ForeignKey("users.id", onupdate="CASCADE"),
+        nullable=False,
+    ),
+    sqlalchemy.Column("description", sqlalchemy.String, nullable=True),
+    # Zmiana regionu lokalizacji przenosi jej wydarzenia do nowej partycji
+    sqlalchemy.ForeignKeyConstraint(
+        ["location_id", "region"],
+        ["locations.id", "locations.region"],
+        onupdate="CASCADE",
+    ),
+    sqlalchemy.Index("ix_events_location_id_start_time", "location_id", "start_time"),
+    postgresql_partition_by="LIST (region)",
+)
+
+review_table = sqlalchemy.Table(
+    "reviews",
+    metadata,
+    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("content", sqlalchemy.String, nullable=True),
+    sqlalchemy.Column("rating", sqlalchemy.Integer),
+    sqlalchemy.Column(
+        "user_id",
+        sqlalchemy.ForeignKey("users.id", onupdate="CASCADE"),  # Klucz obcy do tabeli `users`
+        nullable=False,
+    ),
+    # Bez klucza obcego: events.id nie jest unikalne samo w sobie w tabeli
+    # partycjonowanej, istnienie wydarzenia sprawdza repozytorium
+    sqlalchemy.Column("event_id", sqlalchemy.Integer, nullable=False),
+    # Stronicowanie kluczem: najnowsze (id) i najlepiej ocenione (rating, id)
+    sqlalchemy.Index("ix_reviews_event_id_id", "event_id", "id"),
+    sqlalchemy.Index("ix_reviews_event_id_rating_id", "event_id", "rating", "id"),
+    sqlalchemy.Index("ix_reviews_user_id_id", "user_id", "id"),
+    sqlalchemy.Index("ix_reviews_user_id_rating_id", "user_id", "rating", "id"),
+)
+
+user_table = sqlalchemy.Table(
+    "users",
+    metadata,
+    sqlalchemy.Column(
+        "id",
+        UUID(as_uuid=True),
+        primary_key=True,
+        # Klucze UUIDv7 nadaje aplikacja, domyślna wartość to tylko fallback
+        server_default=sqlalchemy.text("gen_random_uuid()"),
+    ),
+    sqlalchemy.Column("username", sqlalchemy.String, unique=True),
+    sqlalchemy.Column("email", sqlalchemy.String, unique=True),
+    sqlalchemy.Column("password", sqlalchemy.String),
+    sqlalchemy.Column("role",sqlalchemy.Enum(UserRole),default=UserRole.USER),
+    # LIKE 'prefiks%' korzysta z indeksu niezależnie od collation bazy
+    sqlalchemy.Index(
+        "ix_users_username_pattern",
+        "username",
+        postgresql_ops={"username": "text_pattern_ops"},
+    ),
+)
+
+# Zapisy użytkowników na wydarzenia (bez klucza obcego, jak recenzje)
+event_participant_table = sqlalchemy.Table(
+    "event_participants",
+    metadata,
+    sqlalchemy.Column("event_id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column(
+        "user_id",
+        sqlalchemy.ForeignKey("users.id", onupdate="CASCADE"),
+        primary_key=True,
+    ),
+    sqlalchemy.Column(
+        "registered_at",
+        sqlalchemy.TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=sqlalchemy.func.now(),
+    ),
+    sqlalchemy.Index("ix_event_participants_user_id", "user_id"),
+)
+
+# Kolejka oczekujących na miejsce, kolejność wyznacza rosnące id
+event_waitlist_table = sqlalchemy.Table(
+    "event_waitlist",
+    metadata,
+    sqlalchemy.Column("id", sqlalchemy.BigInteger, primary_key=True, autoincrement=True),
+    sqlalchemy.Column("event_id", sqlalchemy.Integer, nullable=False),
+    sqlalchemy.Column(
+        "user_id",
+        sqlalchemy.ForeignKey("users.id", onupdate="CASCADE"),
+        nullable=False,
+    ),
+    sqlalchemy.Column(
+        "joined_at",
+        sqlalchemy.TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=sqlalchemy.func.now(),
+    ),
+    UniqueConstraint("event_id", "user_id", name="unique_event_waitlist_user"),
+    # Głowa kolejki i liczba osób przed danym wpisem
+    sqlalchemy.Index("ix_event_waitlist_event_id_id", "event_id", "id"),
+)
+
+# Agregaty ocen wydarzeń, aktualizowane w tych samych zapytaniach co recenzje
+event_rating_table = sqlalchemy.Table(
+    "event_ratings",
+    metadata,
+    sqlalchemy.Column("event_id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("review_count", sqlalchemy.Integer, nullable=False, server_default="0"),
+    sqlalchemy.Column("rating_sum", sqlalchemy.BigInteger, nullable=False, server_default="0"),
+    *(
+        sqlalchemy.Column(f"rating_{rating}", sqlalchemy.Integer, nullable=False, server_default="0")
+        for rating in range(1, 6)
+    ),
+    sqlalchemy.Column(
+        "updated_at",
+        sqlalchemy.TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=sqlalchemy.func.now(),
+        index=True,  # przyrostowe odświeżanie rankingów
+    ),
+)
+
+# Zdenormalizowana projekcja wydarzeń do odczytu (lokalizacja, organizator,
+# agregaty), utrzymywana przez wyzwalacze z EVENT_READ_DDL
+event_read_table = sqlalchemy.Table(
+    "event_read",
+    metadata,
+    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("region", sqlalchemy.String, nullable=False),
+    sqlalchemy.Column("name", sqlalchemy.String),
+    sqlalchemy.Column("description", sqlalchemy.String, nullable=True),
+    sqlalchemy.Column("start_time", sqlalchemy.TIMESTAMP(timezone=True), nullable=False),
+    sqlalchemy.Column("end_time", sqlalchemy.TIMESTAMP(timezone=True)),
+    sqlalchemy.Column("location_id", sqlalchemy.Integer, nullable=True),
+    sqlalchemy.Column("location_name", sqlalchemy.String, nullable=True),
+    sqlalchemy.Column("latitude", sqlalchemy.Float, nullable=True),
+    sqlalchemy.Column("longitude", sqlalchemy.Float, nullable=True),
+    sqlalchemy.Column("address", sqlalchemy.String, nullable=True),
+    sqlalchemy.Column("max_participants", sqlalchemy.Integer, nullable=True),
+    sqlalchemy.Column("participant_count", sqlalchemy.Integer, nullable=False, server_default="0"),
+    sqlalchemy.Column("user_id", UUID(as_uuid=True), nullable=False),
+    sqlalchemy.Column("organiser_name", sqlalchemy.String, nullable=True),
+    sqlalchemy.Column("review_count", sqlalchemy.Integer, nullable=False, server_default="0"),
+    sqlalchemy.Column("rating_sum", sqlalchemy.BigInteger, nullable=False, server_default="0"),
+    *(
+        sqlalchemy.Column(f"rating_{rating}", sqlalchemy.Integer, nullable=False, server_default="0")
+        for rating in range(1, 6)
+    ),
+    sqlalchemy.Index("ix_event_read_name", "name"),
+    sqlalchemy.Index("ix_event_read_start_time", "start_time"),
+    sqlalchemy.Index("ix_event_read_region_start_time", "region", "start_time"),
+    sqlalchemy.Index("ix_event_read_location_id_name", "location_id", "name"),
+    sqlalchemy.Index("ix_event_read_user_id_start_time", "user_id", "start_time"),
+)
+
+_RATING_COLUMNS = ["review_count", "rating_sum", *(f"rating_{rating}" for rating in range(1, 6))]
+_EVENT_READ_COLUMNS = [column.name for column in event_read_table.c]
+
+# Funkcje i wyzwalacze projekcji, tworzone przez init_db. Zmiana samego
+# licznika uczestników (częsta przy zapisach) aktualizuje tylko tę kolumnę
+EVENT_READ_DDL = [
+    f"""
+    CREATE OR REPLACE FUNCTION event_read_from_events() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            DELETE FROM event_read WHERE id = OLD.id;
+            RETURN NULL;
+        END IF;
+
+        IF TG_OP = 'UPDATE'
+            AND to_jsonb(NEW) - 'participant_count' = to_jsonb(OLD) - 'participant_count' THEN
+            UPDATE event_read SET participant_count = NEW.participant_count WHERE id = NEW.id;
+            RETURN NULL;
+        END IF;
+
+        INSERT INTO event_read ({", ".join(_EVENT_READ_COLUMNS)})
+        SELECT
+            NEW.id, NEW.region, NEW.name, NEW.description, NEW.start_time, NEW.end_time,
+            NEW.location_id, locations.name, locations.latitude, locations.longitude,
+            locations.address, NEW.max_participants, NEW.participant_count, NEW.user_id,
+            users.username,
+            {", ".join(f"coalesce(event_ratings.{column}, 0)" for column in _RATING_COLUMNS)}
+        FROM (SELECT) AS changed
+        LEFT JOIN locations
+            ON locations.id = NEW.location_id AND locations.region = NEW.region
+        LEFT JOIN users ON users.id = NEW.user_id
+        LEFT JOIN event_ratings ON event_ratings.event_id = NEW.id
+        ON CONFLICT (id) DO UPDATE SET
+            {", ".join(f"{column} = excluded.{column}" for column in _EVENT_READ_COLUMNS[1:])};
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE OR REPLACE TRIGGER event_read_events
+    AFTER INSERT OR UPDATE OR DELETE ON events
+    FOR EACH ROW EXECUTE FUNCTION event_read_from_events()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION event_read_from_locations() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE event_read
+        SET location_name = NEW.name,
+            latitude = NEW.latitude,
+            longitude = NEW.longitude,
+            address = NEW.address
+        WHERE location_id = NEW.id;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE OR REPLACE TRIGGER event_read_locations
+    AFTER UPDATE OF name, latitude, longitude, address ON locations
+    FOR EACH ROW EXECUTE FUNCTION event_read_from_locations()
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION event_read_from_ratings() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            UPDATE event_read
+            SET {", ".join(f"{column} = 0" for column in _RATING_COLUMNS)}
+            WHERE id = OLD.event_id;
+            RETURN NULL;
+        END IF;
+
+        UPDATE event_read
+        SET {", ".join(f"{column} = NEW.{column}" for column in _RATING_COLUMNS)}
+        WHERE id = NEW.event_id;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE OR REPLACE TRIGGER event_read_ratings
+    AFTER INSERT OR UPDATE OR DELETE ON event_ratings
+    FOR EACH ROW EXECUTE FUNCTION event_read_from_ratings()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION event_read_from_users() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE event_read SET organiser_name = NEW.username WHERE user_id = NEW.id;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE OR REPLACE TRIGGER event_read_users
+    AFTER UPDATE OF username ON users
+    FOR EACH ROW WHEN (OLD.username IS DISTINCT FROM NEW.username)
+    EXECUTE FUNCTION event_read_from_users()
+    """,
+]
+
+# Liczniki wyświetleń, zapisywane zbiorczo przez bufor każdego procesu
+event_counter_table = sqlalchemy.Table(
+    "event_counters",
+    metadata,
+    sqlalchemy.Column("event_id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("views", sqlalchemy.BigInteger, nullable=False, server_default="0"),
+    sqlalchemy.Column("impressions", sqlalchemy.BigInteger, nullable=False, server_default="0"),
+    sqlalchemy.Column(
+        "updated_at",
+        sqlalchemy.TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=sqlalchemy.func.now(),
+    ),
+)
+
+# Ostatnia migawka szkicu popularnych wydarzeń, odtwarzana po restarcie
+trending_snapshot_table = sqlalchemy.Table(
+    "trending_snapshots",
+    metadata,
+    sqlalchemy.Column("name", sqlalchemy.String(32), primary_key=True),
+    sqlalchemy.Column("landmark", sqlalchemy.Float(precision=53), nullable=False),
+    sqlalchemy.Column("counters", sqlalchemy.LargeBinary, nullable=False),
+    sqlalchemy.Column("top", sqlalchemy.Text, nullable=False),
+    sqlalchemy.Column("taken_at", sqlalchemy.TIMESTAMP(timezone=True), nullable=False),
+)
+
+# Unieważnione pojedyncze tokeny (wylogowanie), trzymane do ich wygaśnięcia
+revoked_token_table = sqlalchemy.Table(
+    "revoked_tokens",
+    metadata,
+    sqlalchemy.Column("jti", sqlalchemy.String, primary_key=True),
+    sqlalchemy.Column("expires_at", sqlalchemy.TIMESTAMP(timezone=True), nullable=False, index=True),
+)
+
+# Tokeny użytkownika wydane przed revoked_before są nieważne (zmiana hasła,
+# usunięcie konta); bez klucza obcego, wpis przeżywa usunięcie użytkownika
+user_revocation_table = sqlalchemy.Table(
+    "user_revocations",
+    metadata,
+    sqlalchemy.Column("user_id", UUID(as_uuid=True), primary_key=True),
+    sqlalchemy.Column("revoked_before", sqlalchemy.TIMESTAMP(timezone=True), nullable=False, index=True),
+)
+
+# Odpowiedzi zapamiętane dla nagłówka Idempotency-Key; status_code NULL
+# oznacza żądanie w toku, expires_at to koniec blokady lub ważności wpisu
+idempotency_table = sqlalchemy.Table(
+    "idempotency_keys",
+    metadata,
+    sqlalchemy.Column("key", sqlalchemy.String(64), primary_key=True),
+    sqlalchemy.Column("request_hash", sqlalchemy.String(64), nullable=False),
+    sqlalchemy.Column("status_code", sqlalchemy.Integer, nullable=True),
+    sqlalchemy.Column("response_headers", sqlalchemy.Text, nullable=True),
+    sqlalchemy.Column("response_body", sqlalchemy.LargeBinary, nullable=True),
+    sqlalchemy.Column("expires_at", sqlalchemy.TIMESTAMP(timezone=True), nullable=False, index=True),
+)
+
+def _db_uri(host: str | None) -> str:
+    """Function building the DB connection URI for the given host.
+
+    Args:
+        host (str | None): The DB host, optionally with a port.
+
+    Returns:
+        str: The connection URI.
+    """
+    return (
+        f"postgresql+asyncpg://{config.DB_USER}:{config.DB_PASSWORD}"
+        f"@{host}/{config.DB_NAME}"
+    )
+
+
+db_uri = _db_uri(config.DB_HOST)
+
+engine = create_async_engine(
+    db_uri,
+    echo=True,
+    future=True,
+    pool_pre_ping=True,
+)
+
+# Koniec okna "sticky primary" dla bieżącego żądania (czas monotoniczny)
+_primary_until: ContextVar[float] = ContextVar("primary_until", default=0.0)
+
+
+def stick_to_primary() -> None:
+    """Function routing reads of the current request to the primary.
+
+    Called on every statement sent to the primary, so reads following a
+    write in the same request see their own writes despite replica lag.
+    """
+    _primary_until.set(time.monotonic() + config.DB_STICKY_PRIMARY_SECONDS)
+
+
+class PrimaryDatabase(databases.Database):
+    """A primary DB connection opening the sticky-primary window on use."""
+
+    async def execute(self, query: Any, values: dict | None = None) -> Any:
+        stick_to_primary()
+        return await super().execute(query, values)
+
+    async def execute_many(self, query: Any, values: list) -> None:
+        stick_to_primary()
+        return await super().execute_many(query, values)
+
+    async def fetch_one(self, query: Any, values: dict | None = None) -> Any:
+        stick_to_primary()
+        return await super().fetch_one(query, values)
+
+    async def fetch_all(self, query: Any, values: dict | None = None) -> Any:
+        stick_to_primary()
+        return await super().fetch_all(query, values)
+
+
+class ReadDatabase:
+    """A read-only DB facade spreading queries over the read replicas.
+
+    Falls back to the primary when no replica is configured, when the
+    current request is inside its sticky-primary window or when the picked
+    replica cannot be reached.
+    """
+
+    def __init__(
+            self,
+            primary: databases.Database,
+            replicas: list[databases.Database],
+    ) -> None:
+        """The initializer of the read facade.
+
+        Args:
+            primary (databases.Database): The primary DB connection.
+            replicas (list[databases.Database]): The replica connections.
+        """
+        self._primary = primary
+        self._replicas = replicas
+        self._next_replica = itertools.cycle(replicas) if replicas else None
+
+    def _pick(self) -> databases.Database:
+        """A private method choosing the connection for the next read.
+
+        Returns:
+            databases.Database: The replica or the primary connection.
+        """
+        if self._next_replica is None or time.monotonic() < _primary_until.get():
+            return self._primary
+
+        return next(self._next_replica)
+
+    async def _read(self, method: str, query: Any, values: dict | None) -> Any:
+        """A private method running a read on the chosen connection.
+
+        Args:
+            method (str): The name of the `databases.Database` read method.
+            query (Any): The query to run.
+            values (dict | None): The query parameters.
+
+        Returns:
+            Any: The query result.
+        """
+        target = self._pick()
+        try:
+            return await getattr(target, method)(query, values)
+        except (OSError, CannotConnectNowError, ConnectionDoesNotExistError):
+            if target is self._primary:
+                raise
+            return await getattr(self._primary, method)(query, values)
+
+    async def fetch_one(self, query: Any, values: dict | None = None) -> Any:
+        return await self._read("fetch_one", query, values)
+
+    async def fetch_all(self, query: Any, values: dict | None = None) -> Any:
+        return await self._read("fetch_all", query, values)
+
+    async def connect(self) -> None:
+        """A method connecting all the replicas."""
+        for replica in self._replicas:
+            await replica.connect()
+
+    async def disconnect(self) -> None:
+        """A method disconnecting all the replicas."""
+        for replica in self._replicas:
+            await replica.disconnect()
+
+
+database = PrimaryDatabase(
+    db_uri,
+    force_rollback=config.DB_FORCE_ROLLBACK,
+)
+
+read_database = ReadDatabase(
+    database,
+    [
+        databases.Database(_db_uri(host.strip()))
+        for host in (config.DB_REPLICA_HOSTS or "").split(",")
+        if host.strip()
+    ],
+)
+
+
+REGION_NAME = re.compile(r"^[0-9a-z]+$")
+EVENT_PARTITION_NAME = re.compile(
+    r"^events_(?P<region>[0-9a-z]+)_y(?P<year>\d{4})m(?P<month>\d{2})$"
+)
+
+# Partycje, które na pewno istnieją (cache per worker)
+_location_partitions: set[str] = set()
+_event_regions: set[str] = set()
+_event_partitions: set[tuple[str, datetime]] = set()
+
+
+def _month_start(moment: datetime, months: int = 0) -> datetime:
+    """Function getting the beginning of a month in UTC.
+
+    Args:
+        moment (datetime): Any moment within the base month.
+        months (int, optional): Months to shift by. Defaults to 0.
+
+    Returns:
+        datetime: Midnight of the first day of the (shifted) month.
+    """
+    moment = moment.astimezone(timezone.utc) if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+    index = moment.year * 12 + moment.month - 1 + months
+
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def _check_region(region: str) -> str:
+    """Function validating a region key used in partition DDL.
+
+    Args:
+        region (str): The region key.
+
+    Raises:
+        ValueError: If the key cannot be a part of a table name.
+
+    Returns:
+        str: The region key.
+    """
+    if not REGION_NAME.match(region):
+        raise ValueError(f"Invalid region key: {region!r}")
+
+    return region
+
+
+def event_partition_name(region: str, month: datetime) -> str:
+    """Function getting the name of the events partition for a region month.
+
+    Args:
+        region (str): The region key.
+        month (datetime): The first moment of the month.
+
+    Returns:
+        str: The partition table name.
+    """
+    return f"events_{_check_region(region)}_y{month:%Y}m{month:%m}"
+
+
+async def _create_partition(ddl: str) -> None:
+    """Function running partition DDL tolerating concurrent creation.
+
+    Args:
+        ddl (str): The CREATE TABLE ... PARTITION OF statement.
+    """
+    try:
+        await database.execute(sqlalchemy.text(ddl))
+    except DuplicateTableError:
+        pass  # inny worker utworzył partycję w międzyczasie
+
+
+async def _child_tables(parent: str) -> list[str]:
+    """Function getting the names of the partitions attached to a table.
+
+    Args:
+        parent (str): The name of the partitioned table.
+
+    Returns:
+        list[str]: The partition names.
+    """
+    partitions = await database.fetch_all(
+        sqlalchemy.text(
+            "SELECT child.relname AS name FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :parent"
+        ).bindparams(parent=parent)
+    )
+
+    return [partition["name"] for partition in partitions]
+
+
+async def ensure_location_partition(region: str) -> None:
+    """Function creating the locations partition of a region if missing.
+
+    Args:
+        region (str): The region of a location about to be written.
+    """
+    if region in _location_partitions:
+        return
+
+    region = _check_region(region)
+    await _create_partition(
+        f"CREATE TABLE IF NOT EXISTS locations_{region} "
+        f"PARTITION OF locations FOR VALUES IN ('{region}')"
+    )
+    _location_partitions.add(region)
+
+
+async def ensure_event_partition(region: str, moment: datetime) -> None:
+    """Function creating the events partition covering the moment if missing.
+
+    Args:
+        region (str): The region of an event about to be written.
+        moment (datetime): The start time of the event.
+    """
+    month = _month_start(moment)
+    if (region, month) in _event_partitions:
+        return
+
+    region = _check_region(region)
+    if region not in _event_regions:
+        await _create_partition(
+            f"CREATE TABLE IF NOT EXISTS events_{region} "
+            f"PARTITION OF events FOR VALUES IN ('{region}') "
+            f"PARTITION BY RANGE (start_time)"
+        )
+        _event_regions.add(region)
+
+    await _create_partition(
+        f"CREATE TABLE IF NOT EXISTS {event_partition_name(region, month)} "
+        f"PARTITION OF events_{region} FOR VALUES "
+        f"FROM ('{month.isoformat()}') TO ('{_month_start(month, 1).isoformat()}')"
+    )
+    _event_partitions.add((region, month))
+
+
+async def maintain_event_partitions() -> None:
+    """Function creating upcoming events partitions and archiving old ones.
+
+    For every region, partitions for the current month and
+    `EVENT_PARTITION_MONTHS_AHEAD` following ones are created up front.
+    Partitions older than `EVENT_PARTITION_RETENTION_MONTHS` are detached
+    from their region and kept as standalone `events_archive_*` tables.
+    """
+    now = datetime.now(timezone.utc)
+    cutoff = _month_start(now, -config.EVENT_PARTITION_RETENTION_MONTHS)
+
+    for region_table in await _child_tables("events"):
+        region = region_table.removeprefix("events_")
+        for months in range(config.EVENT_PARTITION_MONTHS_AHEAD + 1):
+            await ensure_event_partition(region, _month_start(now, months))
+
+        for name in await _child_tables(region_table):
+            match = EVENT_PARTITION_NAME.match(name)
+            if not match:
+                continue
+
+            month = datetime(int(match["year"]), int(match["month"]), 1, tzinfo=timezone.utc)
+            if month >= cutoff:
+                continue
+
+            archive = name.replace('events_', 'events_archive_', 1)
+            try:
+                # Wszystko albo nic: bez odłączonej partycji z wierszami w projekcji
+                async with database.transaction():
+                    await database.execute(
+                        sqlalchemy.text(f"ALTER TABLE {region_table} DETACH PARTITION {name}")
+                    )
+                    await database.execute(
+                        sqlalchemy.text(f"ALTER TABLE {name} RENAME TO {archive}")
+                    )
+                    # Odłączenie partycji nie uruchamia wyzwalaczy projekcji
+                    await database.execute(
+                        sqlalchemy.text(f"DELETE FROM event_read WHERE id IN (SELECT id FROM {archive})")
+                    )
+            except PostgresError as e:
+                # np. inny worker zarchiwizował już tę partycję
+                logger.warning("Archiving partition %s failed: %s", name, e)
+                continue
+
+            _event_partitions.discard((region, month))
+            logger.info("Archived events partition %s", name)
+
+
+async def run_event_partition_maintenance() -> None:
+    """Function running the partition maintenance on a schedule."""
+    while True:
+        await asyncio.sleep(config.EVENT_PARTITION_MAINTENANCE_SECONDS)
+        try:
+            await maintain_event_partitions()
+        except (OSError, PostgresError) as e:
+            logger.warning("Events partition maintenance failed: %s", e)
+
+
+async def init_db(retries: int = 5, delay: int = 5) -> None:
+    """Function initializing the DB.
+
+    Args:
+        retries (int, optional): Number of retries of connect to DB.
+            Defaults to 5.
+        delay (int, optional): Delay of connect do DB. Defaults to 2.
+    """
+    for attempt in range(retries):
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(metadata.create_all)
+                # Równoległe CREATE OR REPLACE z kilku workerów kończy się błędem
+                await conn.exec_driver_sql("SELECT pg_advisory_xact_lock(hashtext('event_read_ddl'))")
+                for ddl in EVENT_READ_DDL:
+                    await conn.exec_driver_sql(ddl)
+            return
+        except (
+            OperationalError,
+            DatabaseError,
+            CannotConnectNowError,
+            ConnectionDoesNotExistError,
+        ) as e:
+            print(f"Attempt {attempt + 1} failed: {e}")
+            await asyncio.sleep(delay)
+
     raise ConnectionError("Could not connect to DB after several retries.")
\ No newline at end of file
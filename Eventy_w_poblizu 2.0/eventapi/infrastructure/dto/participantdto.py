@@ -0,0 +1,31 @@
+"""A DTO model for event participants."""
+
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ParticipantDTO(BaseModel):
+    """A DTO model for a registration of a user for an event."""
+    event_id: int
+    user_id: UUID
+    registered_at: datetime
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="ignore",
+    )
+
+
+class WaitlistDTO(BaseModel):
+    """A DTO model for a place of a user in the waitlist of an event."""
+    event_id: int
+    user_id: UUID
+    position: int
+    joined_at: datetime
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="ignore",
+    )
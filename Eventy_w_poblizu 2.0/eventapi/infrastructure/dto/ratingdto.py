@@ -0,0 +1,42 @@
+"""A module containing the DTO model of event rating aggregates."""
+
+from typing import Any, Mapping
+
+from pydantic import BaseModel, ConfigDict
+
+RATINGS = range(1, 6)
+
+
+class RatingDTO(BaseModel):
+    """A model representing the rating aggregates of an event."""
+    count: int = 0
+    sum: int = 0
+    average: float | None = None
+    histogram: dict[int, int] = {rating: 0 for rating in RATINGS}
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="ignore",
+    )
+
+    @classmethod
+    def from_record(cls, record: Mapping[str, Any] | None) -> "RatingDTO":
+        """Create a RatingDTO from the aggregate columns of a record.
+
+        Args:
+            record (Mapping[str, Any] | None): The record with
+                `review_count`, `rating_sum` and `rating_1` to `rating_5`
+                columns, None or NULL columns if there are no reviews.
+
+        Returns:
+            RatingDTO: The rating aggregates.
+        """
+        if record is None or not record["review_count"]:
+            return cls()
+
+        return cls(
+            count=record["review_count"],
+            sum=record["rating_sum"],
+            average=record["rating_sum"] / record["review_count"],
+            histogram={rating: record[f"rating_{rating}"] for rating in RATINGS},
+        )
@@ -0,0 +1,17 @@
+"""A module containing autocomplete suggestion DTO model."""
+
+
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict
+
+
+class SuggestionDTO(BaseModel):
+    """A DTO model for a single autocomplete suggestion."""
+
+    id: int | UUID
+    name: str
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="ignore",
+    )
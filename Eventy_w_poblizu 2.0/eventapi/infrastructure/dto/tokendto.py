@@ -1,17 +1,17 @@
-"""A DTO model for token details."""
-
-
-from datetime import datetime
-from pydantic import BaseModel, ConfigDict
-
-
-class TokenDTO(BaseModel):
-    """A DTO model for token details."""
-    token_type: str
-    user_token: str
-    expires: datetime
-
-    model_config = ConfigDict(
-        from_attributes=True,
-        extra="ignore",
+"""A DTO model for token details."""
+
+
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict
+
+
+class TokenDTO(BaseModel):
+    """A DTO model for token details."""
+    token_type: str
+    user_token: str
+    expires: datetime
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="ignore",
     )
\ No newline at end of file
@@ -1,17 +1,21 @@
-"""A module containing user DTO model."""
-
-
-from pydantic import UUID4, BaseModel, ConfigDict
-
-
-class UserDTO(BaseModel):
-    """A DTO model for user."""
-
-    id: UUID4
-    username: str
-    email: str
-
-    model_config = ConfigDict(
-        from_attributes=True,
-        extra="ignore",
+"""A module containing user DTO model."""
+
+
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict
+
+from eventapi.api.utils.enums import UserRole
+
+
+class UserDTO(BaseModel):
+    """A DTO model for user."""
+
+    id: UUID
+    username: str
+    email: str
+    role: UserRole = UserRole.USER
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="ignore",
     )
\ No newline at end of file
@@ -1,329 +1,715 @@
-"""Module containing airport repository implementation."""
-from datetime import timezone, datetime
-from typing import Any, Iterable
-from pydantic import UUID4
-from asyncpg import Record  # type: ignore
-from sqlalchemy import select, join, and_, or_
-from fastapi import HTTPException
-from sqlalchemy.sql import func
-
-from eventapi.core.repositories.ievent import IEventRepository
-from eventapi.core.domain.event import Event, EventBroker
-from eventapi.db import (
-    event_table,
-    location_table,
-    review_table,
-    user_table,
-    database,
-)
-from eventapi.infrastructure.dto.eventdto import EventDTO
-
-
-class EventRepository(IEventRepository):
-    """A class representing continent DB repository."""
-
-    async def get_all_events(self) -> Iterable[Any]:
-        query = (
-            select(
-                event_table.c.id,
-                event_table.c.name,
-                event_table.c.description,
-                event_table.c.start_time,
-                event_table.c.end_time,
-                location_table.c.latitude.label("latitude"),
-                location_table.c.longitude.label("longitude"),
-                location_table.c.id.label("location_id"),
-                location_table.c.name.label("location_name"),
-                event_table.c.max_participants,
-                event_table.c.user_id,
-            )
-            .select_from(
-                join(
-                    event_table,
-                    location_table,
-                    event_table.c.location_id == location_table.c.id
-                )
-            )
-            .order_by(event_table.c.name.asc())
-        )
-
-        events = await database.fetch_all(query)
-
-        # Logowanie wyników
-        for event in events:
-            print(f"Fetched event: {event}")
-
-        return [EventDTO.from_record(event) for event in events]
-
-        # Logowanie wyników
-        for event in events:
-            print(f"Fetched event: {event}")
-
-        return [EventDTO.from_record(event) for event in events]
-
-    async def get_by_location(self, location_id: int) -> Iterable[Any]:
-        """The method getting events assigned to particular location.
-
-        Args:
-            location_id (int): The id of the location.
-
-        Returns:
-            Iterable[Any]: Events assigned to a location.
-        """
-
-        query = (
-            select(event_table)
-            .where(event_table.c.location_id == location_id)
-            .order_by(event_table.c.name.asc())
-        )
-        events = await database.fetch_all(query)
-
-        return [Event(**dict(event)) for event in events]
-
-    async def get_by_id(self, event_id: int) -> Any | None:
-        """The method getting event by provided id.
-
-        Args:
-            event_id (int): The id of the event.
-
-        Returns:
-            Any | None: The event details.
-        """
-
-        query = (
-            select(event_table, location_table)
-            .select_from(
-                join(
-                    event_table,
-                    location_table,
-                    event_table.c.location_id == location_table.c.id  # Poprawny warunek
-                )
-            )
-            .where(event_table.c.id == event_id)
-            .order_by(event_table.c.name.asc())
-        )
-        event = await database.fetch_one(query)
-
-        return EventDTO.from_record(event) if event else None
-
-    async def get_by_date_range(
-            self,
-            start_date: datetime,
-            end_date: datetime
-    ) -> Iterable[Any]:
-        # Konwersja na offset-aware datetime (UTC)
-        start_date = start_date.replace(tzinfo=timezone.utc) if start_date.tzinfo is None else start_date.astimezone(timezone.utc)
-        end_date = end_date.replace(tzinfo=timezone.utc) if end_date.tzinfo is None else end_date.astimezone(timezone.utc)
-
-        query = (
-            select(event_table)
-            .where(event_table.c.start_date <= start_date)
-            .where(event_table.c.end_date > end_date)
-        )
-        return await database.fetch_all(query)
-
-    async def get_by_user(self, user_id: UUID4) -> Iterable[Any]:
-        """The method getting airports by user who added them.
-
-        Args:
-            user_id (int): The id of the user.
-
-        Returns:
-            Iterable[Any]: The airport collection.
-        """
-
-        return []
-
-    from sqlalchemy.sql import func
-
-    async def get_events_within_radius(
-            self, latitude: float, longitude: float, radius: float
-    ) -> Iterable[Event]:
-        """
-        Retrieve events within a certain radius from a given location.
-
-        Args:
-            latitude (float): Latitude of the user's location.
-            longitude (float): Longitude of the user's location.
-            radius (float): Search radius in kilometers.
-
-        Returns:
-            Iterable[Event]: Events within the specified radius.
-        """
-        earth_radius_km = 6371  # Earth's radius in kilometers
-
-        # Haversine formula for calculating distance between two lat/lon points
-        query = (
-            select(
-                event_table.c.id,
-                event_table.c.name,
-                event_table.c.start_time,
-                event_table.c.end_time,
-                location_table.c.latitude.label("location_lat"),
-                location_table.c.longitude.label("location_lon"),
-            )
-            .select_from(
-                join(event_table, location_table, event_table.c.location_id == location_table.c.id)
-            )
-            .where(
-                func.acos(
-                    func.sin(func.radians(latitude)) * func.sin(func.radians(location_table.c.latitude)) +
-                    func.cos(func.radians(latitude)) * func.cos(func.radians(location_table.c.latitude)) *
-                    func.cos(func.radians(location_table.c.longitude) - func.radians(longitude))
-                ) * earth_radius_km <= radius
-            )
-        )
-        events = await database.fetch_all(query)
-        return [Event(**dict(event)) for event in events]
-
-    async def add_event(self, data: EventBroker) -> Any | None:
-        """The method adding new event to the data storage.
-
-            Args:
-                data (EventBroker): The details of the new event.
-
-            Returns:
-                Event: Full details of the newly added event.
-
-        """
-        print(f"Start Time: {data.start_time}, End Time: {data.end_time}")
-        data.start_time = data.start_time.replace(
-            tzinfo=timezone.utc) if data.start_time.tzinfo is None else data.start_time.astimezone(timezone.utc)
-        data.end_time = data.end_time.replace(
-            tzinfo=timezone.utc) if data.end_time.tzinfo is None else data.end_time.astimezone(timezone.utc)
-
-        # Sprawdzanie konfliktów czasowych dla danego location_id
-        conflict_query = (
-            select(event_table)
-            .where(
-                and_(
-                    event_table.c.location_id == data.location_id,
-                    or_(
-                        and_(event_table.c.start_time <= data.start_time, event_table.c.end_time > data.start_time),
-                        and_(event_table.c.start_time < data.end_time, event_table.c.end_time >= data.end_time),
-                        and_(event_table.c.start_time >= data.start_time, event_table.c.end_time <= data.end_time)
-                    )
-                )
-            )
-        )
-
-        conflicting_events = await database.fetch_all(conflict_query)
-        if conflicting_events:
-            raise HTTPException(
-                status_code=400,
-                detail="Event cannot be created. Overlapping events exist for the same location."
-            )
-
-        # Dodanie nowego wydarzenia, jeśli nie ma konfliktów
-        query = event_table.insert().values(**data.model_dump())
-        new_event_id = await database.execute(query)
-        new_event = await self._get_by_id(new_event_id)
-
-        return Event(**dict(new_event)) if new_event else None
-
-    async def update_event(
-            self,
-            event_id: int,
-            data: EventBroker,
-    ) -> Any | None:
-        """The method updating event data in the data storage.
-
-        Args:
-            event_id (int): The id of the event.
-            data (EventBroker): The details of the updated event.
-
-        Returns:
-            Any | None: The updated event details.
-
-        Raises:
-            HTTPException: If the location_id does not exist in the locations table,
-                           or if overlapping events exist for the same location.
-        """
-
-        # Sprawdzenie, czy location_id istnieje
-        location_check_query = select(location_table).where(location_table.c.id == data.location_id)
-        location = await database.fetch_one(location_check_query)
-        if not location:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Location with id {data.location_id} does not exist."
-            )
-
-        # Pobranie istniejących wydarzeń dla tej samej lokalizacji
-        existing_events_query = select(event_table).where(
-            and_(
-                event_table.c.location_id == data.location_id,
-                event_table.c.id != event_id  # Wykluczamy bieżące wydarzenie
-            )
-        )
-        existing_events = await database.fetch_all(existing_events_query)
-
-        # Walidacja nakładania się czasów
-        for existing_event in existing_events:
-            if (
-                    existing_event["start_time"] < data.end_time
-                    and existing_event["end_time"] > data.start_time
-            ):
-                raise HTTPException(
-                    status_code=400,
-                    detail=(
-                        f"Cannot update event with id {event_id}. "
-                        "Overlapping events detected for the same location."
-                    )
-                )
-
-        # Kontynuacja aktualizacji wydarzenia
-        if self._get_by_id(event_id):
-            query = (
-                event_table.update()
-                .where(event_table.c.id == event_id)
-                .values(**data.model_dump())
-            )
-            await database.execute(query)
-
-            event = await self._get_by_id(event_id)
-
-            return Event(**dict(event)) if event else None
-
-        raise HTTPException(
-            status_code=404,
-            detail=f"Event with id {event_id} does not exist."
-        )
-
-    async def delete_event(self, event_id: int) -> bool:
-        """The method updating removing event from the data storage.
-
-        Args:
-            event_id (int): The id of the event.
-
-        Returns:
-            bool: Success of the operation.
-        """
-
-        if self._get_by_id(event_id):
-            query = event_table \
-                .delete() \
-                .where(event_table.c.id == event_id)
-            await database.execute(query)
-
-            return True
-
-        return False
-
-    async def _get_by_id(self, event_id: int) -> Record | None:
-        """A private method getting event from the DB based on its ID.
-
-        Args:
-            event_id (int): The ID of the event.
-
-        Returns:
-            Any | None: Event record if exists.
-        """
-
-        query = (
-            event_table.select()
-            .where(event_table.c.id == event_id)
-            .order_by(event_table.c.name.asc())
-        )
-
+"""Module containing airport repository implementation."""
+from datetime import timedelta, timezone, datetime
+from typing import Any, Iterable
+from uuid import UUID
+from asyncpg import Record  # type: ignore
+from asyncpg.exceptions import CheckViolationError, ForeignKeyViolationError  # type: ignore
+from sqlalchemy import ColumnElement, Select, String, select, join, and_, or_, cast, exists, literal, union_all
+from sqlalchemy.dialects.postgresql import insert
+from fastapi import HTTPException
+from sqlalchemy.sql import func
+
+from eventapi.config import config
+from eventapi.core.repositories.ievent import IEventRepository
+from eventapi.core.domain.event import Event, EventBroker
+from eventapi.db import (
+    event_table,
+    event_rating_table,
+    event_counter_table,
+    event_participant_table,
+    event_waitlist_table,
+    event_read_table,
+    location_table,
+    review_table,
+    user_table,
+    database,
+    read_database,
+    ensure_event_partition,
+)
+from eventapi.infrastructure.dto.eventdto import EventDTO
+from eventapi.infrastructure.dto.participantdto import ParticipantDTO, WaitlistDTO
+from eventapi.infrastructure.dto.ratingdto import RATINGS, RatingDTO
+from eventapi.infrastructure.utils import geohash
+
+
+class EventRepository(IEventRepository):
+    """A class representing continent DB repository."""
+
+    async def get_all_events(self) -> Iterable[Any]:
+        """The method getting all events from the data storage.
+
+        Returns:
+            Iterable[Any]: Events with their locations.
+        """
+
+        query = self._event_reads().order_by(event_read_table.c.name.asc())
+        events = await read_database.fetch_all(query)
+
+        return [EventDTO.from_record(event) for event in events]
+
+    async def get_by_location(self, location_id: int) -> Iterable[Any]:
+        """The method getting events assigned to particular location.
+
+        Args:
+            location_id (int): The id of the location.
+
+        Returns:
+            Iterable[Any]: Events assigned to a location.
+        """
+
+        query = (
+            select(event_read_table)
+            .where(event_read_table.c.location_id == location_id)
+            .order_by(event_read_table.c.name.asc())
+        )
+        events = await read_database.fetch_all(query)
+
+        return [Event(**dict(event)) for event in events]
+
+    async def get_by_id(self, event_id: int) -> Any | None:
+        """The method getting event by provided id.
+
+        Args:
+            event_id (int): The id of the event.
+
+        Returns:
+            Any | None: The event details.
+        """
+
+        # Projekcja nie jest partycjonowana, więc to jeden odczyt po kluczu
+        query = self._event_reads().where(event_read_table.c.id == event_id)
+        event = await read_database.fetch_one(query)
+
+        return EventDTO.from_record(event) if event else None
+
+    async def get_by_ids(self, event_ids: list[int]) -> Iterable[Any]:
+        """The method getting events by their ids.
+
+        Args:
+            event_ids (list[int]): The ids of the events.
+
+        Returns:
+            Iterable[Any]: The existing events, in no particular order.
+        """
+
+        query = self._event_reads().where(event_read_table.c.id.in_(event_ids))
+        events = await read_database.fetch_all(query)
+
+        return [EventDTO.from_record(event) for event in events]
+
+    async def get_rating_changes(self, since: datetime | None) -> Iterable[Any]:
+        """The method getting rating aggregates changed since the moment.
+
+        Args:
+            since (datetime | None): The moment, None for all aggregates.
+
+        Returns:
+            Iterable[Any]: The aggregates with the regions of their events.
+        """
+
+        query = select(
+            event_rating_table.c.event_id,
+            event_read_table.c.region,
+            event_rating_table.c.review_count,
+            event_rating_table.c.rating_sum,
+            event_rating_table.c.updated_at,
+        ).select_from(
+            join(event_rating_table, event_read_table, event_read_table.c.id == event_rating_table.c.event_id)
+        )
+        if since is not None:
+            query = query.where(event_rating_table.c.updated_at > since)
+
+        return await read_database.fetch_all(query)
+
+    async def get_rating(self, event_id: int) -> Any | None:
+        """The method getting the rating aggregates of an event.
+
+        Args:
+            event_id (int): The id of the event.
+
+        Returns:
+            Any | None: The rating aggregates if the event exists.
+        """
+
+        # Projekcja ma zerowe agregaty dla wydarzeń bez recenzji
+        query = select(
+            event_read_table.c.review_count,
+            event_read_table.c.rating_sum,
+            *(event_read_table.c[f"rating_{rating}"] for rating in RATINGS),
+        ).where(event_read_table.c.id == event_id)
+        rating = await read_database.fetch_one(query)
+
+        return RatingDTO.from_record(rating) if rating else None
+
+    async def get_by_date_range(
+            self,
+            start_date: datetime,
+            end_date: datetime
+    ) -> Iterable[Any]:
+        # Konwersja na offset-aware datetime (UTC)
+        start_date = start_date.replace(tzinfo=timezone.utc) if start_date.tzinfo is None else start_date.astimezone(timezone.utc)
+        end_date = end_date.replace(tzinfo=timezone.utc) if end_date.tzinfo is None else end_date.astimezone(timezone.utc)
+
+        query = (
+            select(event_read_table)
+            .where(event_read_table.c.start_time >= start_date)
+            .where(event_read_table.c.start_time < end_date)
+            .order_by(event_read_table.c.start_time.asc())
+        )
+        events = await read_database.fetch_all(query)
+
+        return [Event(**dict(event)) for event in events]
+
+    async def get_by_user(self, user_id: UUID) -> Iterable[Any]:
+        """The method getting airports by user who added them.
+
+        Args:
+            user_id (int): The id of the user.
+
+        Returns:
+            Iterable[Any]: The airport collection.
+        """
+
+        query = (
+            select(event_read_table)
+            .where(event_read_table.c.user_id == user_id)
+            .order_by(event_read_table.c.start_time.asc())
+        )
+        events = await read_database.fetch_all(query)
+
+        return [Event(**dict(event)) for event in events]
+
+    async def get_events_within_radius(
+            self, latitude: float, longitude: float, radius: float
+    ) -> Iterable[Any]:
+        """
+        Retrieve upcoming events within a certain radius from a given location.
+
+        Args:
+            latitude (float): Latitude of the user's location.
+            longitude (float): Longitude of the user's location.
+            radius (float): Search radius in kilometers.
+
+        Returns:
+            Iterable[Any]: Events within the specified radius.
+        """
+        earth_radius_km = geohash.EARTH_RADIUS_KM
+        now = datetime.now(timezone.utc)
+
+        # Haversine formula for calculating distance between two lat/lon points
+        events_read = event_read_table.c
+        query = (
+            self._event_reads()
+            .where(
+                func.acos(
+                    func.least(
+                        1.0,
+                        func.sin(func.radians(latitude)) * func.sin(func.radians(events_read.latitude)) +
+                        func.cos(func.radians(latitude)) * func.cos(func.radians(events_read.latitude)) *
+                        func.cos(func.radians(events_read.longitude) - func.radians(longitude))
+                    )
+                ) * earth_radius_km <= radius
+            )
+            # Dolna granica na start_time zawęża przegląd indeksu (region, start_time)
+            .where(events_read.start_time >= now - timedelta(days=config.EVENT_ACTIVE_LOOKBACK_DAYS))
+            .where(events_read.end_time >= now)
+            .order_by(events_read.start_time.asc())
+        )
+
+        # Tylko regiony nachodzące na okrąg wyszukiwania
+        regions = geohash.covering_cells(latitude, longitude, radius, config.GEO_REGION_PRECISION)
+        if regions is not None:
+            query = query.where(events_read.region.in_(regions))
+
+        events = await read_database.fetch_all(query)
+
+        return [EventDTO.from_record(event) for event in events]
+
+    async def add_event(self, data: EventBroker) -> Any | None:
+        """The method adding new event to the data storage.
+
+            Args:
+                data (EventBroker): The details of the new event.
+
+            Returns:
+                Event: Full details of the newly added event.
+
+        """
+        data.start_time = data.start_time.replace(
+            tzinfo=timezone.utc) if data.start_time.tzinfo is None else data.start_time.astimezone(timezone.utc)
+        data.end_time = data.end_time.replace(
+            tzinfo=timezone.utc) if data.end_time.tzinfo is None else data.end_time.astimezone(timezone.utc)
+
+        # INSERT ... SELECT ... WHERE NOT EXISTS: walidacja konfliktów i zapis
+        # w jednym zapytaniu, region przepisywany z lokalizacji
+        values = data.model_dump()
+        region = self._region_of(data.location_id)
+        candidate = select(
+            *(
+                cast(literal(value, event_table.c[key].type), event_table.c[key].type).label(key)
+                for key, value in values.items()
+            ),
+            region.label("region"),
+        ).where(
+            ~exists(self._overlapping_events(region, data.location_id, data.start_time, data.end_time))
+        )
+        query = (
+            event_table.insert()
+            .from_select([*values, "region"], candidate)
+            .returning(event_table)
+        )
+
+        try:
+            try:
+                new_event = await database.fetch_one(query)
+            except CheckViolationError:
+                # Brak partycji dla regionu i miesiąca: tworzymy i ponawiamy
+                await self._ensure_partition(data.location_id, data.start_time)
+                new_event = await database.fetch_one(query)
+        except ForeignKeyViolationError as exc:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Location with id {data.location_id} does not exist"
+            ) from exc
+
+        if not new_event:
+            raise HTTPException(
+                status_code=400,
+                detail="Event cannot be created. Overlapping events exist for the same location."
+            )
+
+        return Event(**dict(new_event))
+
+    async def update_event(
+            self,
+            event_id: int,
+            data: EventBroker,
+    ) -> Any | None:
+        """The method updating event data in the data storage.
+
+        Args:
+            event_id (int): The id of the event.
+            data (EventBroker): The details of the updated event.
+
+        Returns:
+            Any | None: The updated event details.
+
+        Raises:
+            HTTPException: If the location_id does not exist in the locations table,
+                           or if overlapping events exist for the same location.
+        """
+
+        region = self._region_of(data.location_id)
+        query = (
+            event_table.update()
+            .where(event_table.c.id == event_id)
+            .where(
+                ~exists(
+                    self._overlapping_events(
+                        region,
+                        data.location_id,
+                        data.start_time,
+                        data.end_time,
+                        exclude_event_id=event_id,
+                    )
+                )
+            )
+            .values(**data.model_dump(), region=region)
+            .returning(event_table)
+        )
+
+        try:
+            try:
+                event = await database.fetch_one(query)
+            except CheckViolationError:
+                # Wiersz przenoszony do nieistniejącej jeszcze partycji
+                await self._ensure_partition(data.location_id, data.start_time)
+                event = await database.fetch_one(query)
+        except ForeignKeyViolationError as exc:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Location with id {data.location_id} does not exist."
+            ) from exc
+
+        if event:
+            return Event(**dict(event))
+
+        # Brak wiersza: dopiero teraz ustalamy, czy to konflikt, czy brak wydarzenia
+        if await self._get_by_id(event_id):
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    f"Cannot update event with id {event_id}. "
+                    "Overlapping events detected for the same location."
+                )
+            )
+
+        raise HTTPException(
+            status_code=404,
+            detail=f"Event with id {event_id} does not exist."
+        )
+
+    async def register_participant(self, event_id: int, user_id: UUID) -> Any:
+        """The method registering a user for an event within its capacity.
+
+        The event row is locked first, so sign-ups and cancellations of
+        the event are serialized and a seat freed by a cancellation is
+        either seen here or given to the waitlist, never lost between
+        them. The seat is taken with a conditional UPDATE of the counter,
+        without counting the registrations. Users who find the event full
+        join its waitlist instead, still under the lock.
+
+        Args:
+            event_id (int): The id of the event.
+            user_id (UUID): The UUID of the user.
+
+        Raises:
+            HTTPException: 404 if the event does not exist.
+            HTTPException: 409 if the user is already registered.
+
+        Returns:
+            ParticipantDTO | WaitlistDTO: The registration details, or the
+                waitlist entry if the event is full.
+        """
+
+        async with database.transaction():
+            if not await self._lock_event(event_id):
+                raise HTTPException(status_code=404, detail="Event not found")
+
+            registered = await database.fetch_one(
+                insert(event_participant_table)
+                .values(event_id=event_id, user_id=user_id)
+                .on_conflict_do_nothing()
+                .returning(event_participant_table)
+            )
+            if not registered:
+                raise HTTPException(status_code=409, detail="Already registered for this event")
+
+            seat = (
+                event_table.update()
+                .where(event_table.c.id == event_id)
+                .where(or_(
+                    event_table.c.max_participants.is_(None),
+                    event_table.c.participant_count < event_table.c.max_participants,
+                ))
+                .values(participant_count=event_table.c.participant_count + 1)
+                .returning(event_table.c.id)
+                .cte("seat")
+            )
+            # Zapisany uczestnik opuszcza kolejkę, jeśli w niej czekał
+            dequeued = (
+                event_waitlist_table.delete()
+                .where(event_waitlist_table.c.event_id.in_(select(seat.c.id)))
+                .where(event_waitlist_table.c.user_id == user_id)
+                .returning(event_waitlist_table.c.id)
+                .cte("dequeued")
+            )
+            query = select(seat.c.id).add_cte(dequeued)
+            if await database.fetch_one(query):
+                return ParticipantDTO.model_validate(dict(registered))
+
+            # Brak miejsc: zamiast rejestracji wpis na koniec kolejki
+            await database.execute(
+                event_participant_table.delete()
+                .where(event_participant_table.c.event_id == event_id)
+                .where(event_participant_table.c.user_id == user_id)
+            )
+            await database.execute(
+                insert(event_waitlist_table)
+                .values(event_id=event_id, user_id=user_id)
+                .on_conflict_do_nothing()
+            )
+
+        return await self.get_waitlist_entry(event_id, user_id)
+
+    async def get_waitlist_entry(self, event_id: int, user_id: UUID) -> Any | None:
+        """The method getting the place of a user in the waitlist of an event.
+
+        The entry is found by its unique key and the users ahead are
+        counted on the (event_id, id) index only, without reading the
+        table.
+
+        Args:
+            event_id (int): The id of the event.
+            user_id (UUID): The UUID of the user.
+
+        Returns:
+            WaitlistDTO | None: The waitlist entry if the user is waiting.
+        """
+
+        entry = (
+            select(event_waitlist_table)
+            .where(event_waitlist_table.c.event_id == event_id)
+            .where(event_waitlist_table.c.user_id == user_id)
+            .cte("entry")
+        )
+        ahead = (
+            select(func.count())
+            .where(event_waitlist_table.c.event_id == event_id)
+            .where(event_waitlist_table.c.id < entry.c.id)
+            .scalar_subquery()
+        )
+        query = select(entry, (ahead + 1).label("position"))
+        entry = await database.fetch_one(query)
+
+        return WaitlistDTO.model_validate(dict(entry)) if entry else None
+
+    async def unregister_participant(self, event_id: int, user_id: UUID) -> bool:
+        """The method cancelling a registration or leaving the waitlist.
+
+        A freed seat goes to the head of the waitlist in the same
+        statement, and the counter only changes if nobody was promoted.
+        The event row is locked in an earlier statement, so the waitlist
+        is read after every sign-up holding the lock has committed.
+
+        Args:
+            event_id (int): The id of the event.
+            user_id (UUID): The UUID of the user.
+
+        Returns:
+            bool: Success of the operation.
+        """
+
+        cancelled = event_participant_table \
+            .delete() \
+            .where(event_participant_table.c.event_id == event_id) \
+            .where(event_participant_table.c.user_id == user_id) \
+            .returning(event_participant_table.c.event_id) \
+            .cte("cancelled")
+        left_waitlist = event_waitlist_table \
+            .delete() \
+            .where(event_waitlist_table.c.event_id == event_id) \
+            .where(event_waitlist_table.c.user_id == user_id) \
+            .returning(event_waitlist_table.c.event_id) \
+            .cte("left_waitlist")
+        # Awans tylko, gdy po zwolnieniu miejsca limit nadal jest zachowany
+        # (mógł zostać obniżony poniżej liczby zapisanych)
+        head = select(event_waitlist_table.c.id) \
+            .where(event_waitlist_table.c.event_id.in_(select(cancelled.c.event_id))) \
+            .where(exists().where(
+                event_table.c.id == event_id,
+                or_(
+                    event_table.c.max_participants.is_(None),
+                    event_table.c.participant_count <= event_table.c.max_participants,
+                ),
+            )) \
+            .order_by(event_waitlist_table.c.id) \
+            .limit(1) \
+            .cte("head")
+        promoted = event_waitlist_table \
+            .delete() \
+            .where(event_waitlist_table.c.id.in_(select(head.c.id))) \
+            .returning(event_waitlist_table.c.event_id, event_waitlist_table.c.user_id) \
+            .cte("promoted")
+        joined = insert(event_participant_table) \
+            .from_select(["event_id", "user_id"], select(promoted.c.event_id, promoted.c.user_id)) \
+            .returning(event_participant_table.c.event_id) \
+            .cte("joined")
+        freed = event_table \
+            .update() \
+            .where(event_table.c.id.in_(select(cancelled.c.event_id))) \
+            .where(~exists().select_from(joined)) \
+            .values(participant_count=event_table.c.participant_count - 1) \
+            .returning(event_table.c.id) \
+            .cte("freed")
+        query = union_all(select(cancelled.c.event_id), select(left_waitlist.c.event_id)) \
+            .add_cte(freed)
+
+        async with database.transaction():
+            # Osobne zapytanie: migawka decyzji powstaje dopiero po blokadzie
+            await self._lock_event(event_id)
+            return await database.fetch_one(query) is not None
+
+    async def delete_event(self, event_id: int) -> bool:
+        """The method updating removing event from the data storage.
+
+        Args:
+            event_id (int): The id of the event.
+
+        Returns:
+            bool: Success of the operation.
+        """
+
+        # Recenzje nie mają klucza obcego do partycjonowanej tabeli events,
+        # więc są usuwane w tym samym zapytaniu
+        deleted_event = event_table \
+            .delete() \
+            .where(event_table.c.id == event_id) \
+            .returning(event_table.c.id) \
+            .cte("deleted_event")
+        deleted_reviews = review_table \
+            .delete() \
+            .where(review_table.c.event_id.in_(select(deleted_event.c.id))) \
+            .returning(review_table.c.id) \
+            .cte("deleted_reviews")
+        deleted_rating = event_rating_table \
+            .delete() \
+            .where(event_rating_table.c.event_id.in_(select(deleted_event.c.id))) \
+            .returning(event_rating_table.c.event_id) \
+            .cte("deleted_rating")
+        deleted_counters = event_counter_table \
+            .delete() \
+            .where(event_counter_table.c.event_id.in_(select(deleted_event.c.id))) \
+            .returning(event_counter_table.c.event_id) \
+            .cte("deleted_counters")
+        deleted_participants = event_participant_table \
+            .delete() \
+            .where(event_participant_table.c.event_id.in_(select(deleted_event.c.id))) \
+            .returning(event_participant_table.c.event_id) \
+            .cte("deleted_participants")
+        deleted_waitlist = event_waitlist_table \
+            .delete() \
+            .where(event_waitlist_table.c.event_id.in_(select(deleted_event.c.id))) \
+            .returning(event_waitlist_table.c.event_id) \
+            .cte("deleted_waitlist")
+        query = select(deleted_event.c.id) \
+            .add_cte(deleted_reviews) \
+            .add_cte(deleted_rating) \
+            .add_cte(deleted_counters) \
+            .add_cte(deleted_participants) \
+            .add_cte(deleted_waitlist)
+
+        async with database.transaction():
+            # Osobne zapytanie: FOR UPDATE czeka na zapisy trzymające blokadę
+            # wydarzenia (recenzje, zapisy), a migawka usuwania powstaje po nich
+            await database.execute(
+                select(event_table.c.id)
+                .where(event_table.c.id == event_id)
+                .with_for_update()
+            )
+            return await database.fetch_one(query) is not None
+
+    @staticmethod
+    def _event_reads() -> Select:
+        """A private method building a query of the event read model.
+
+        Events without an existing location are skipped, as `EventDTO`
+        requires one.
+
+        Returns:
+            Select: The query selecting columns expected by `EventDTO`.
+        """
+
+        return select(event_read_table).where(event_read_table.c.location_name.is_not(None))
+
+    @staticmethod
+    def _region_of(location_id: int | None) -> ColumnElement:
+        """A private method building an expression of the event region.
+
+        Args:
+            location_id (int | None): The id of the event location.
+
+        Returns:
+            ColumnElement: The region of the location, NULL if the location
+                does not exist.
+        """
+
+        if location_id is None:
+            return cast(literal(geohash.NO_REGION, String), String)
+
+        return (
+            select(location_table.c.region)
+            .where(location_table.c.id == location_id)
+            .scalar_subquery()
+        )
+
+    @staticmethod
+    async def _ensure_partition(location_id: int | None, start_time: datetime) -> None:
+        """A private method creating the partition for a written event.
+
+        Args:
+            location_id (int | None): The id of the event location.
+            start_time (datetime): The start of the event.
+
+        Raises:
+            HTTPException: If the location does not exist.
+        """
+
+        region = geohash.NO_REGION
+        if location_id is not None:
+            location = await database.fetch_one(
+                select(location_table.c.region).where(location_table.c.id == location_id)
+            )
+            if not location:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Location with id {location_id} does not exist"
+                )
+            region = location["region"]
+
+        await ensure_event_partition(region, start_time)
+
+    @staticmethod
+    def _overlapping_events(
+            region: ColumnElement,
+            location_id: int | None,
+            start_time: datetime,
+            end_time: datetime,
+            exclude_event_id: int | None = None,
+    ) -> Select:
+        """A private method building a query for events overlapping the given slot.
+
+        Args:
+            region (ColumnElement): The region of the location.
+            location_id (int | None): The id of the location.
+            start_time (datetime): The start of the slot.
+            end_time (datetime): The end of the slot.
+            exclude_event_id (int | None): The id of the event to skip.
+
+        Returns:
+            Select: The query selecting ids of the overlapping events.
+        """
+
+        other = event_table.alias("other_events")
+        query = select(other.c.id).where(
+            and_(
+                other.c.region == region,
+                other.c.location_id == location_id,
+                other.c.start_time < end_time,
+                other.c.end_time > start_time,
+            )
+        )
+        if exclude_event_id is not None:
+            query = query.where(other.c.id != exclude_event_id)
+
+        return query
+
+    @staticmethod
+    async def _lock_event(event_id: int) -> bool:
+        """A private method locking the event row until the end of the transaction.
+
+        FOR NO KEY UPDATE conflicts with the seat UPDATE of the counter,
+        but not with reads or foreign key checks.
+
+        Args:
+            event_id (int): The ID of the event.
+
+        Returns:
+            bool: Whether the event exists.
+        """
+
+        query = (
+            select(event_table.c.id)
+            .where(event_table.c.id == event_id)
+            .with_for_update(key_share=True)
+        )
+
+        return await database.fetch_one(query) is not None
+
+    async def _get_by_id(self, event_id: int) -> Record | None:
+        """A private method getting event from the DB based on its ID.
+
+        Args:
+            event_id (int): The ID of the event.
+
+        Returns:
+            Any | None: Event record if exists.
+        """
+
+        query = (
+            event_table.select()
+            .where(event_table.c.id == event_id)
+            .order_by(event_table.c.name.asc())
+        )
+
         return await database.fetch_one(query)
\ No newline at end of file
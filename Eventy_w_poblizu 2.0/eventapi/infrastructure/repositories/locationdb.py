@@ -1,181 +1,274 @@
-"""Module containing continent database repository implementation."""
-
-from typing import Any, Iterable
-
-from asyncpg import Record  # type: ignore
-from sqlalchemy import select
-from fastapi import HTTPException
-from eventapi.core.domain.location import Location, LocationIn
-from eventapi.core.repositories.ilocation import ILocationRepository
-from eventapi.db import location_table, database
-
-
-class LocationRepository(ILocationRepository):
-    """A class implementing the continent repository."""
-
-    async def get_by_id(self, location_id: int) -> Any | None:
-        """The method getting a location from the data storage.
-
-        Args:
-            location_id (int): The id of the location.
-
-        Returns:
-            Any | None: The location data if exists.
-        """
-
-        location = await self._get_by_id(location_id)
-
-        return Location(**dict(location)) if location else None
-
-    async def get_all_locations(self) -> Iterable[Any]:
-        """The method getting all locations from the data storage.
-
-        Returns:
-            Iterable[Any]: The collection of the all locations.
-        """
-
-        query = location_table.select().order_by(location_table.c.name.asc())
-        locations = await database.fetch_all(query)
-
-        return [Location(**dict(location)) for location in locations]
-
-    async def get_by_name(self, location_name: str) -> Any | None:
-        """The abstract getting location by provided id.
-
-        Args:
-            location_name (str): The name of the location.
-
-        Returns:
-            Location | None: The location details.
-        """
-
-        query = location_table \
-            .select() \
-            .where(location_table.c.name == location_name) \
-            .order_by(location_table.c.name.asc())
-        locations = await database.fetch_all(query)
-
-        return [Location(**dict(location)) for location in locations]
-
-    async def get_by_coordinates(
-            self,
-            latitude: float,
-            longitude: float,
-            radius: float
-    ) -> Iterable[Any]:
-        """The abstract getting locations by radius around given coordinates.
-
-        Args:
-            latitude (float): The geographical latitude.
-            longitude (float): The geographical longitude.
-            radius (float): The radius to search.
-
-        Returns:
-            Iterable[Location]: The resulting locations.
-        """
-
-        query = location_table \
-            .select() \
-            .where(location_table.c.latitude == latitude and location_table.c.longtitute == longitude) \
-            .order_by(location_table.c.name.asc())
-        locations = await database.fetch_all(query)
-
-        return [Location(**dict(location)) for location in locations]
-
-    async def add_location(self, data: LocationIn) -> Any | None:
-        """The method adding new location to the data storage.
-
-        Args:
-            data (LocationIn): The attributes of the location.
-
-        Returns:
-            Any | None: The newly created location.
-        """
-
-        # Sprawdzenie czy lokalizacja z takimi współrzędnymi już istnieje
-        query = select(location_table).where(
-            (location_table.c.latitude == data.latitude) &
-            (location_table.c.longitude == data.longitude)
-        )
-        existing_location = await database.fetch_one(query)
-
-        # Jeśli lokalizacja już istnieje, zwróć błąd 400
-        if existing_location:
-            raise HTTPException(
-                status_code=400,
-                detail="Location with these coordinates already exists."
-            )
-
-        # Wstawienie nowej lokalizacji po pozytywnej walidacji
-        query = location_table.insert().values(**data.model_dump())
-        new_location_id = await database.execute(query)
-        new_location = await self._get_by_id(new_location_id)
-
-        return Location(**dict(new_location)) if new_location else None
-
-    async def update_location(
-            self,
-            location_id: int,
-            data: LocationIn,
-    ) -> Any | None:
-        """The method updating location data in the data storage.
-
-        Args:
-            location_id (int): The location id.
-            data (LocationIn): The attributes of the location.
-
-        Returns:
-            Any | None: The updated location.
-        """
-
-        if self._get_by_id(location_id):
-            query = (
-                location_table.update()
-                .where(location_table.c.id == location_id)
-                .values(**data.model_dump())
-            )
-            await database.execute(query)
-
-            location = await self._get_by_id(location_id)
-
-            return Location(**dict(location)) if location else None
-
-        return None
-
-    async def delete_location(self, location_id: int) -> bool:
-        """The method updating removing location from the data storage.
-
-        Args:
-            location_id (int): The location id.
-
-        Returns:
-            bool: Success of the operation.
-        """
-
-        if self._get_by_id(location_id):
-            query = location_table \
-                .delete() \
-                .where(location_table.c.id == location_id)
-            await database.execute(query)
-
-            return True
-
-        return False
-
-    async def _get_by_id(self, location_id: int) -> Record | None:
-        """A private method getting location from the DB based on its ID.
-
-        Args:
-            location_id (int): The ID of the location.
-
-        Returns:
-            Any | None: Locations record if exists.
-        """
-
-        query = (
-            location_table.select()
-            .where(location_table.c.id == location_id)
-            .order_by(location_table.c.name.asc())
-        )
-
-        return await database.fetch_one(query)
+"""Module containing continent database repository implementation."""
+
+from typing import Any, Iterable
+
+from asyncpg import Record  # type: ignore
+from asyncpg.exceptions import CheckViolationError, UniqueViolationError  # type: ignore
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql import func
+from fastapi import HTTPException
+from eventapi.config import config
+from eventapi.core.domain.location import Location, LocationIn
+from eventapi.core.repositories.ilocation import ILocationRepository
+from eventapi.db import (
+    event_table,
+    location_table,
+    database,
+    read_database,
+    ensure_event_partition,
+    ensure_location_partition,
+)
+from eventapi.infrastructure.dto.suggestiondto import SuggestionDTO
+from eventapi.infrastructure.utils import geohash
+from eventapi.infrastructure.utils.trie import PrefixIndex
+
+
+class LocationRepository(ILocationRepository):
+    """A class implementing the continent repository."""
+
+    def __init__(self, index: PrefixIndex) -> None:
+        """The initializer of the repository.
+
+        Args:
+            index (PrefixIndex): The autocomplete index of location names.
+        """
+        self._index = index
+
+    async def get_by_id(self, location_id: int) -> Any | None:
+        """The method getting a location from the data storage.
+
+        Args:
+            location_id (int): The id of the location.
+
+        Returns:
+            Any | None: The location data if exists.
+        """
+
+        location = await self._get_by_id(location_id)
+
+        return Location(**dict(location)) if location else None
+
+    async def get_all_locations(self) -> Iterable[Any]:
+        """The method getting all locations from the data storage.
+
+        Returns:
+            Iterable[Any]: The collection of the all locations.
+        """
+
+        query = location_table.select().order_by(location_table.c.name.asc())
+        locations = await read_database.fetch_all(query)
+
+        return [Location(**dict(location)) for location in locations]
+
+    async def get_by_name(self, location_name: str) -> Any | None:
+        """The abstract getting location by provided id.
+
+        Args:
+            location_name (str): The name of the location.
+
+        Returns:
+            Location | None: The location details.
+        """
+
+        query = location_table \
+            .select() \
+            .where(location_table.c.name == location_name) \
+            .order_by(location_table.c.name.asc())
+        locations = await read_database.fetch_all(query)
+
+        return [Location(**dict(location)) for location in locations]
+
+    async def get_by_coordinates(
+            self,
+            latitude: float,
+            longitude: float,
+            radius: float
+    ) -> Iterable[Any]:
+        """The abstract getting locations by radius around given coordinates.
+
+        Args:
+            latitude (float): The geographical latitude.
+            longitude (float): The geographical longitude.
+            radius (float): The radius to search.
+
+        Returns:
+            Iterable[Location]: The resulting locations.
+        """
+
+        query = location_table \
+            .select() \
+            .where(location_table.c.latitude == latitude and location_table.c.longtitute == longitude) \
+            .order_by(location_table.c.name.asc())
+        locations = await read_database.fetch_all(query)
+
+        return [Location(**dict(location)) for location in locations]
+
+    async def add_location(self, data: LocationIn) -> Any | None:
+        """The method adding new location to the data storage.
+
+        Args:
+            data (LocationIn): The attributes of the location.
+
+        Returns:
+            Any | None: The newly created location.
+        """
+
+        region = self._region(data)
+        await ensure_location_partition(region)
+
+        # Konflikt współrzędnych rozstrzyga unikalny indeks, bez osobnego SELECT
+        query = (
+            insert(location_table)
+            .values(**data.model_dump(), region=region)
+            .on_conflict_do_nothing(constraint="unique_location_coordinates")
+            .returning(location_table)
+        )
+        new_location = await database.fetch_one(query)
+
+        if not new_location:
+            raise HTTPException(
+                status_code=400,
+                detail="Location with these coordinates already exists."
+            )
+
+        self._index.add(new_location["id"], new_location["name"])
+        return Location(**dict(new_location))
+
+    async def update_location(
+            self,
+            location_id: int,
+            data: LocationIn,
+    ) -> Any | None:
+        """The method updating location data in the data storage.
+
+        Args:
+            location_id (int): The location id.
+            data (LocationIn): The attributes of the location.
+
+        Returns:
+            Any | None: The updated location.
+        """
+
+        region = self._region(data)
+        await ensure_location_partition(region)
+
+        # Zmiana regionu przenosi wiersz (i kaskadowo wydarzenia) do innej partycji
+        query = (
+            location_table.update()
+            .where(location_table.c.id == location_id)
+            .values(**data.model_dump(), region=region)
+            .returning(location_table)
+        )
+
+        try:
+            try:
+                location = await database.fetch_one(query)
+            except CheckViolationError:
+                # Brak partycji wydarzeń nowego regionu: tworzymy i ponawiamy
+                await self._ensure_event_partitions(location_id, region)
+                location = await database.fetch_one(query)
+        except UniqueViolationError as exc:
+            raise HTTPException(
+                status_code=400,
+                detail="Location with these coordinates already exists."
+            ) from exc
+
+        if not location:
+            return None
+
+        self._index.add(location["id"], location["name"])
+        return Location(**dict(location))
+
+    async def delete_location(self, location_id: int) -> bool:
+        """The method updating removing location from the data storage.
+
+        Args:
+            location_id (int): The location id.
+
+        Returns:
+            bool: Success of the operation.
+        """
+
+        query = location_table \
+            .delete() \
+            .where(location_table.c.id == location_id) \
+            .returning(location_table.c.id)
+
+        if await database.fetch_one(query) is None:
+            return False
+
+        self._index.discard(location_id)
+        return True
+
+    async def load_suggestions(self) -> None:
+        """The method rebuilding the location autocomplete index."""
+
+        query = select(location_table.c.id, location_table.c.name)
+        locations = await read_database.fetch_all(query)
+
+        self._index.replace((location["id"], location["name"]) for location in locations)
+
+    async def suggest(self, prefix: str, limit: int) -> Iterable[Any]:
+        """The method getting locations whose name starts with the prefix.
+
+        Args:
+            prefix (str): The typed prefix, compared case-insensitively.
+            limit (int): The maximum number of suggestions.
+
+        Returns:
+            Iterable[Any]: The ids and names in alphabetical order.
+        """
+
+        return [
+            SuggestionDTO(id=location_id, name=name)
+            for location_id, name in self._index.search(prefix, limit)
+        ]
+
+    @staticmethod
+    def _region(data: LocationIn) -> str:
+        """A private method deriving the region of a location.
+
+        Args:
+            data (LocationIn): The attributes of the location.
+
+        Returns:
+            str: The region key of the location coordinates.
+        """
+
+        return geohash.encode(data.latitude, data.longitude, config.GEO_REGION_PRECISION)
+
+    @staticmethod
+    async def _ensure_event_partitions(location_id: int, region: str) -> None:
+        """A private method preparing partitions for events moving to a region.
+
+        Args:
+            location_id (int): The id of the location.
+            region (str): The new region of the location.
+        """
+
+        query = select(
+            func.date_trunc("month", func.timezone("UTC", event_table.c.start_time))
+            .label("month")
+        ).where(event_table.c.location_id == location_id).distinct()
+
+        for event_month in await database.fetch_all(query):
+            await ensure_event_partition(region, event_month["month"])
+
+    async def _get_by_id(self, location_id: int) -> Record | None:
+        """A private method getting location from the DB based on its ID.
+
+        Args:
+            location_id (int): The ID of the location.
+
+        Returns:
+            Any | None: Locations record if exists.
+        """
+
+        query = (
+            location_table.select()
+            .where(location_table.c.id == location_id)
+            .order_by(location_table.c.name.asc())
+        )
+
+        return await read_database.fetch_one(query)
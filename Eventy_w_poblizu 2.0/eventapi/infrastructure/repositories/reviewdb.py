@@ -1,102 +1,424 @@
-from typing import Iterable, Any
-from sqlalchemy import select
-from sqlalchemy.exc import NoResultFound
-from fastapi import HTTPException, status
-from eventapi.core.domain.review import Review, ReviewIn
-from eventapi.core.repositories.ireview import IReviewRepository
-from eventapi.db import review_table, event_table, database
-
-
-class ReviewRepository(IReviewRepository):
-    """A class representing the review DB repository."""
-
-    async def get_all_reviews(self) -> Iterable[Any]:
-        """Retrieve all reviews."""
-        query = select(review_table)
-        reviews = await database.fetch_all(query)
-        return [Review(**dict(row)) for row in reviews]
-
-    async def get_by_id(self, review_id: int) -> Review | None:
-        """Retrieve a review by its ID."""
-        query = select(review_table).where(review_table.c.id == review_id)
-        review = await database.fetch_one(query)
-        return Review(**dict(review)) if review else None
-
-    async def get_by_rating(self, rating: int) -> Iterable[Any]:
-        """Retrieve reviews with a specific rating."""
-        query = select(review_table).where(review_table.c.rating == rating)
-        reviews = await database.fetch_all(query)
-        return [Review(**dict(row)) for row in reviews]
-
-    async def get_by_user(self, user_id: str) -> Iterable[Any]:
-        """Retrieve reviews created by a specific user."""
-        query = select(review_table).where(review_table.c.user_id == user_id)
-        reviews = await database.fetch_all(query)
-        return [Review(**dict(row)) for row in reviews]
-
-    async def get_by_event_id(self, event_id: int) -> Iterable[Any]:
-        """Retrieve reviews associated with a specific event."""
-        # Log the incoming event_id for debugging
-        print(f"[DEBUG] Fetching reviews for event_id: {event_id} (type: {type(event_id)})")
-
-        # Correct the query to filter by event_id
-        query = select(review_table).where(review_table.c.event_id == event_id)
-        print(f"[DEBUG] SQL Query: {query}")
-
-        # Execute the query and log raw results
-        reviews = await database.fetch_all(query)
-        print(f"[DEBUG] Raw results from DB: {reviews}")
-
-        # Check if no reviews were found
-        if not reviews:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"No reviews found for event with ID {event_id}",
-            )
-
-        # Map results to Review objects and log them
-        mapped_reviews = [Review(**dict(row)) for row in reviews]
-        print(f"[DEBUG] Mapped reviews: {mapped_reviews}")
-
-        return mapped_reviews
-
-    async def add_review(self, data: ReviewIn) -> Review | None:
-        # Validate event_id exists directly in this method
-        query = select(event_table).where(event_table.c.id == data.event_id)
-        event = await database.fetch_one(query)
-        if not event:
-            raise HTTPException(status_code=400, detail="Invalid event_id")
-
-        # Validate rating
-        if data.rating < 1:
-            raise HTTPException(status_code=400, detail="Rating must be greater than or equal to 1")
-
-        # Insert the review into the database
-        query = review_table.insert().values(
-            content=data.content,
-            rating=data.rating,
-            event_id=data.event_id,
-            user_id=data.user_id,
-        ).returning(review_table)
-        review_id = await database.execute(query)
-        return await self.get_by_id(review_id)
-
-    async def update_review(self, review_id: int, data: ReviewIn) -> Review | None:
-        """Update an existing review."""
-        query = (
-            review_table.update()
-            .where(review_table.c.id == review_id)
-            .values(
-                content=data.content,
-                rating=data.rating,
-                event_id=data.event_id,
-            )
-        )
-        await database.execute(query)
-        return await self.get_by_id(review_id)
-
-    async def delete_review(self, review_id: int) -> bool:
-        """Delete a review."""
-        query = review_table.delete().where(review_table.c.id == review_id)
-        await database.execute(query)
-        return True
+from typing import Iterable, Any
+from uuid import UUID
+from sqlalchemy import CTE, ColumnElement, Exists, Integer, Select, any_, case, cast, exists, literal, select, tuple_, union_all
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.sql import func
+from fastapi import HTTPException, status
+from eventapi.core.domain.review import Review, ReviewIn
+from eventapi.api.utils.enums import ReviewOrder
+from eventapi.core.repositories.ireview import IReviewRepository
+from eventapi.db import review_table, event_table, event_rating_table, database, read_database
+from eventapi.infrastructure.dto.ratingdto import RATINGS
+from eventapi.infrastructure.dto.reviewdto import BulkReviewResultDTO, ReviewDTO
+
+RATING_COUNTERS = ["review_count", "rating_sum", *(f"rating_{rating}" for rating in RATINGS)]
+
+
+class ReviewRepository(IReviewRepository):
+    """A class representing the review DB repository."""
+
+    async def get_all_reviews(self) -> Iterable[Any]:
+        """Retrieve all reviews."""
+        query = select(review_table)
+        reviews = await read_database.fetch_all(query)
+        return [Review(**dict(row)) for row in reviews]
+
+    async def get_by_id(self, review_id: int) -> Review | None:
+        """Retrieve a review by its ID."""
+        query = select(review_table).where(review_table.c.id == review_id)
+        review = await read_database.fetch_one(query)
+        return Review(**dict(review)) if review else None
+
+    async def get_by_rating(self, rating: int) -> Iterable[Any]:
+        """Retrieve reviews with a specific rating."""
+        query = select(review_table).where(review_table.c.rating == rating)
+        reviews = await read_database.fetch_all(query)
+        return [Review(**dict(row)) for row in reviews]
+
+    async def get_by_user(self, user_id: str) -> Iterable[Any]:
+        """Retrieve reviews created by a specific user."""
+        query = select(review_table).where(review_table.c.user_id == user_id)
+        reviews = await read_database.fetch_all(query)
+        return [Review(**dict(row)) for row in reviews]
+
+    async def get_by_event_id(self, event_id: int) -> Iterable[Any]:
+        """Retrieve reviews associated with a specific event."""
+        query = select(review_table).where(review_table.c.event_id == event_id)
+        reviews = await read_database.fetch_all(query)
+
+        # Wydarzenie bez recenzji to pusta lista, nie błąd
+        return [Review(**dict(row)) for row in reviews]
+
+    async def get_by_event_ids(
+            self,
+            event_ids: list[int],
+            per_event: int | None = None,
+    ) -> dict[int, list[Review]]:
+        """Retrieve reviews of many events in a single query.
+
+        Args:
+            event_ids (list[int]): The ids of the events.
+            per_event (int | None, optional): The number of the newest
+                reviews kept per event, None for all of them.
+
+        Returns:
+            dict[int, list[Review]]: Reviews by event id, newest first.
+                Events without reviews are missing.
+        """
+        matching = review_table.c.event_id == any_(literal(event_ids, ARRAY(Integer)))
+        if per_event is None:
+            query = select(review_table).where(matching)
+        else:
+            newest = select(
+                review_table,
+                func.row_number().over(
+                    partition_by=review_table.c.event_id,
+                    order_by=review_table.c.id.desc(),
+                ).label("position"),
+            ).where(matching).subquery("newest")
+            query = select(*(newest.c[column.name] for column in review_table.c)) \
+                .where(newest.c.position <= per_event)
+        query = query.order_by(query.selected_columns.event_id, query.selected_columns.id.desc())
+
+        reviews: dict[int, list[Review]] = {}
+        for row in await read_database.fetch_all(query):
+            reviews.setdefault(row["event_id"], []).append(Review(**dict(row)))
+
+        return reviews
+
+    async def get_event_feed(
+            self,
+            event_id: int,
+            order: ReviewOrder,
+            after: tuple | None,
+            limit: int,
+    ) -> list[Review]:
+        """Retrieve a page of reviews of an event.
+
+        Args:
+            event_id (int): The id of the event.
+            order (ReviewOrder): The order of the reviews.
+            after (tuple | None): The (rating, id) or (id,) key of the last
+                review of the previous page.
+            limit (int): The maximum number of reviews.
+
+        Returns:
+            list[Review]: The reviews in the requested order.
+        """
+        return await self._page(review_table.c.event_id == event_id, order, after, limit)
+
+    async def get_user_feed(
+            self,
+            user_id: UUID,
+            order: ReviewOrder,
+            after: tuple | None,
+            limit: int,
+    ) -> list[Review]:
+        """Retrieve a page of reviews written by a user.
+
+        Args:
+            user_id (UUID): The UUID of the user.
+            order (ReviewOrder): The order of the reviews.
+            after (tuple | None): The (rating, id) or (id,) key of the last
+                review of the previous page.
+            limit (int): The maximum number of reviews.
+
+        Returns:
+            list[Review]: The reviews in the requested order.
+        """
+        return await self._page(review_table.c.user_id == user_id, order, after, limit)
+
+    @staticmethod
+    async def _page(
+            condition: ColumnElement,
+            order: ReviewOrder,
+            after: tuple | None,
+            limit: int,
+    ) -> list[Review]:
+        """A private method reading a page of reviews with a keyset condition.
+
+        Args:
+            condition (ColumnElement): The filter of the feed.
+            order (ReviewOrder): The order of the reviews.
+            after (tuple | None): The sort key of the last review of the
+                previous page.
+            limit (int): The maximum number of reviews.
+
+        Returns:
+            list[Review]: The reviews in the requested order.
+        """
+        if order == ReviewOrder.RATING:
+            key = [review_table.c.rating, review_table.c.id]
+        else:
+            key = [review_table.c.id]
+
+        query = select(review_table).where(condition)
+        if after is not None:
+            # Porównanie krotek pozwala zejść indeksem prosto do następnej strony
+            query = query.where(
+                tuple_(*key) < tuple_(*(
+                    cast(literal(value), column.type) for column, value in zip(key, after)
+                ))
+            )
+        query = query.order_by(*(column.desc() for column in key)).limit(limit)
+
+        reviews = await read_database.fetch_all(query)
+        return [Review(**dict(row)) for row in reviews]
+
+    async def add_review(self, data: ReviewIn) -> Review | None:
+        """Create a review in a single INSERT ... SELECT ... RETURNING round trip."""
+        # Validate rating
+        self._validate_rating(data.rating)
+
+        # Insert the review only if the event exists and stays locked (no FK to partitioned events)
+        values = {
+            "content": data.content,
+            "rating": data.rating,
+            "event_id": data.event_id,
+            "user_id": data.user_id,
+        }
+        candidate = select(
+            *(
+                cast(literal(value, review_table.c[key].type), review_table.c[key].type).label(key)
+                for key, value in values.items()
+            )
+        ).where(self._event_exists(data.event_id))
+        inserted = (
+            review_table.insert()
+            .from_select(list(values), candidate)
+            .returning(review_table)
+            .cte("inserted")
+        )
+        rated = self._update_ratings(
+            self._rating_delta(inserted.c.event_id, inserted.c.rating, 1, inserted),
+        )
+        query = select(inserted).add_cte(rated)
+
+        review = await database.fetch_one(query)
+        if not review:
+            raise HTTPException(status_code=400, detail="Invalid event_id")
+
+        return Review(**dict(review))
+
+    async def add_reviews(self, data: list[ReviewIn]) -> list[BulkReviewResultDTO]:
+        """Create many reviews with one existence check and one multi-row insert.
+
+        Invalid items are reported and skipped, the valid ones are inserted
+        together with their rating aggregates in a single transaction.
+
+        Args:
+            data (list[ReviewIn]): The details of the new reviews.
+
+        Returns:
+            list[BulkReviewResultDTO]: The outcome of every review, in the
+                order of `data`.
+        """
+        results: list[BulkReviewResultDTO | None] = [None] * len(data)
+        async with database.transaction():
+            event_ids = sorted({item.event_id for item in data if item.rating in RATINGS})
+            existing: set[int] = set()
+            if event_ids:
+                # FOR KEY SHARE blokuje usunięcie wydarzeń do końca transakcji
+                query = (
+                    select(event_table.c.id)
+                    .where(event_table.c.id == any_(literal(event_ids, ARRAY(Integer))))
+                    .with_for_update(read=True, key_share=True)
+                )
+                existing = {row["id"] for row in await database.fetch_all(query)}
+
+            valid = []
+            for index, item in enumerate(data):
+                if item.rating not in RATINGS:
+                    detail = "Rating must be between 1 and 5"
+                elif item.event_id not in existing:
+                    detail = "Invalid event_id"
+                else:
+                    valid.append(index)
+                    continue
+                results[index] = BulkReviewResultDTO(index=index, status_code=400, detail=detail)
+
+            if valid:
+                inserted = (
+                    review_table.insert()
+                    .values([
+                        {
+                            "content": data[index].content,
+                            "rating": data[index].rating,
+                            "event_id": data[index].event_id,
+                            "user_id": data[index].user_id,
+                        }
+                        for index in valid
+                    ])
+                    .returning(review_table)
+                    .cte("inserted")
+                )
+                rated = self._update_ratings(
+                    self._rating_delta(inserted.c.event_id, inserted.c.rating, 1, inserted),
+                )
+                query = select(inserted).add_cte(rated).order_by(inserted.c.id)
+
+                # Identyfikatory z sekwencji rosną w kolejności wierszy VALUES
+                for index, review in zip(valid, await database.fetch_all(query)):
+                    results[index] = BulkReviewResultDTO(
+                        index=index,
+                        status_code=201,
+                        review=ReviewDTO.from_record(review),
+                    )
+
+        return results
+
+    async def update_review(self, review_id: int, data: ReviewIn) -> Review | None:
+        """Update an existing review."""
+        self._validate_rating(data.rating)
+
+        # Poprzednia ocena i wydarzenie są potrzebne do korekty agregatów;
+        # FOR UPDATE daje najnowszą wersję wiersza przy równoległych zmianach
+        old = (
+            select(review_table.c.id, review_table.c.event_id, review_table.c.rating)
+            .where(review_table.c.id == review_id)
+            .with_for_update()
+            .cte("old")
+        )
+        updated = (
+            review_table.update()
+            .where(review_table.c.id == old.c.id)
+            .where(self._event_exists(data.event_id))
+            .values(
+                content=data.content,
+                rating=data.rating,
+                event_id=data.event_id,
+            )
+            .returning(
+                *review_table.c,
+                old.c.event_id.label("old_event_id"),
+                old.c.rating.label("old_rating"),
+            )
+            .cte("updated")
+        )
+        rated = self._update_ratings(
+            self._rating_delta(updated.c.old_event_id, updated.c.old_rating, -1, updated),
+            self._rating_delta(updated.c.event_id, updated.c.rating, 1, updated),
+        )
+        query = select(*(updated.c[column.name] for column in review_table.c)).add_cte(rated)
+
+        if review := await database.fetch_one(query):
+            return Review(**dict(review))
+
+        # Brak wiersza: recenzja nie istnieje albo wskazano złe wydarzenie
+        if await self.get_by_id(review_id):
+            raise HTTPException(status_code=400, detail="Invalid event_id")
+
+        return None
+
+    async def delete_review(self, review_id: int) -> bool:
+        """Delete a review."""
+        deleted = (
+            review_table.delete()
+            .where(review_table.c.id == review_id)
+            .returning(review_table.c.id, review_table.c.event_id, review_table.c.rating)
+            .cte("deleted")
+        )
+        rated = self._update_ratings(
+            self._rating_delta(deleted.c.event_id, deleted.c.rating, -1, deleted),
+        )
+        query = select(deleted.c.id).add_cte(rated)
+
+        return await database.fetch_one(query) is not None
+
+    @staticmethod
+    def _validate_rating(rating: int) -> None:
+        """A private method checking the rating bounds declared by `ReviewDTO`.
+
+        Args:
+            rating (int): The rating of the review.
+
+        Raises:
+            HTTPException: 400 if the rating is outside 1-5.
+        """
+        if rating not in RATINGS:
+            raise HTTPException(status_code=400, detail="Rating must be between 1 and 5")
+
+    @staticmethod
+    def _rating_delta(
+            event_id: ColumnElement,
+            rating: ColumnElement,
+            sign: int,
+            source: CTE,
+    ) -> Select:
+        """A private method building the change of rating aggregates.
+
+        Args:
+            event_id (ColumnElement): The event of the changed reviews.
+            rating (ColumnElement): The rating of the changed reviews.
+            sign (int): 1 for added reviews, -1 for removed ones.
+            source (CTE): The statement returning the changed reviews.
+
+        Returns:
+            Select: The query of per-review changes of `RATING_COUNTERS`.
+        """
+        # Jawny typ: parametr bez typu w liście SELECT Postgres uznałby za tekst
+        change = cast(literal(sign), Integer)
+        return select(
+            event_id.label("event_id"),
+            change.label("review_count"),
+            (rating * change).label("rating_sum"),
+            *(
+                case((rating == value, change), else_=0).label(f"rating_{value}")
+                for value in RATINGS
+            ),
+        ).select_from(source)
+
+    @staticmethod
+    def _update_ratings(*deltas: Select) -> CTE:
+        """A private method building the upsert applying rating changes.
+
+        Changes are summed per event first, so one statement can move a
+        review between events without touching a row twice.
+
+        Args:
+            *deltas (Select): The queries built by `_rating_delta`.
+
+        Returns:
+            CTE: The data-modifying CTE to add to the review statement.
+        """
+        changes = (deltas[0] if len(deltas) == 1 else union_all(*deltas)).subquery("changes")
+        summed = select(
+            changes.c.event_id,
+            *(func.sum(changes.c[counter]).label(counter) for counter in RATING_COUNTERS),
+        ).group_by(changes.c.event_id)
+
+        statement = insert(event_rating_table).from_select(["event_id", *RATING_COUNTERS], summed)
+        return statement.on_conflict_do_update(
+            index_elements=[event_rating_table.c.event_id],
+            set_={
+                **{
+                    counter: event_rating_table.c[counter] + statement.excluded[counter]
+                    for counter in RATING_COUNTERS
+                },
+                "updated_at": func.now(),
+            },
+        ).returning(event_rating_table.c.event_id).cte("rated")
+
+    @staticmethod
+    def _event_exists(event_id: int) -> Exists:
+        """A private method building a check that the event exists.
+
+        The event row is locked FOR KEY SHARE, like in `add_reviews`, so the
+        event cannot be deleted before the statement's transaction ends.
+        This replaces the foreign key that partitioned events cannot have.
+
+        Args:
+            event_id (int): The id of the event.
+
+        Returns:
+            Exists: The EXISTS clause.
+        """
+        locked_event = (
+            select(event_table.c.id)
+            .where(event_table.c.id == event_id)
+            .with_for_update(read=True, key_share=True)
+            .cte("locked_event")
+        )
+
+        return exists(select(locked_event.c.id))
@@ -1,133 +1,321 @@
-"""A repository for user entity."""
-
-from typing import Iterable, Any
-from sqlalchemy import select
-from pydantic import UUID4
-
-from eventapi.core.domain.user import UserIn
-from eventapi.core.repositories.iuser import IUserRepository
-from eventapi.db import database, user_table
-from eventapi.api.utils.enums import UserRole
-from eventapi.infrastructure.utils.password import hash_password
-
-
-class UserRepository(IUserRepository):
-    """An implementation of repository class for user."""
-
-
-    async def get_user_id_by_uuid(self, user_uuid: str) -> int | None:
-        query = select(user_table.c.id).where(user_table.c.uuid == user_uuid)
-        result = await database.fetch_one(query)
-        if result:
-            return result["id"]  # Zwracamy int, który jest ID użytkownika
-        return None
-
-    async def register_user(self, user: UserIn) -> Any | None:
-        """Rejestracja użytkownika."""
-
-        # Sprawdzenie, czy użytkownik już istnieje
-        if await self.get_by_email(user.email):
-            return None
-
-
-        # Przygotowanie danych do zapisu
-        user_data = user.model_dump()
-        user_data["role"] = UserRole.USER.value
-
-        query = user_table.insert().values(**user_data)
-        new_user_uuid = await database.execute(query)
-
-
-        return await self.get_by_uuid(new_user_uuid)
-
-    async def get_by_uuid(self, uuid: UUID4) -> Any | None:
-        """A method getting user by UUID.
-
-        Args:
-            uuid (UUID5): UUID of the user.
-
-        Returns:
-            Any | None: The user object if exists.
-        """
-
-        query = user_table \
-            .select() \
-            .where(user_table.c.id == uuid)
-        user = await database.fetch_one(query)
-
-        return user
-
-    async def get_by_email(self, email: str) -> Any | None:
-        """A method getting user by email.
-
-        Args:
-            email (str): The email of the user.
-
-        Returns:
-            Any | None: The user object if exists.
-        """
-
-        query = user_table \
-            .select() \
-            .where(user_table.c.email == email)
-        user = await database.fetch_one(query)
-
-        return user
-
-    async def get_by_username(self, username: str) -> Any | None:
-        query = user_table.select().where(user_table.c.username == username)
-        return await database.fetch_one(query)
-
-    async def update_user(self, user_id: UUID4, user_data: UserIn) -> Any | None:
-        """A method to update user data.
-
-        Args:
-            user_id (UUID5): UUID of the user.
-            user_data (UserIn): New data to update the user.
-
-        Returns:
-            Any | None: The updated user object or None if the user does not exist.
-        """
-
-        # Sprawdzenie, czy użytkownik istnieje
-        existing_user = await self.get_by_uuid(user_id)
-        if not existing_user:
-            return None
-
-        # Aktualizacja danych użytkownika
-        query = (
-            user_table.update()
-            .where(user_table.c.id == user_id)
-            .values(**user_data.model_dump())
-            .returning(user_table)
-        )
-        updated_user = await database.fetch_one(query)
-        return updated_user
-
-    async def delete_user(self, user_id: UUID4) -> bool:
-        """A method to delete user by UUID.
-
-        Args:
-            user_id (UUID5): UUID of the user to delete.
-
-        Returns:
-            bool: True if the user was deleted, False if the user does not exist.
-        """
-        existing_user = await self.get_by_uuid(user_id)
-        if not existing_user:
-            return False  # Zwracamy False, jeśli użytkownik nie istnieje
-
-        query = user_table.delete().where(user_table.c.id == user_id)
-        await database.execute(query)  # Wykonaj DELETE bez sprawdzania wyniku
-
-        return True  # Zawsze zwracaj True, jeśli DELETE został wykonany
-
-    async def get_all_users(self) -> Iterable[Any]:
-        """A method to get all users.
-
-        Returns:
-            Iterable[Any]: Iterable of user objects.
-        """
-        query = user_table.select()
-        result = await database.fetch_all(query)
-        return iter(result)
\ No newline at end of file
+"""A repository for user entity."""
+
+import time
+from typing import Iterable, Any
+from asyncpg.exceptions import UniqueViolationError  # type: ignore
+from fastapi import HTTPException
+from sqlalchemy import or_, select
+from sqlalchemy.dialects.postgresql import insert
+from uuid import UUID
+
+from eventapi.config import config
+from eventapi.core.domain.user import UserIn
+from eventapi.core.repositories.iuser import IUserRepository
+from eventapi.db import database, read_database, user_table
+from eventapi.api.utils.enums import UserRole
+from eventapi.infrastructure.dto.suggestiondto import SuggestionDTO
+from eventapi.infrastructure.dto.userdto import UserDTO
+from eventapi.infrastructure.utils.cache import ExpiringLRUCache
+from eventapi.infrastructure.utils.password import hash_password
+from eventapi.infrastructure.utils.trie import PrefixIndex
+from eventapi.infrastructure.utils.uuid7 import uuid7
+
+
+class UserRepository(IUserRepository):
+    """An implementation of repository class for user."""
+
+    _MISSING = object()
+
+    def __init__(self, cache: ExpiringLRUCache, index: PrefixIndex) -> None:
+        """The initializer of the repository.
+
+        Args:
+            cache (ExpiringLRUCache): The cache of user principals.
+            index (PrefixIndex): The autocomplete index of usernames.
+        """
+        self._cache = cache
+        self._index = index
+
+    async def get_user_id_by_uuid(self, user_uuid: str) -> int | None:
+        query = select(user_table.c.id).where(user_table.c.uuid == user_uuid)
+        result = await read_database.fetch_one(query)
+        if result:
+            return result["id"]  # Zwracamy int, który jest ID użytkownika
+        return None
+
+    async def register_user(self, user: UserIn) -> Any | None:
+        """Rejestracja użytkownika.
+
+        The user is inserted with a single statement. Only when it conflicts
+        is the existing row looked up to tell which field is taken.
+
+        Args:
+            user (UserIn): The user input data with the password hashed.
+
+        Raises:
+            HTTPException: 409 if the email or the username is taken.
+
+        Returns:
+            Any | None: The new user object without the password.
+        """
+
+        # Przygotowanie danych do zapisu
+        user_data = user.model_dump()
+        user_data["role"] = UserRole.USER.value
+        # Klucz rosnący w czasie: wstawienia trafiają na koniec indeksów B-tree
+        user_data["id"] = uuid7()
+
+        # Unikalność sprawdza baza, duplikat nie zwraca wiersza
+        query = (
+            insert(user_table)
+            .values(**user_data)
+            .on_conflict_do_nothing()
+            .returning(
+                user_table.c.id,
+                user_table.c.username,
+                user_table.c.email,
+                user_table.c.role,
+            )
+        )
+
+        if new_user := await database.fetch_one(query):
+            self._cache.pop(new_user["id"])
+            self._index.add(new_user["id"], new_user["username"])
+            return new_user
+
+        raise HTTPException(status_code=409, detail=await self._conflict_detail(user))
+
+    async def _conflict_detail(self, user: UserIn) -> str:
+        """A private method describing why registration of the user failed.
+
+        Args:
+            user (UserIn): The user input data.
+
+        Returns:
+            str: The detail naming the conflicting fields.
+        """
+
+        query = select(user_table.c.username, user_table.c.email).where(
+            or_(user_table.c.email == user.email, user_table.c.username == user.username)
+        )
+        # Odczyt z serwera głównego: replika może jeszcze nie znać konfliktu
+        existing = await database.fetch_all(query)
+
+        fields = [
+            field
+            for field in ("email", "username")
+            if any(row[field] == getattr(user, field) for row in existing)
+        ]
+        if not fields:
+            return "User already exists"
+
+        return f"User with this {' and '.join(fields)} already exists"
+
+    async def get_principal(self, user_id: UUID) -> UserDTO | None:
+        """A method getting the public user data for authorization.
+
+        Results, including unknown ids, are cached per worker and dropped on
+        `update_user` and `delete_user`. Ids missing on a replica are
+        re-checked on the primary before the miss is cached.
+
+        Args:
+            user_id (UUID): UUID of the user.
+
+        Returns:
+            UserDTO | None: The user data without the password if exists.
+        """
+
+        principal = self._cache.get(user_id, self._MISSING)
+        if principal is not self._MISSING:
+            return principal
+
+        query = select(
+            user_table.c.id,
+            user_table.c.username,
+            user_table.c.email,
+            user_table.c.role,
+        ).where(user_table.c.id == user_id)
+        user = await read_database.fetch_one(query)
+        if not user:
+            # Opóźniona replika może nie znać nowego konta, a brak jest
+            # zapamiętywany, więc potwierdzamy go na serwerze głównym
+            user = await database.fetch_one(query)
+
+        principal = UserDTO(**dict(user)) if user else None
+        ttl = config.USER_CACHE_TTL_SECONDS if principal else config.USER_CACHE_NEGATIVE_TTL_SECONDS
+        self._cache.set(user_id, principal, time.time() + ttl)
+
+        return principal
+
+    async def get_by_uuid(self, uuid: UUID) -> Any | None:
+        """A method getting user by UUID.
+
+        Args:
+            uuid (UUID): UUID of the user.
+
+        Returns:
+            Any | None: The user object if exists.
+        """
+
+        query = user_table \
+            .select() \
+            .where(user_table.c.id == uuid)
+        user = await read_database.fetch_one(query)
+
+        return user
+
+    async def get_by_email(self, email: str) -> Any | None:
+        """A method getting user by email.
+
+        Args:
+            email (str): The email of the user.
+
+        Returns:
+            Any | None: The user object if exists.
+        """
+
+        query = user_table \
+            .select() \
+            .where(user_table.c.email == email)
+        user = await read_database.fetch_one(query)
+
+        return user
+
+    async def get_by_username(self, username: str) -> Any | None:
+        query = user_table.select().where(user_table.c.username == username)
+        return await read_database.fetch_one(query)
+
+    async def update_user(self, user_id: UUID, user_data: UserIn) -> Any | None:
+        """A method to update user data.
+
+        Args:
+            user_id (UUID): UUID of the user.
+            user_data (UserIn): New data to update the user.
+
+        Returns:
+            Any | None: The updated user object or None if the user does not exist.
+        """
+
+        query = (
+            user_table.update()
+            .where(user_table.c.id == user_id)
+            .values(**user_data.model_dump())
+            .returning(user_table)
+        )
+
+        try:
+            user = await database.fetch_one(query)
+        except UniqueViolationError as exc:
+            raise HTTPException(
+                status_code=409,
+                detail="User with this email or username already exists",
+            ) from exc
+        finally:
+            self._cache.pop(user_id)
+
+        if user:
+            self._index.add(user["id"], user["username"])
+
+        return user
+
+    async def update_password(self, user_id: UUID, old_hash: str, new_hash: str) -> bool:
+        """A method replacing the password hash if it was not changed meanwhile.
+
+        Args:
+            user_id (UUID): UUID of the user.
+            old_hash (str): The hash the new one replaces.
+            new_hash (str): The new password hash.
+
+        Returns:
+            bool: True if the hash was replaced.
+        """
+
+        query = (
+            user_table.update()
+            .where(user_table.c.id == user_id)
+            .where(user_table.c.password == old_hash)
+            .values(password=new_hash)
+            .returning(user_table.c.id)
+        )
+
+        return await database.fetch_one(query) is not None
+
+    async def delete_user(self, user_id: UUID) -> bool:
+        """A method to delete user by UUID.
+
+        Args:
+            user_id (UUID): UUID of the user to delete.
+
+        Returns:
+            bool: True if the user was deleted, False if the user does not exist.
+        """
+        query = user_table \
+            .delete() \
+            .where(user_table.c.id == user_id) \
+            .returning(user_table.c.id)
+
+        deleted = await database.fetch_one(query) is not None
+        self._cache.pop(user_id)
+        self._index.discard(user_id)
+
+        return deleted
+
+    async def get_all_users(
+            self,
+            after: UUID | None,
+            limit: int,
+            role: UserRole | None = None,
+            username_prefix: str | None = None,
+    ) -> Iterable[Any]:
+        """A method to get a page of users ordered by UUID.
+
+        Args:
+            after (UUID | None): UUID of the last user of the previous page.
+            limit (int): The maximum number of users.
+            role (UserRole | None, optional): The role to filter by.
+            username_prefix (str | None, optional): The prefix of the usernames.
+
+        Returns:
+            Iterable[Any]: The users without passwords.
+        """
+
+        query = select(
+            user_table.c.id,
+            user_table.c.username,
+            user_table.c.email,
+            user_table.c.role,
+        )
+        if after is not None:
+            query = query.where(user_table.c.id > after)
+        if role is not None:
+            query = query.where(user_table.c.role == role)
+        if username_prefix:
+            query = query.where(user_table.c.username.startswith(username_prefix, autoescape=True))
+
+        query = query.order_by(user_table.c.id).limit(limit)
+        result = await read_database.fetch_all(query)
+        return iter(result)
+
+    async def load_suggestions(self) -> None:
+        """A method rebuilding the username autocomplete index."""
+
+        query = select(user_table.c.id, user_table.c.username)
+        users = await read_database.fetch_all(query)
+
+        self._index.replace((user["id"], user["username"]) for user in users)
+
+    async def suggest(self, prefix: str, limit: int) -> Iterable[Any]:
+        """A method getting users whose username starts with the prefix.
+
+        Args:
+            prefix (str): The typed prefix, compared case-insensitively.
+            limit (int): The maximum number of suggestions.
+
+        Returns:
+            Iterable[Any]: The ids and usernames in alphabetical order.
+        """
+
+        return [
+            SuggestionDTO(id=user_id, name=username)
+            for user_id, username in self._index.search(prefix, limit)
+        ]
@@ -1,144 +1,271 @@
-"""Module containing continent service implementation."""
-
-from typing import Iterable
-from datetime import timezone, datetime
-
-from eventapi.core.domain.event import Event, EventBroker
-from eventapi.core.repositories.ievent import IEventRepository
-from eventapi.infrastructure.services.ievent import IEventService
-from geopy.distance import geodesic
-
-class EventService(IEventService):
-    """A class implementing the airport service."""
-
-    _repository: IEventRepository
-
-    def __init__(self, repository: IEventRepository) -> None:
-        """The initializer of the `event service`.
-
-        Args:
-            repository (IEventRepository): The reference to the repository.
-        """
-
-        self._repository = repository
-
-    async def get_all_events(self) -> Iterable[Event]:
-        """The method getting all events from the repository.
-
-        Returns:
-            Iterable[Event]: All events.
-        """
-
-        return await self._repository.get_all_events()
-
-    async def get_by_id(self, event_id: int) -> Event | None:
-        """The abstract getting event by provided id.
-
-        Args:
-            event_id (int): The id of the event.
-
-        Returns:
-            Event | None: The event details.
-        """
-
-        return await self._repository.get_by_id(event_id)
-
-    async def get_by_location(self, location_id: int) -> Iterable[Event]:
-        """The method getting events by raduis of the provided location.
-
-        Args:
-            location_id: int: id of location
-
-        Returns:
-            Iterable[Event]: The result event collection.
-        """
-
-        return await self._repository.get_by_location(location_id)
-
-    async def get_by_date_range(
-            self,
-            start_date: datetime,
-            end_date: datetime
-    ) -> Iterable[Event]:
-        """The abstract getting events within a date range.
-
-        Args:
-            start_date (datetime): Start date of the range.
-            end_date (datetime): End date of the range.
-
-        Returns:
-            Iterable[Event]: Events in the specified range.
-        """
-        return await self._repository.get_by_date_range(start_date, end_date)
-
-    async def get_recommended_events(
-            self,
-            latitude: float,
-            longitude: float,
-            radius: float
-    ) -> Iterable[Event]:
-        """Retrieve recommended events based on location and radius."""
-        events = await self._repository.get_all_events()
-
-        user_location = (latitude, longitude)
-        recommended_events = []
-
-        for event in events:
-            if event.location.latitude is not None and event.location.longitude is not None:
-                event_location = (event.location.latitude, event.location.longitude)
-                distance = geodesic(user_location, event_location).kilometers
-
-                if distance <= radius:
-                    recommended_events.append(event)
-
-        return recommended_events
-
-    async def add_event(self, data: EventBroker) -> None:
-        """The method adding a new event to the repository.
-
-        Args:
-            data (EventBroker): The details of the new event.
-        """
-        data.start_time = data.start_time.replace(
-            tzinfo=timezone.utc) if data.start_time.tzinfo is None else data.start_time.astimezone(timezone.utc)
-        data.end_time = data.end_time.replace(
-            tzinfo=timezone.utc) if data.end_time.tzinfo is None else data.end_time.astimezone(timezone.utc)
-
-        return await self._repository.add_event(data)
-
-
-
-    async def update_event(self, event_id: int, data: EventBroker) -> Event | None:
-        """The abstract updating event data in the data storage.
-
-        Args:
-            event_id (int): The id of the event.
-            data (EventIn): The updated event details.
-
-        Returns:
-            Event | None: The updated event details.
-        """
-        return await self._repository.update_event(event_id, data)
-
-    async def delete_event(self, event_id: int) -> bool:
-        """The abstract removing an event from the data storage.
-
-        Args:
-            event_id (int): The id of the event.
-
-        Returns:
-            bool: Success of the operation.
-        """
-        return await self._repository.delete_event(event_id)
-
-    async def get_by_user(self, user_id: int) -> Iterable[Event]:
-        """The method getting events by user who added them.
-
-        Args:
-            user_id (int): The id of the user.
-
-        Returns:
-            Iterable[Event]: The event collection.
-        """
-        return await self._repository.get_by_user(user_id)
-
+"""Module containing continent service implementation."""
+
+import time
+from typing import Iterable
+from datetime import timezone, datetime, timedelta
+from uuid import UUID
+
+from eventapi.api.utils.enums import EventRanking
+from eventapi.config import config
+from eventapi.core.domain.event import Event, EventBroker
+from eventapi.infrastructure.dto.eventdto import EventDTO
+from eventapi.infrastructure.dto.participantdto import ParticipantDTO, WaitlistDTO
+from eventapi.infrastructure.dto.ratingdto import RatingDTO
+from eventapi.core.repositories.ievent import IEventRepository
+from eventapi.infrastructure.services.ievent import IEventService
+from eventapi.infrastructure.utils import geohash
+from eventapi.infrastructure.utils.leaderboard import Leaderboard
+from eventapi.infrastructure.utils.trending import TrendingSketch
+
+class EventService(IEventService):
+    """A class implementing the airport service."""
+
+    _repository: IEventRepository
+    _leaderboard: Leaderboard
+    _trending: TrendingSketch
+
+    def __init__(
+            self,
+            repository: IEventRepository,
+            leaderboard: Leaderboard,
+            trending: TrendingSketch,
+    ) -> None:
+        """The initializer of the `event service`.
+
+        Args:
+            repository (IEventRepository): The reference to the repository.
+            leaderboard (Leaderboard): The reference to the event rankings.
+            trending (TrendingSketch): The reference to the trending detector.
+        """
+
+        self._repository = repository
+        self._leaderboard = leaderboard
+        self._trending = trending
+
+    async def get_all_events(self) -> Iterable[Event]:
+        """The method getting all events from the repository.
+
+        Returns:
+            Iterable[Event]: All events.
+        """
+
+        return await self._repository.get_all_events()
+
+    async def get_by_id(self, event_id: int) -> Event | None:
+        """The abstract getting event by provided id.
+
+        Args:
+            event_id (int): The id of the event.
+
+        Returns:
+            Event | None: The event details.
+        """
+
+        return await self._repository.get_by_id(event_id)
+
+    async def get_by_location(self, location_id: int) -> Iterable[Event]:
+        """The method getting events by raduis of the provided location.
+
+        Args:
+            location_id: int: id of location
+
+        Returns:
+            Iterable[Event]: The result event collection.
+        """
+
+        return await self._repository.get_by_location(location_id)
+
+    async def get_by_date_range(
+            self,
+            start_date: datetime,
+            end_date: datetime
+    ) -> Iterable[Event]:
+        """The abstract getting events within a date range.
+
+        Args:
+            start_date (datetime): Start date of the range.
+            end_date (datetime): End date of the range.
+
+        Returns:
+            Iterable[Event]: Events in the specified range.
+        """
+        return await self._repository.get_by_date_range(start_date, end_date)
+
+    async def get_recommended_events(
+            self,
+            latitude: float,
+            longitude: float,
+            radius: float
+    ) -> Iterable[Event]:
+        """Retrieve recommended events based on location and radius.
+
+        Distance and time filtering happen in the DB, so only the partitions
+        holding current events are scanned.
+        """
+        return await self._repository.get_events_within_radius(latitude, longitude, radius)
+
+    async def add_event(self, data: EventBroker) -> None:
+        """The method adding a new event to the repository.
+
+        Args:
+            data (EventBroker): The details of the new event.
+        """
+        data.start_time = data.start_time.replace(
+            tzinfo=timezone.utc) if data.start_time.tzinfo is None else data.start_time.astimezone(timezone.utc)
+        data.end_time = data.end_time.replace(
+            tzinfo=timezone.utc) if data.end_time.tzinfo is None else data.end_time.astimezone(timezone.utc)
+
+        return await self._repository.add_event(data)
+
+
+
+    async def update_event(self, event_id: int, data: EventBroker) -> Event | None:
+        """The abstract updating event data in the data storage.
+
+        Args:
+            event_id (int): The id of the event.
+            data (EventIn): The updated event details.
+
+        Returns:
+            Event | None: The updated event details.
+        """
+        return await self._repository.update_event(event_id, data)
+
+    async def get_top(
+            self,
+            ranking: EventRanking,
+            near: tuple[float, float] | None,
+            limit: int,
+    ) -> Iterable[EventDTO]:
+        """The method getting the best ranked events.
+
+        Args:
+            ranking (EventRanking): The ranking to read.
+            near (tuple[float, float] | None): The latitude and longitude
+                whose region limits the ranking, None for all events.
+            limit (int): The maximum number of events.
+
+        Returns:
+            Iterable[EventDTO]: The events, best first.
+        """
+        region = geohash.encode(*near, config.GEO_REGION_PRECISION) if near else None
+        event_ids = self._leaderboard.top(ranking, region, limit)
+        if not event_ids:
+            return []
+
+        # Ranking bywa nieświeży: usunięte wydarzenia są pomijane
+        events = {event.id: event for event in await self._repository.get_by_ids(event_ids)}
+        return [events[event_id] for event_id in event_ids if event_id in events]
+
+    async def get_trending(self, limit: int) -> Iterable[EventDTO]:
+        """The method getting the events with the most recent interactions.
+
+        Args:
+            limit (int): The maximum number of events.
+
+        Returns:
+            Iterable[EventDTO]: The events, most trending first.
+        """
+        event_ids = [event_id for event_id, _ in self._trending.top(limit)]
+        if not event_ids:
+            return []
+
+        events = {event.id: event for event in await self._repository.get_by_ids(event_ids)}
+        return [events[event_id] for event_id in event_ids if event_id in events]
+
+    def record_view(self, event_id: int) -> None:
+        """The method counting a view of an event as a trending signal.
+
+        Args:
+            event_id (int): The id of the event.
+        """
+        self._trending.record(event_id, config.TRENDING_VIEW_WEIGHT)
+
+    async def refresh_leaderboard(self) -> None:
+        """The method bringing the rankings up to date with the aggregates.
+
+        Changed aggregates are applied incrementally; a full rebuild runs
+        every LEADERBOARD_REBUILD_SECONDS to refresh the mean rating and
+        drop deleted events.
+        """
+        rebuild_due = self._leaderboard.rebuilt_at + config.LEADERBOARD_REBUILD_SECONDS
+        if self._leaderboard.synced_at is None or time.monotonic() >= rebuild_due:
+            self._leaderboard.replace(await self._repository.get_rating_changes(None))
+            return
+
+        # Zakładka łapie transakcje zatwierdzone z wcześniejszym updated_at
+        since = self._leaderboard.synced_at - timedelta(seconds=config.LEADERBOARD_REFRESH_OVERLAP_SECONDS)
+        self._leaderboard.update(await self._repository.get_rating_changes(since))
+
+    async def get_rating(self, event_id: int) -> RatingDTO | None:
+        """The method getting the rating aggregates of an event.
+
+        Args:
+            event_id (int): The id of the event.
+
+        Returns:
+            RatingDTO | None: The rating aggregates if the event exists.
+        """
+        return await self._repository.get_rating(event_id)
+
+    async def register(self, event_id: int, user_id: UUID) -> ParticipantDTO | WaitlistDTO:
+        """The method registering a user for an event within its capacity.
+
+        Args:
+            event_id (int): The id of the event.
+            user_id (UUID): The UUID of the user.
+
+        Returns:
+            ParticipantDTO | WaitlistDTO: The registration details, or the
+                waitlist entry if the event is full.
+        """
+        participant = await self._repository.register_participant(event_id, user_id)
+        self._trending.record(event_id, config.TRENDING_REGISTRATION_WEIGHT)
+        return participant
+
+    async def get_waitlist_entry(self, event_id: int, user_id: UUID) -> WaitlistDTO | None:
+        """The method getting the place of a user in the waitlist of an event.
+
+        Args:
+            event_id (int): The id of the event.
+            user_id (UUID): The UUID of the user.
+
+        Returns:
+            WaitlistDTO | None: The waitlist entry if the user is waiting.
+        """
+        return await self._repository.get_waitlist_entry(event_id, user_id)
+
+    async def unregister(self, event_id: int, user_id: UUID) -> bool:
+        """The method cancelling a registration or leaving the waitlist.
+
+        Args:
+            event_id (int): The id of the event.
+            user_id (UUID): The UUID of the user.
+
+        Returns:
+            bool: Success of the operation.
+        """
+        return await self._repository.unregister_participant(event_id, user_id)
+
+    async def delete_event(self, event_id: int) -> bool:
+        """The abstract removing an event from the data storage.
+
+        Args:
+            event_id (int): The id of the event.
+
+        Returns:
+            bool: Success of the operation.
+        """
+        return await self._repository.delete_event(event_id)
+
+    async def get_by_user(self, user_id: int) -> Iterable[Event]:
+        """The method getting events by user who added them.
+
+        Args:
+            user_id (int): The id of the user.
+
+        Returns:
+            Iterable[Event]: The event collection.
+        """
+        return await self._repository.get_by_user(user_id)
+
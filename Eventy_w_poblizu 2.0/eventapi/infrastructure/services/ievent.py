@@ -1,132 +1,227 @@
-"""Module containing event repository abstractions."""
-
-from abc import ABC, abstractmethod
-from typing import Iterable
-from datetime import datetime
-from eventapi.core.domain.event import Event, EventBroker
-
-
-class IEventService(ABC):
-    """An abstract class representing protocol of event repository."""
-
-    @abstractmethod
-    async def get_all_events(self) -> Iterable[Event]:
-        """The abstract getting all events from the data storage.
-
-        Returns:
-            Iterable[Event]: Events in the data storage.
-        """
-
-    @abstractmethod
-    async def get_by_id(self, event_id: int) -> Event | None:
-        """The abstract getting event by provided id.
-
-        Args:
-            event_id (int): The id of the event.
-
-        Returns:
-            Event | None: The event details.
-        """
-
-    @abstractmethod
-    async def get_by_location(
-        self,
-        location_id: int) -> Iterable[Event]:
-        """The abstract getting events assigned to particular location.
-
-        Args:
-            location_id: (int): id of location
-        Returns:
-            Iterable[Event]: Events assigned to the location.
-        """
-
-    @abstractmethod
-    async def get_by_date_range(
-            self,
-            start_date: datetime,
-            end_date: datetime
-    ) -> Iterable[Event]:
-        """The abstract getting events within a date range.
-
-        Args:
-            start_date (datetime): Start date of the range.
-            end_date (datetime): End date of the range.
-
-        Returns:
-            Iterable[Event]: Events in the specified range.
-        """
-
-    @abstractmethod
-    async def get_by_user(self, user_id: int) -> Iterable[Event]:
-        """The method getting events by user who added them.
-
-        Args:
-            user_id (int): The id of the user.
-
-        Returns:
-            Iterable[Event]: The event collection.
-        """
-
-    @abstractmethod
-    async def get_recommended_events(
-            self,
-            latitude: float,
-            longitude: float,
-            radius: float
-    ) -> Iterable[Event]:
-        """The abstract adding a new event to the data storage.
-
-                Args:
-                    latitude (float): latitude of user
-                    longitude (float): logtitute of user
-                    radius (float): radius for location around user
-                """
-
-    @abstractmethod
-    async def add_event(self, data: EventBroker) -> Event | None:
-        """The abstract adding a new event to the data storage.
-
-        Args:
-            data (EventIn): The details of the new event.
-        """
-
-    @abstractmethod
-    async def update_event(self, event_id: int, data: EventBroker) -> Event | None:
-        """The abstract updating event data in the data storage.
-
-        Args:
-            event_id (int): The id of the event.
-            data (EventIn): The updated event details.
-
-        Returns:
-            Event | None: The updated event details.
-        """
-
-    @abstractmethod
-    async def delete_event(self, event_id: int) -> bool:
-        """The abstract removing an event from the data storage.
-
-        Args:
-            event_id (int): The id of the event.
-
-        Returns:
-            bool: Success of the operation.
-        """
-
-    @abstractmethod
-    async def get_recommended_events(
-            self,
-            latitude: float,
-            longitude: float,
-            radius: float
-    ) -> Iterable[Event]:
-        """
-        Retrieve recommended events based on location and radius.
-
-        :param latitude: Latitude of the user location
-        :param longitude: Longitude of the user location
-        :param radius: Search radius in kilometers
-        :return: List of recommended events
-        """
-
-
+"""Module containing event repository abstractions."""
+
+from abc import ABC, abstractmethod
+from typing import Iterable
+from datetime import datetime
+from uuid import UUID
+from eventapi.api.utils.enums import EventRanking
+from eventapi.core.domain.event import Event, EventBroker
+from eventapi.infrastructure.dto.eventdto import EventDTO
+from eventapi.infrastructure.dto.participantdto import ParticipantDTO, WaitlistDTO
+from eventapi.infrastructure.dto.ratingdto import RatingDTO
+
+
+class IEventService(ABC):
+    """An abstract class representing protocol of event repository."""
+
+    @abstractmethod
+    async def get_all_events(self) -> Iterable[Event]:
+        """The abstract getting all events from the data storage.
+
+        Returns:
+            Iterable[Event]: Events in the data storage.
+        """
+
+    @abstractmethod
+    async def get_by_id(self, event_id: int) -> Event | None:
+        """The abstract getting event by provided id.
+
+        Args:
+            event_id (int): The id of the event.
+
+        Returns:
+            Event | None: The event details.
+        """
+
+    @abstractmethod
+    async def get_by_location(
+        self,
+        location_id: int) -> Iterable[Event]:
+        """The abstract getting events assigned to particular location.
+
+        Args:
+            location_id: (int): id of location
+        Returns:
+            Iterable[Event]: Events assigned to the location.
+        """
+
+    @abstractmethod
+    async def get_by_date_range(
+            self,
+            start_date: datetime,
+            end_date: datetime
+    ) -> Iterable[Event]:
+        """The abstract getting events within a date range.
+
+        Args:
+            start_date (datetime): Start date of the range.
+            end_date (datetime): End date of the range.
+
+        Returns:
+            Iterable[Event]: Events in the specified range.
+        """
+
+    @abstractmethod
+    async def get_by_user(self, user_id: int) -> Iterable[Event]:
+        """The method getting events by user who added them.
+
+        Args:
+            user_id (int): The id of the user.
+
+        Returns:
+            Iterable[Event]: The event collection.
+        """
+
+    @abstractmethod
+    async def get_recommended_events(
+            self,
+            latitude: float,
+            longitude: float,
+            radius: float
+    ) -> Iterable[Event]:
+        """The abstract adding a new event to the data storage.
+
+                Args:
+                    latitude (float): latitude of user
+                    longitude (float): logtitute of user
+                    radius (float): radius for location around user
+                """
+
+    @abstractmethod
+    async def add_event(self, data: EventBroker) -> Event | None:
+        """The abstract adding a new event to the data storage.
+
+        Args:
+            data (EventIn): The details of the new event.
+        """
+
+    @abstractmethod
+    async def update_event(self, event_id: int, data: EventBroker) -> Event | None:
+        """The abstract updating event data in the data storage.
+
+        Args:
+            event_id (int): The id of the event.
+            data (EventIn): The updated event details.
+
+        Returns:
+            Event | None: The updated event details.
+        """
+
+    @abstractmethod
+    async def get_top(
+            self,
+            ranking: EventRanking,
+            near: tuple[float, float] | None,
+            limit: int,
+    ) -> Iterable[EventDTO]:
+        """The abstract getting the best ranked events.
+
+        Args:
+            ranking (EventRanking): The ranking to read.
+            near (tuple[float, float] | None): The latitude and longitude
+                whose region limits the ranking, None for all events.
+            limit (int): The maximum number of events.
+
+        Returns:
+            Iterable[EventDTO]: The events, best first.
+        """
+
+    @abstractmethod
+    async def get_trending(self, limit: int) -> Iterable[EventDTO]:
+        """The abstract getting the events with the most recent interactions.
+
+        Args:
+            limit (int): The maximum number of events.
+
+        Returns:
+            Iterable[EventDTO]: The events, most trending first.
+        """
+
+    @abstractmethod
+    def record_view(self, event_id: int) -> None:
+        """The abstract counting a view of an event as a trending signal.
+
+        Args:
+            event_id (int): The id of the event.
+        """
+
+    @abstractmethod
+    async def refresh_leaderboard(self) -> None:
+        """The abstract bringing the rankings up to date with the aggregates."""
+
+    @abstractmethod
+    async def get_rating(self, event_id: int) -> RatingDTO | None:
+        """The abstract getting the rating aggregates of an event.
+
+        Args:
+            event_id (int): The id of the event.
+
+        Returns:
+            RatingDTO | None: The rating aggregates if the event exists.
+        """
+
+    @abstractmethod
+    async def register(self, event_id: int, user_id: UUID) -> ParticipantDTO | WaitlistDTO:
+        """The abstract registering a user for an event within its capacity.
+
+        Args:
+            event_id (int): The id of the event.
+            user_id (UUID): The UUID of the user.
+
+        Returns:
+            ParticipantDTO | WaitlistDTO: The registration details, or the
+                waitlist entry if the event is full.
+        """
+
+    @abstractmethod
+    async def get_waitlist_entry(self, event_id: int, user_id: UUID) -> WaitlistDTO | None:
+        """The abstract getting the place of a user in the waitlist of an event.
+
+        Args:
+            event_id (int): The id of the event.
+            user_id (UUID): The UUID of the user.
+
+        Returns:
+            WaitlistDTO | None: The waitlist entry if the user is waiting.
+        """
+
+    @abstractmethod
+    async def unregister(self, event_id: int, user_id: UUID) -> bool:
+        """The abstract cancelling a registration or leaving the waitlist.
+
+        Args:
+            event_id (int): The id of the event.
+            user_id (UUID): The UUID of the user.
+
+        Returns:
+            bool: Success of the operation.
+        """
+
+    @abstractmethod
+    async def delete_event(self, event_id: int) -> bool:
+        """The abstract removing an event from the data storage.
+
+        Args:
+            event_id (int): The id of the event.
+
+        Returns:
+            bool: Success of the operation.
+        """
+
+    @abstractmethod
+    async def get_recommended_events(
+            self,
+            latitude: float,
+            longitude: float,
+            radius: float
+    ) -> Iterable[Event]:
+        """
+        Retrieve recommended events based on location and radius.
+
+        :param latitude: Latitude of the user location
+        :param longitude: Longitude of the user location
+        :param radius: Search radius in kilometers
+        :return: List of recommended events
+        """
+
+
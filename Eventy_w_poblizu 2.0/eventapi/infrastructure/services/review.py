@@ -1,45 +1,72 @@
-from typing import Iterable
-from eventapi.core.domain.review import Review, ReviewIn
-from eventapi.core.repositories.ireview import IReviewRepository
-from eventapi.infrastructure.services.ireview import IReviewService
-from pydantic import UUID4
-
-
-class ReviewService(IReviewService):
-    """Concrete implementation of IReviewService."""
-
-    def __init__(self, repository: IReviewRepository):
-        """Initialize the service with a review repository."""
-        self.review_repository = repository
-
-    async def get_all_reviews(self) -> Iterable[Review]:
-        """Retrieve all reviews."""
-        return await self.review_repository.get_all_reviews()
-
-    async def get_review_by_id(self, review_id: int) -> Review | None:
-        """Retrieve a specific review by ID."""
-        return await self.review_repository.get_by_id(review_id)
-
-    async def get_reviews_by_user(self, user_id: UUID4) -> Iterable[Review]:
-        """Retrieve all reviews created by a specific user."""
-        return await self.review_repository.get_by_user(user_id)
-
-    async def get_reviews_by_event(self, event_id: int) -> Iterable[Review]:
-        """Retrieve all reviews associated with a specific event."""
-        return await self.review_repository.get_by_event_id(event_id)
-
-    async def get_reviews_by_rating(self, rating: int) -> Iterable[Review]:
-        """Retrieve all reviews with a specific rating."""
-        return await self.review_repository.get_by_rating(rating)
-
-    async def create_review(self, data: ReviewIn) -> Review:
-        """Create a new review."""
-        return await self.review_repository.add_review(data)
-
-    async def update_review(self, review_id: int, data: ReviewIn) -> Review | None:
-        """Update an existing review."""
-        return await self.review_repository.update_review(review_id, data)
-
-    async def delete_review(self, review_id: int) -> bool:
-        """Delete a review."""
+from typing import Iterable
+from eventapi.api.utils.enums import ReviewOrder
+from eventapi.core.domain.review import Review, ReviewIn
+from eventapi.core.repositories.ireview import IReviewRepository
+from eventapi.infrastructure.dto.reviewdto import BulkReviewResultDTO
+from eventapi.config import config
+from eventapi.infrastructure.services.ireview import IReviewService
+from eventapi.infrastructure.utils.trending import TrendingSketch
+from uuid import UUID
+
+
+class ReviewService(IReviewService):
+    """Concrete implementation of IReviewService."""
+
+    def __init__(self, repository: IReviewRepository, trending: TrendingSketch):
+        """Initialize the service with a review repository and the trending detector."""
+        self.review_repository = repository
+        self.trending = trending
+
+    async def get_all_reviews(self) -> Iterable[Review]:
+        """Retrieve all reviews."""
+        return await self.review_repository.get_all_reviews()
+
+    async def get_review_by_id(self, review_id: int) -> Review | None:
+        """Retrieve a specific review by ID."""
+        return await self.review_repository.get_by_id(review_id)
+
+    async def get_reviews_by_user(self, user_id: UUID) -> Iterable[Review]:
+        """Retrieve all reviews created by a specific user."""
+        return await self.review_repository.get_by_user(user_id)
+
+    async def get_reviews_by_event(self, event_id: int) -> Iterable[Review]:
+        """Retrieve all reviews associated with a specific event."""
+        return await self.review_repository.get_by_event_id(event_id)
+
+    async def get_event_feed(
+            self, event_id: int, order: ReviewOrder, after: tuple | None, limit: int
+    ) -> Iterable[Review]:
+        """Retrieve a page of reviews of an event, after the given sort key."""
+        return await self.review_repository.get_event_feed(event_id, order, after, limit)
+
+    async def get_user_feed(
+            self, user_id: UUID, order: ReviewOrder, after: tuple | None, limit: int
+    ) -> Iterable[Review]:
+        """Retrieve a page of reviews written by a user, after the given sort key."""
+        return await self.review_repository.get_user_feed(user_id, order, after, limit)
+
+    async def get_reviews_by_rating(self, rating: int) -> Iterable[Review]:
+        """Retrieve all reviews with a specific rating."""
+        return await self.review_repository.get_by_rating(rating)
+
+    async def create_review(self, data: ReviewIn) -> Review:
+        """Create a new review."""
+        review = await self.review_repository.add_review(data)
+        self.trending.record(review.event_id, config.TRENDING_REVIEW_WEIGHT)
+        return review
+
+    async def create_reviews(self, data: list[ReviewIn]) -> list[BulkReviewResultDTO]:
+        """Create many reviews, reporting the outcome of each one."""
+        results = await self.review_repository.add_reviews(data)
+        for result in results:
+            if result.review:
+                self.trending.record(result.review.event_id, config.TRENDING_REVIEW_WEIGHT)
+        return results
+
+    async def update_review(self, review_id: int, data: ReviewIn) -> Review | None:
+        """Update an existing review."""
+        return await self.review_repository.update_review(review_id, data)
+
+    async def delete_review(self, review_id: int) -> bool:
+        """Delete a review."""
         return await self.review_repository.delete_review(review_id)
\ No newline at end of file
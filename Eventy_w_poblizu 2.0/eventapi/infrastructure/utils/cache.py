@@ -0,0 +1,71 @@
+"""A module containing in-memory cache helpers."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class ExpiringLRUCache:
+    """A bounded LRU cache with a per-entry expiration time.
+
+    The cache is meant for a single event loop, so it does no locking.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """The initializer of the cache.
+
+        Args:
+            maxsize (int): The maximum number of entries.
+        """
+        self._maxsize = maxsize
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """A method getting a live entry and marking it as recently used.
+
+        Args:
+            key (Hashable): The key of the entry.
+            default (Any, optional): The value returned on a miss.
+
+        Returns:
+            Any: The cached value or the default.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, expires_at: float) -> None:
+        """A method storing an entry, evicting the least recently used one.
+
+        Args:
+            key (Hashable): The key of the entry.
+            value (Any): The value to store.
+            expires_at (float): The Unix time at which the entry expires.
+        """
+        if self._maxsize <= 0:
+            return
+
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """A method removing an entry if present.
+
+        Args:
+            key (Hashable): The key of the entry.
+        """
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """A method removing all the entries."""
+        self._entries.clear()
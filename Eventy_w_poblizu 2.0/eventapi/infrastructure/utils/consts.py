@@ -1,5 +1,5 @@
-"""A module containing constant values for infrastructure layer."""
-
-EXPIRATION_MINUTES = 60
-SECRET_KEY = "s3cr3t"  # TODO: -> random generation - it's safe
+"""A module containing constant values for infrastructure layer."""
+
+EXPIRATION_MINUTES = 60
+SECRET_KEY = "s3cr3t"  # TODO: -> random generation - it's safe
 ALGORITHM = "HS256"
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""A module containing the write-coalescing buffer of event counters.
+
+Views and impressions are counted in memory and written in one upsert
+every EVENT_COUNTER_FLUSH_SECONDS, so the write load does not grow with
+the read rate. Counts buffered since the last flush are lost if the
+worker crashes.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from typing import Iterable
+
+from asyncpg.exceptions import PostgresError  # type: ignore
+from sqlalchemy import BigInteger, Integer, cast, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.sql import func
+
+from eventapi.config import config
+from eventapi.db import database, event_counter_table
+
+logger = logging.getLogger(__name__)
+
+
+class CounterBuffer:
+    """Per-worker sums of event counter increments not yet written.
+
+    The buffer is meant for a single event loop, so it does no locking.
+    """
+
+    def __init__(self) -> None:
+        """The initializer of the buffer."""
+        self._views: Counter[int] = Counter()
+        self._impressions: Counter[int] = Counter()
+
+    def __len__(self) -> int:
+        return len(self._views.keys() | self._impressions.keys())
+
+    def view(self, event_id: int) -> None:
+        """A method counting a view of the event details.
+
+        Args:
+            event_id (int): The id of the event.
+        """
+        self._views[event_id] += 1
+
+    def impress(self, event_ids: Iterable[int]) -> None:
+        """A method counting the events shown in a list.
+
+        Args:
+            event_ids (Iterable[int]): The ids of the listed events.
+        """
+        self._impressions.update(event_ids)
+
+    def drain(self) -> dict[int, tuple[int, int]]:
+        """A method taking all the buffered increments.
+
+        Returns:
+            dict[int, tuple[int, int]]: Views and impressions by event id.
+        """
+        views, self._views = self._views, Counter()
+        impressions, self._impressions = self._impressions, Counter()
+        return {
+            event_id: (views[event_id], impressions[event_id])
+            for event_id in views.keys() | impressions.keys()
+        }
+
+    def restore(self, counts: dict[int, tuple[int, int]]) -> None:
+        """A method putting back increments whose flush failed.
+
+        Args:
+            counts (dict[int, tuple[int, int]]): Views and impressions by
+                event id, as returned by `drain`.
+        """
+        for event_id, (views, impressions) in counts.items():
+            self._views[event_id] += views
+            self._impressions[event_id] += impressions
+
+
+async def flush_counters(buffer: CounterBuffer) -> None:
+    """A function writing the buffered increments in a single upsert.
+
+    Args:
+        buffer (CounterBuffer): The buffer to flush.
+    """
+    if not (counts := buffer.drain()):
+        return
+
+    event_ids = list(counts)
+    # Jawne typy tablic: unnest jest polimorficzny i nie ustali ich sam
+    rows = func.unnest(
+        cast(literal(event_ids, ARRAY(Integer)), ARRAY(Integer)),
+        cast(literal([counts[key][0] for key in event_ids], ARRAY(BigInteger)), ARRAY(BigInteger)),
+        cast(literal([counts[key][1] for key in event_ids], ARRAY(BigInteger)), ARRAY(BigInteger)),
+    ).table_valued("event_id", "views", "impressions").render_derived("increments")
+
+    statement = insert(event_counter_table).from_select(
+        ["event_id", "views", "impressions"],
+        select(rows.c.event_id, rows.c.views, rows.c.impressions),
+    )
+    query = statement.on_conflict_do_update(
+        index_elements=[event_counter_table.c.event_id],
+        set_={
+            "views": event_counter_table.c.views + statement.excluded.views,
+            "impressions": event_counter_table.c.impressions + statement.excluded.impressions,
+            "updated_at": func.now(),
+        },
+    )
+
+    try:
+        await database.execute(query)
+    except BaseException:
+        buffer.restore(counts)
+        raise
+
+
+async def run_counter_flush(buffer: CounterBuffer) -> None:
+    """Function flushing the event counters on a schedule.
+
+    Args:
+        buffer (CounterBuffer): The buffer to flush.
+    """
+    while True:
+        await asyncio.sleep(config.EVENT_COUNTER_FLUSH_SECONDS)
+        try:
+            await flush_counters(buffer)
+        except (OSError, PostgresError) as e:
+            logger.warning("Event counters flush failed: %s", e)
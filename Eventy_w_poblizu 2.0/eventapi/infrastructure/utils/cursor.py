@@ -0,0 +1,50 @@
+"""A module containing opaque pagination cursor helpers.
+
+A cursor holds the sort key of the last row of a page, so the next page
+is read with a keyset condition instead of an OFFSET.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any
+
+from fastapi import HTTPException
+
+
+def encode_cursor(*key: Any) -> str:
+    """A function encoding the sort key of a row as a cursor.
+
+    Args:
+        *key (Any): The JSON serializable sort key values.
+
+    Returns:
+        str: The URL safe cursor.
+    """
+    raw = json.dumps(key, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """A function decoding a cursor into the sort key values.
+
+    Args:
+        cursor (str): The cursor received from the client.
+        size (int): The expected number of key values.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed.
+
+    Returns:
+        list[Any]: The sort key values.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)
+    except (binascii.Error, ValueError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+    if not isinstance(key, list) or len(key) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return key
@@ -0,0 +1,86 @@
+"""A module containing the batching loader used to avoid N+1 queries."""
+
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, Iterable, Mapping, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[K, V]):
+    """A loader merging all keys requested in one loop iteration.
+
+    Keys passed to `load` are collected until the coroutines requesting
+    them yield to the event loop, then fetched with a single call of the
+    batch function. Results are memoized, so a loader should live for one
+    request only.
+    """
+
+    def __init__(
+            self,
+            batch: Callable[[list[K]], Awaitable[Mapping[K, V]]],
+            default: Callable[[], V],
+    ) -> None:
+        """The initializer of the loader.
+
+        Args:
+            batch (Callable[[list[K]], Awaitable[Mapping[K, V]]]): The
+                function fetching values of many keys at once.
+            default (Callable[[], V]): The factory of values for keys
+                missing in the batch result.
+        """
+        self._batch = batch
+        self._default = default
+        self._futures: dict[K, asyncio.Future[V]] = {}
+        self._pending: list[K] = []
+        # Pętla trzyma tylko słabe referencje do zadań, więc trzymamy je tutaj
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def load(self, key: K) -> V:
+        """A method getting the value of a key.
+
+        Args:
+            key (K): The key.
+
+        Returns:
+            V: The value from the batch or the default.
+        """
+        if (future := self._futures.get(key)) is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[key] = loop.create_future()
+            if not self._pending:
+                loop.call_soon(self._schedule)
+            self._pending.append(key)
+
+        return await future
+
+    async def load_many(self, keys: Iterable[K]) -> list[V]:
+        """A method getting the values of many keys in one batch.
+
+        Args:
+            keys (Iterable[K]): The keys.
+
+        Returns:
+            list[V]: The values in the order of the keys.
+        """
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _schedule(self) -> None:
+        """A private method starting the dispatch of the collected keys."""
+        task = asyncio.create_task(self._dispatch())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self) -> None:
+        """A private method fetching all the keys collected so far."""
+        keys, self._pending = self._pending, []
+        try:
+            values = await self._batch(keys)
+        except Exception as e:
+            for key in keys:
+                # Błąd nie jest zapamiętywany, kolejne load ponowi zapytanie
+                self._futures.pop(key).set_exception(e)
+            return
+
+        for key in keys:
+            self._futures[key].set_result(values[key] if key in values else self._default())
@@ -0,0 +1,120 @@
+"""A module containing geohash helpers used as region keys."""
+
+import math
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+EARTH_RADIUS_KM = 6371
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# Region of events that are not assigned to any location
+NO_REGION = "global"
+
+
+def encode(latitude: float, longitude: float, precision: int) -> str:
+    """A function encoding coordinates as a geohash.
+
+    Args:
+        latitude (float): The geographical latitude.
+        longitude (float): The geographical longitude.
+        precision (int): The number of geohash characters.
+
+    Returns:
+        str: The geohash of the cell containing the point.
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(geohash) < precision:
+        value, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        if value >= middle:
+            bits = bits * 2 + 1
+            bounds[0] = middle
+        else:
+            bits = bits * 2
+            bounds[1] = middle
+
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(geohash)
+
+
+def cell_size(precision: int) -> tuple[float, float]:
+    """A function getting the size of geohash cells.
+
+    Args:
+        precision (int): The number of geohash characters.
+
+    Returns:
+        tuple[float, float]: The cell height and width in degrees.
+    """
+    lon_bits = math.ceil(5 * precision / 2)
+    lat_bits = 5 * precision - lon_bits
+
+    return 180 / 2 ** lat_bits, 360 / 2 ** lon_bits
+
+
+def covering_cells(
+        latitude: float,
+        longitude: float,
+        radius: float,
+        precision: int,
+) -> set[str] | None:
+    """A function getting geohash cells overlapping a search circle.
+
+    The circle is approximated by its bounding box, so the result may
+    contain a few cells that only touch the box corners. The longitude
+    half-width of the box is the exact one of a spherical cap.
+
+    Args:
+        latitude (float): The latitude of the circle center.
+        longitude (float): The longitude of the circle center.
+        radius (float): The circle radius in kilometers.
+        precision (int): The number of geohash characters.
+
+    Returns:
+        set[str] | None: The overlapping cells or None if the circle covers
+            a pole or wraps around the globe, i.e. every region may match.
+    """
+    lat_delta = radius / KM_PER_DEGREE
+    min_lat, max_lat = latitude - lat_delta, latitude + lat_delta
+    if min_lat <= -90 or max_lat >= 90:
+        return None
+
+    # Dokładna połowa szerokości czaszy sferycznej: asin(sin(r/R) / cos(lat))
+    spread = math.sin(radius / EARTH_RADIUS_KM)
+    parallel = math.cos(math.radians(latitude))
+    if radius >= math.pi * EARTH_RADIUS_KM / 2 or spread >= parallel:
+        return None
+
+    lon_delta = math.degrees(math.asin(spread / parallel))
+
+    height, width = cell_size(precision)
+    lat_cells = range(
+        math.floor((min_lat + 90) / height),
+        math.floor((max_lat + 90) / height) + 1,
+    )
+    lon_cells = range(
+        math.floor((longitude - lon_delta + 180) / width),
+        math.floor((longitude + lon_delta + 180) / width) + 1,
+    )
+    columns = round(360 / width)
+
+    return {
+        encode(
+            -90 + (row + 0.5) * height,
+            -180 + (column % columns + 0.5) * width,
+            precision,
+        )
+        for row in lat_cells
+        for column in lon_cells
+    }
@@ -0,0 +1,149 @@
+"""A module containing the storage of idempotent responses.
+
+A request carrying an Idempotency-Key first claims the key. The claim is
+a row without a response, locked for IDEMPOTENCY_LOCK_SECONDS so that a
+crashed worker does not block the key forever. Once the request is done
+the response is stored and kept for IDEMPOTENCY_TTL_SECONDS.
+"""
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from asyncpg.exceptions import PostgresError  # type: ignore
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from eventapi.config import config
+from eventapi.db import database, idempotency_table
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """A response stored for a key, or None fields if still in progress."""
+    request_hash: str
+    status_code: int | None
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+
+
+async def claim(key: str, request_hash: str) -> bool:
+    """A function claiming the key for the request about to be processed.
+
+    Keys whose claim or stored response expired are claimed again.
+
+    Args:
+        key (str): The scoped idempotency key.
+        request_hash (str): The hash of the request body.
+
+    Returns:
+        bool: True if the key was claimed.
+    """
+    now = datetime.now(timezone.utc)
+    statement = insert(idempotency_table).values(
+        key=key,
+        request_hash=request_hash,
+        expires_at=now + timedelta(seconds=config.IDEMPOTENCY_LOCK_SECONDS),
+    )
+    query = statement.on_conflict_do_update(
+        index_elements=[idempotency_table.c.key],
+        set_={
+            "request_hash": statement.excluded.request_hash,
+            "status_code": None,
+            "response_headers": None,
+            "response_body": None,
+            "expires_at": statement.excluded.expires_at,
+        },
+        where=idempotency_table.c.expires_at <= now,
+    ).returning(idempotency_table.c.key)
+
+    return await database.fetch_one(query) is not None
+
+
+async def get_stored(key: str) -> StoredResponse | None:
+    """A function getting the state of a key claimed by another request.
+
+    Args:
+        key (str): The scoped idempotency key.
+
+    Returns:
+        StoredResponse | None: The stored response if the key exists.
+    """
+    query = select(idempotency_table).where(idempotency_table.c.key == key)
+    if not (stored := await database.fetch_one(query)):
+        return None
+
+    headers = json.loads(stored["response_headers"] or "[]")
+    return StoredResponse(
+        request_hash=stored["request_hash"],
+        status_code=stored["status_code"],
+        headers=[(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers],
+        body=stored["response_body"] or b"",
+    )
+
+
+async def complete(
+        key: str,
+        request_hash: str,
+        status_code: int,
+        headers: list[tuple[bytes, bytes]],
+        body: bytes,
+) -> None:
+    """A function storing the response of the request holding the claim.
+
+    Args:
+        key (str): The scoped idempotency key.
+        request_hash (str): The hash of the request body.
+        status_code (int): The status code of the response.
+        headers (list[tuple[bytes, bytes]]): The raw response headers.
+        body (bytes): The response body.
+    """
+    query = (
+        idempotency_table.update()
+        .where(idempotency_table.c.key == key)
+        .where(idempotency_table.c.request_hash == request_hash)
+        .where(idempotency_table.c.status_code.is_(None))
+        .values(
+            status_code=status_code,
+            response_headers=json.dumps(
+                [(name.decode("latin-1"), value.decode("latin-1")) for name, value in headers]
+            ),
+            response_body=body,
+            expires_at=datetime.now(timezone.utc) + timedelta(seconds=config.IDEMPOTENCY_TTL_SECONDS),
+        )
+    )
+    await database.execute(query)
+
+
+async def release(key: str, request_hash: str) -> None:
+    """A function dropping the claim of a request which did not complete.
+
+    Args:
+        key (str): The scoped idempotency key.
+        request_hash (str): The hash of the request body.
+    """
+    query = (
+        idempotency_table.delete()
+        .where(idempotency_table.c.key == key)
+        .where(idempotency_table.c.request_hash == request_hash)
+        .where(idempotency_table.c.status_code.is_(None))
+    )
+    await database.execute(query)
+
+
+async def run_idempotency_prune() -> None:
+    """Function removing expired keys on a schedule."""
+    while True:
+        await asyncio.sleep(config.IDEMPOTENCY_PRUNE_SECONDS)
+        try:
+            await database.execute(
+                idempotency_table.delete().where(
+                    idempotency_table.c.expires_at <= datetime.now(timezone.utc)
+                )
+            )
+        except (OSError, PostgresError) as e:
+            logger.warning("Idempotency keys pruning failed: %s", e)
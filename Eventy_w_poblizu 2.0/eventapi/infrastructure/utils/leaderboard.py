@@ -0,0 +1,140 @@
+"""A module containing the in-memory event leaderboards."""
+
+import bisect
+import time
+from datetime import datetime
+from typing import Any, Iterable, Mapping
+
+from eventapi.api.utils.enums import EventRanking
+
+# Pusty region oznacza ranking globalny
+GLOBAL = ""
+
+
+class Leaderboard:
+    """Sorted rankings of reviewed events, globally and per region.
+
+    The rating ranking uses the Bayesian average
+    (C * m + sum) / (C + count), where m is the mean rating of all reviews
+    and C the prior weight, so events with a few reviews stay close to
+    the mean. The mean is recomputed on every full rebuild only; in
+    between scores are computed with the last mean, so an update moves
+    one entry instead of reordering the whole ranking.
+
+    The leaderboard is meant for a single event loop, so it does no locking.
+    """
+
+    def __init__(self, prior_weight: float) -> None:
+        """The initializer of the leaderboard.
+
+        Args:
+            prior_weight (float): The number of mean ratings assumed for
+                every event.
+        """
+        self._prior_weight = prior_weight
+        self._mean = 0.0
+        # id wydarzenia -> (region, liczba recenzji, suma ocen)
+        self._events: dict[int, tuple[str, int, int]] = {}
+        # (ranking, region) -> posortowane (-wynik, id wydarzenia)
+        self._rankings: dict[tuple[EventRanking, str], list[tuple[float, int]]] = {}
+        self.synced_at: datetime | None = None
+        self.rebuilt_at = float("-inf")
+
+    def replace(self, ratings: Iterable[Mapping[str, Any]]) -> None:
+        """A method rebuilding the rankings from all the rating aggregates.
+
+        Args:
+            ratings (Iterable[Mapping[str, Any]]): Records with `event_id`,
+                `region`, `review_count`, `rating_sum` and `updated_at`.
+        """
+        events = {}
+        synced_at = None
+        for rating in ratings:
+            if rating["review_count"] > 0:
+                events[rating["event_id"]] = (
+                    rating["region"],
+                    rating["review_count"],
+                    rating["rating_sum"],
+                )
+            synced_at = max(synced_at or rating["updated_at"], rating["updated_at"])
+
+        reviews = sum(count for _, count, _ in events.values())
+        self._mean = sum(total for _, _, total in events.values()) / reviews if reviews else 0.0
+        self._events = events
+
+        rankings: dict[tuple[EventRanking, str], list[tuple[float, int]]] = {}
+        for event_id, (region, count, total) in events.items():
+            for key, entry in self._entries(event_id, region, count, total):
+                rankings.setdefault(key, []).append(entry)
+        for ranking in rankings.values():
+            ranking.sort()
+
+        self._rankings = rankings
+        self.synced_at = synced_at
+        self.rebuilt_at = time.monotonic()
+
+    def update(self, ratings: Iterable[Mapping[str, Any]]) -> None:
+        """A method applying changed rating aggregates.
+
+        Aggregates are absolute values, so applying a row twice is harmless.
+
+        Args:
+            ratings (Iterable[Mapping[str, Any]]): Records with `event_id`,
+                `region`, `review_count`, `rating_sum` and `updated_at`.
+        """
+        for rating in ratings:
+            event_id = rating["event_id"]
+            if (previous := self._events.pop(event_id, None)) is not None:
+                for key, entry in self._entries(event_id, *previous):
+                    ranking = self._rankings[key]
+                    del ranking[bisect.bisect_left(ranking, entry)]
+
+            if rating["review_count"] > 0:
+                current = (rating["region"], rating["review_count"], rating["rating_sum"])
+                self._events[event_id] = current
+                for key, entry in self._entries(event_id, *current):
+                    bisect.insort(self._rankings.setdefault(key, []), entry)
+
+            self.synced_at = max(self.synced_at or rating["updated_at"], rating["updated_at"])
+
+    def top(self, ranking: EventRanking, region: str | None, limit: int) -> list[int]:
+        """A method getting the best ranked events.
+
+        Args:
+            ranking (EventRanking): The ranking to read.
+            region (str | None): The region, None for the global ranking.
+            limit (int): The maximum number of events.
+
+        Returns:
+            list[int]: Ids of the events, best first.
+        """
+        entries = self._rankings.get((ranking, region or GLOBAL), [])
+        return [event_id for _, event_id in entries[:limit]]
+
+    def _entries(
+            self,
+            event_id: int,
+            region: str,
+            count: int,
+            total: int,
+    ) -> list[tuple[tuple[EventRanking, str], tuple[float, int]]]:
+        """A private method building the ranking entries of an event.
+
+        Args:
+            event_id (int): The id of the event.
+            region (str): The region of the event.
+            count (int): The number of reviews.
+            total (int): The sum of ratings.
+
+        Returns:
+            list: The ranking keys with the entries to store under them.
+        """
+        score = (self._prior_weight * self._mean + total) / (self._prior_weight + count)
+        return [
+            ((ranking, scope), entry)
+            for ranking, entry in (
+                (EventRanking.RATING, (-score, event_id)),
+                (EventRanking.REVIEWS, (-count, event_id)),
+            )
+            for scope in (GLOBAL, region)
+        ]
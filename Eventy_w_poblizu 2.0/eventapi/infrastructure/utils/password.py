@@ -1,31 +1,157 @@
-"""A module containing password helper methods."""
-
-
-from passlib.context import CryptContext
-
-pwd_context = CryptContext(schemes=["bcrypt"])
-
-
-def hash_password(password: str) -> str:
-    """A function generating has password.
-
-    Args:
-        password (str): A raw form of the password.
-
-    Returns:
-        str: The hashed password.
-    """
-    return pwd_context.hash(password)
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """A function verifying a password against its hash.
-
-    Args:
-        plain_password (str): The raw password.
-        hashed_password (str): The hashed password.
-
-    Returns:
-        bool: True if the password matches the hash, False otherwise.
-    """
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+"""A module containing password helper methods."""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from eventapi.config import config
+
+logger = logging.getLogger(__name__)
+
+# Hasze o innym koszcie niż BCRYPT_ROUNDS są przeliczane przy logowaniu
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    bcrypt__default_rounds=config.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=config.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=config.BCRYPT_ROUNDS,
+)
+
+# bcrypt celowo jest wolny, więc działa poza pętlą zdarzeń
+_executor: ProcessPoolExecutor | None = None
+_in_flight = 0
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def _benchmark(samples: int) -> float:
+    started = time.perf_counter()
+    for _ in range(samples):
+        pwd_context.hash("benchmark")
+
+    return samples / (time.perf_counter() - started)
+
+
+def start_password_pool() -> None:
+    """A function starting the process pool used for password hashing."""
+    global _executor
+
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=config.PASSWORD_POOL_SIZE,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+
+def shutdown_password_pool() -> None:
+    """A function stopping the password hashing process pool."""
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+async def _run(function, *args):
+    """A private function running a password operation in the pool.
+
+    At most `PASSWORD_POOL_SIZE + PASSWORD_QUEUE_DEPTH` operations may be
+    pending at once, further calls are rejected instead of queued.
+
+    Raises:
+        HTTPException: 503 if the pool is saturated.
+
+    Returns:
+        Any: The result of the operation.
+    """
+    global _in_flight
+
+    if _in_flight >= config.PASSWORD_POOL_SIZE + config.PASSWORD_QUEUE_DEPTH:
+        raise HTTPException(
+            status_code=503,
+            detail="Password service is busy, try again later",
+            headers={"Retry-After": "1"},
+        )
+
+    start_password_pool()
+    _in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, function, *args)
+    finally:
+        _in_flight -= 1
+
+
+async def hash_password(password: str) -> str:
+    """A function generating has password.
+
+    Args:
+        password (str): A raw form of the password.
+
+    Returns:
+        str: The hashed password.
+    """
+    return await _run(_hash, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """A function verifying a password against its hash.
+
+    Args:
+        plain_password (str): The raw password.
+        hashed_password (str): The hashed password.
+
+    Returns:
+        bool: True if the password matches the hash, False otherwise.
+    """
+    return await _run(_verify, plain_password, hashed_password)
+
+
+async def verify_and_update_password(
+        plain_password: str,
+        hashed_password: str,
+) -> tuple[bool, str | None]:
+    """A function verifying a password and rehashing it if outdated.
+
+    Args:
+        plain_password (str): The raw password.
+        hashed_password (str): The hashed password.
+
+    Returns:
+        tuple[bool, str | None]: Whether the password matches the hash and
+            the new hash if the stored one uses a different cost.
+    """
+    return await _run(_verify_and_update, plain_password, hashed_password)
+
+
+async def log_password_benchmark(samples: int = 3) -> None:
+    """A function reporting the hashing throughput at the configured cost.
+
+    Args:
+        samples (int, optional): The number of hashes to time. Defaults to 3.
+    """
+    try:
+        rate = await _run(_benchmark, samples)
+    except HTTPException:
+        return
+
+    logger.info(
+        "bcrypt cost %d: %.1f hashes/s per process, %.1f hashes/s with %d processes",
+        config.BCRYPT_ROUNDS,
+        rate,
+        rate * config.PASSWORD_POOL_SIZE,
+        config.PASSWORD_POOL_SIZE,
+    )
@@ -0,0 +1,174 @@
+"""A module containing the token revocation list.
+
+Revocations are stored in Postgres and mirrored in memory of every
+worker, so checking a token is a dictionary lookup. Workers learn about
+revocations made by other workers through LISTEN/NOTIFY.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import suppress
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+import asyncpg  # type: ignore
+from asyncpg.exceptions import PostgresError  # type: ignore
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql import func
+
+from eventapi.config import config
+from eventapi.core.domain.user import Principal
+from eventapi.db import database, db_uri, revoked_token_table, user_revocation_table
+from eventapi.infrastructure.utils.consts import EXPIRATION_MINUTES
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "token_revocations"
+
+# jti -> wygaśnięcie tokena; użytkownik -> moment unieważnienia (Unix time)
+_revoked_tokens: dict[str, float] = {}
+_revoked_users: dict[UUID, float] = {}
+
+
+def is_revoked(principal: Principal) -> bool:
+    """A function checking whether the token of the principal was revoked.
+
+    Args:
+        principal (Principal): The principal decoded from the token.
+
+    Returns:
+        bool: True if the token must be rejected.
+    """
+    return (
+        principal.jti in _revoked_tokens
+        or principal.issued_at < _revoked_users.get(principal.id, 0.0)
+    )
+
+
+def _apply(payload: str) -> None:
+    """A private function applying a revocation notification in memory.
+
+    Args:
+        payload (str): The "jti:<jti>:<expires>" or
+            "user:<uuid>:<revoked_before>" notification payload.
+    """
+    kind, key, moment = payload.split(":")
+    if kind == "jti":
+        _revoked_tokens[key] = float(moment)
+    elif kind == "user":
+        user_id = UUID(key)
+        _revoked_users[user_id] = max(_revoked_users.get(user_id, 0.0), float(moment))
+
+
+async def revoke_token(jti: str, expires: datetime) -> None:
+    """A function revoking a single token.
+
+    Args:
+        jti (str): The id of the token.
+        expires (datetime): The expiration of the token.
+    """
+    payload = f"jti:{jti}:{expires.timestamp()}"
+    revoked = insert(revoked_token_table) \
+        .values(jti=jti, expires_at=expires) \
+        .on_conflict_do_nothing() \
+        .cte("revoked")
+    await database.fetch_one(select(func.pg_notify(CHANNEL, payload)).add_cte(revoked))
+
+    _apply(payload)
+
+
+async def revoke_user(user_id: UUID) -> None:
+    """A function revoking all tokens issued to the user until now.
+
+    Args:
+        user_id (UUID): The UUID of the user.
+    """
+    now = time.time()
+    payload = f"user:{user_id}:{now}"
+    statement = insert(user_revocation_table).values(
+        user_id=user_id,
+        revoked_before=datetime.fromtimestamp(now, timezone.utc),
+    )
+    revoked = statement.on_conflict_do_update(
+        index_elements=[user_revocation_table.c.user_id],
+        set_={"revoked_before": statement.excluded.revoked_before},
+    ).cte("revoked")
+    await database.fetch_one(select(func.pg_notify(CHANNEL, payload)).add_cte(revoked))
+
+    _apply(payload)
+
+
+async def load_revocations() -> None:
+    """A function merging unexpired revocations into the in-memory list."""
+    now = datetime.now(timezone.utc)
+    tokens = await database.fetch_all(
+        select(revoked_token_table).where(revoked_token_table.c.expires_at > now)
+    )
+    users = await database.fetch_all(
+        select(user_revocation_table).where(
+            user_revocation_table.c.revoked_before > now - timedelta(minutes=EXPIRATION_MINUTES)
+        )
+    )
+
+    # Scalanie zamiast podmiany: powiadomienia z czasu zapytania zostają
+    for token in tokens:
+        _apply(f"jti:{token['jti']}:{token['expires_at'].timestamp()}")
+    for user in users:
+        _apply(f"user:{user['user_id']}:{user['revoked_before'].timestamp()}")
+
+
+async def prune_revocations() -> None:
+    """A function forgetting revocations of tokens that already expired."""
+    global _revoked_tokens, _revoked_users
+
+    now = time.time()
+    oldest_token = now - EXPIRATION_MINUTES * 60
+    _revoked_tokens = {jti: expires for jti, expires in _revoked_tokens.items() if expires > now}
+    _revoked_users = {user: moment for user, moment in _revoked_users.items() if moment > oldest_token}
+
+    await database.execute(
+        revoked_token_table.delete().where(
+            revoked_token_table.c.expires_at <= datetime.fromtimestamp(now, timezone.utc)
+        )
+    )
+    await database.execute(
+        user_revocation_table.delete().where(
+            user_revocation_table.c.revoked_before <= datetime.fromtimestamp(oldest_token, timezone.utc)
+        )
+    )
+
+
+async def run_revocation_listener() -> None:
+    """Function keeping the in-memory list in sync with other workers.
+
+    Listens for notifications on a dedicated connection, reloading the
+    whole list after every (re)connect so that nothing sent while
+    disconnected is missed, and prunes expired entries periodically.
+    """
+    while True:
+        try:
+            connection = await asyncpg.connect(db_uri.replace("+asyncpg", "", 1))
+        except (OSError, PostgresError) as e:
+            logger.warning("Revocation listener cannot connect: %s", e)
+            await asyncio.sleep(config.TOKEN_REVOCATION_RECONNECT_SECONDS)
+            continue
+
+        closed = asyncio.Event()
+        connection.add_termination_listener(lambda _: closed.set())
+        try:
+            await connection.add_listener(CHANNEL, lambda *args: _apply(args[3]))
+            await load_revocations()
+            while not closed.is_set():
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(closed.wait(), config.TOKEN_REVOCATION_PRUNE_SECONDS)
+                if not closed.is_set():
+                    await prune_revocations()
+        except (OSError, PostgresError) as e:
+            logger.warning("Revocation listener failed: %s", e)
+        finally:
+            with suppress(OSError, PostgresError):
+                await connection.close()
+
+        await asyncio.sleep(config.TOKEN_REVOCATION_RECONNECT_SECONDS)
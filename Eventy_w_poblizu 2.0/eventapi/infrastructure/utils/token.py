@@ -1,48 +1,103 @@
-# Plik: eventapi/infrastructure/utils/token.py
-from datetime import datetime, timedelta, timezone
-from pydantic import UUID4
-from jose import JWTError, jwt
-from fastapi import HTTPException
-import logging
-
-from eventapi.api.utils.enums import UserRole
-from eventapi.infrastructure.utils.consts import (
-    EXPIRATION_MINUTES,
-    ALGORITHM,
-    SECRET_KEY,
-)
-
-# Konfiguracja loggera
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-def generate_user_token(user_uuid: UUID4,user_role:UserRole) -> dict:
-    """A function returning JWT token for user.
-
-    Args:
-        user_uuid (UUID5): The UUID of the user.
-
-    Returns:
-        dict: The token details.
-        :param user_uuid:
-        :param user_role:
-    """
-    expire = datetime.now(timezone.utc) + timedelta(minutes=EXPIRATION_MINUTES)
-    jwt_data = {
-        "sub": str(user_uuid),
-        "role": user_role.value,
-        "exp": expire,
-        "type": "confirmation"
-    }
-    print(f"JWT Data: {jwt_data}")  # Debug: Sprawdzenie danych tokena
-    encoded_jwt = jwt.encode(jwt_data, key=SECRET_KEY, algorithm=ALGORITHM)
-    return {"user_token": encoded_jwt, "expires": expire}
-
-def decode_access_token(token: str) -> dict:
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        print(f"Decoded payload: {payload}")  # Debug: Zawartość dekodowanego tokena
-        return payload
-    except JWTError as e:
-        print(f"Token decoding failed: {str(e)}")  # Debug: Błąd dekodowania
-        raise HTTPException(status_code=401, detail="Invalid or expired token")
\ No newline at end of file
+# Plik: eventapi/infrastructure/utils/token.py
+from datetime import datetime, timedelta, timezone
+import hashlib
+import time
+from uuid import UUID, uuid4
+from jose import JWTError, jwt
+from fastapi import HTTPException
+from pydantic import ValidationError
+import logging
+
+from eventapi.api.utils.enums import UserRole
+from eventapi.config import config
+from eventapi.core.domain.user import Principal
+from eventapi.infrastructure.utils.cache import ExpiringLRUCache
+from eventapi.infrastructure.utils.revocation import is_revoked
+from eventapi.infrastructure.utils.consts import (
+    EXPIRATION_MINUTES,
+    ALGORITHM,
+    SECRET_KEY,
+)
+
+# Konfiguracja loggera
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Zweryfikowane tokeny (klucz: skrót tokena), ważne do ich "exp"
+_verified_tokens = ExpiringLRUCache(config.TOKEN_CACHE_SIZE)
+
+def generate_user_token(user_uuid: UUID,user_role:UserRole) -> dict:
+    """A function returning JWT token for user.
+
+    Args:
+        user_uuid (UUID): The UUID of the user.
+
+    Returns:
+        dict: The token details.
+        :param user_uuid:
+        :param user_role:
+    """
+    expire = datetime.now(timezone.utc) + timedelta(minutes=EXPIRATION_MINUTES)
+    jwt_data = {
+        "sub": str(user_uuid),
+        "role": user_role.value,
+        "exp": expire,
+        "iat": time.time(),
+        "jti": uuid4().hex,
+        "type": "confirmation"
+    }
+    encoded_jwt = jwt.encode(jwt_data, key=SECRET_KEY, algorithm=ALGORITHM)
+    return {"user_token": encoded_jwt, "expires": expire}
+
+def decode_access_token(token: str) -> Principal:
+    """A function verifying the token and returning its principal.
+
+    Repeated tokens are served from a bounded cache, skipping signature
+    verification and payload parsing until the token expires. Revocation
+    is checked on every call against the in-memory revocation list.
+
+    Args:
+        token (str): The encoded JWT token.
+
+    Raises:
+        HTTPException: 401 if the token is invalid, expired or revoked.
+
+    Returns:
+        Principal: The authenticated user.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    if not (principal := _verified_tokens.get(key)):
+        principal = _verify(token)
+        _verified_tokens.set(key, principal, principal.expires.timestamp())
+
+    if is_revoked(principal):
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+
+    return principal
+
+
+def _verify(token: str) -> Principal:
+    """A private function verifying the signature and claims of the token.
+
+    Args:
+        token (str): The encoded JWT token.
+
+    Raises:
+        HTTPException: 401 if the token is invalid or expired.
+
+    Returns:
+        Principal: The principal described by the token.
+    """
+
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        return Principal(
+            id=payload["sub"],
+            role=str(payload["role"]).lower(),
+            expires=payload["exp"],
+            jti=payload["jti"],
+            issued_at=payload["iat"],
+        )
+    except (JWTError, KeyError, ValidationError) as e:
+        logger.info("Token decoding failed: %s", e)
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
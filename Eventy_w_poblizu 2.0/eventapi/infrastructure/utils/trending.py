@@ -0,0 +1,319 @@
+"""A module containing the in-memory detector of trending events.
+
+Interactions are weighted and counted with forward exponential decay: an
+interaction at time t adds weight * 2 ** ((t - landmark) / half-life), so
+older counts never have to be rewritten and all stored values stay
+comparable. The counts live in a count-min sketch of fixed size, and the
+events with the highest estimates are kept in a bounded top-k map.
+
+Every worker keeps its own detector over the requests it serves. Every
+TRENDING_SNAPSHOT_SECONDS it adds the counts recorded since its last save
+to one shared snapshot in Postgres, so the snapshot covers the traffic of
+all workers. The snapshot seeds started workers, so they do not start from
+zero.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import random
+import time
+from array import array
+from datetime import datetime, timezone
+
+from asyncpg.exceptions import PostgresError  # type: ignore
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from eventapi.config import config
+from eventapi.db import database, trending_snapshot_table
+
+logger = logging.getLogger(__name__)
+
+# Liczba pierwsza większa od identyfikatorów wydarzeń (haszowanie uniwersalne)
+_PRIME = (1 << 61) - 1
+# Po tylu okresach półtrwania wartości są przeskalowywane do nowego punktu odniesienia
+_RESCALE_HALF_LIVES = 64
+SNAPSHOT_NAME = "events"
+
+
+class TrendingSketch:
+    """A count-min sketch with decayed counts and a top-k of event ids.
+
+    Estimates never undercount; collisions may only overcount, by at most
+    a small share of the total decayed weight with high probability. The
+    sketch is meant for a single event loop, so it does no locking.
+    """
+
+    def __init__(self, width: int, depth: int, top_k: int, half_life: float) -> None:
+        """The initializer of the sketch.
+
+        Args:
+            width (int): The number of counters per row.
+            depth (int): The number of rows, each with its own hash.
+            top_k (int): The number of tracked trending events.
+            half_life (float): The seconds after which a count halves.
+        """
+        self._width = width
+        self._depth = depth
+        self._top_k = top_k
+        self._half_life = half_life
+        # Stałe ziarno: te same hasze po restarcie, więc migawka pasuje
+        seeded = random.Random(depth * width)
+        self._hashes = [
+            (seeded.randrange(1, _PRIME), seeded.randrange(0, _PRIME)) for _ in range(depth)
+        ]
+        self._counters = array("d", bytes(8 * width * depth))
+        # Część liczników już dodana do migawki w bazie
+        self._flushed = array("d", bytes(8 * width * depth))
+        self._landmark = time.time()
+        # id wydarzenia -> oszacowanie w jednostkach bieżącego punktu odniesienia
+        self._top: dict[int, float] = {}
+        self._floor: tuple[float, int] | None = None
+
+    def record(self, event_id: int, weight: float, now: float | None = None) -> None:
+        """A method counting an interaction with an event.
+
+        Args:
+            event_id (int): The id of the event.
+            weight (float): The weight of the interaction.
+            now (float | None, optional): The UNIX time of the interaction.
+        """
+        now = time.time() if now is None else now
+        if (now - self._landmark) / self._half_life > _RESCALE_HALF_LIVES:
+            self._rescale(now)
+
+        increment = weight * 2 ** ((now - self._landmark) / self._half_life)
+        estimate = math.inf
+        for slot in self._slots(event_id):
+            self._counters[slot] += increment
+            estimate = min(estimate, self._counters[slot])
+
+        self._offer(event_id, estimate)
+
+    def top(self, limit: int, now: float | None = None) -> list[tuple[int, float]]:
+        """A method getting the currently trending events.
+
+        Args:
+            limit (int): The maximum number of events.
+            now (float | None, optional): The UNIX time of the reading.
+
+        Returns:
+            list[tuple[int, float]]: Ids of the events with their decayed
+                scores, highest first.
+        """
+        now = time.time() if now is None else now
+        decay = 2 ** ((self._landmark - now) / self._half_life)
+        entries = sorted(self._top.items(), key=lambda entry: (-entry[1], entry[0]))
+        return [(event_id, estimate * decay) for event_id, estimate in entries[:limit]]
+
+    def dump(self) -> dict:
+        """A method serializing the sketch for a snapshot.
+
+        Returns:
+            dict: The landmark, the counters and the top-k entries.
+        """
+        return {
+            "landmark": self._landmark,
+            "counters": self._counters.tobytes(),
+            "top": json.dumps(list(self._top.items())),
+        }
+
+    def blank(self) -> "TrendingSketch":
+        """A method creating an empty sketch with the same dimensions.
+
+        Returns:
+            TrendingSketch: The empty sketch.
+        """
+        return TrendingSketch(self._width, self._depth, self._top_k, self._half_life)
+
+    def changes(self) -> dict:
+        """A method serializing the counts not yet added to the snapshot.
+
+        Returns:
+            dict: The landmark, the counters recorded since the last
+                `flushed` call and the top-k entries.
+        """
+        counters = array("d", (
+            counter - flushed for counter, flushed in zip(self._counters, self._flushed)
+        ))
+        return {**self.dump(), "counters": counters.tobytes()}
+
+    def flushed(self, changes: dict) -> None:
+        """A method marking changes as added to the snapshot.
+
+        Args:
+            changes (dict): The values returned by `changes`.
+        """
+        counters = array("d")
+        counters.frombytes(changes["counters"])
+        # Punkt odniesienia mógł się przesunąć w czasie zapisu
+        factor = 2 ** ((changes["landmark"] - self._landmark) / self._half_life)
+        for slot, value in enumerate(counters):
+            self._flushed[slot] += value * factor
+
+    def merge(self, snapshot: dict) -> None:
+        """A method adding the counts of another sketch to this one.
+
+        Args:
+            snapshot (dict): The values returned by `dump` or `changes`
+                of a sketch with the same dimensions.
+        """
+        counters = array("d")
+        counters.frombytes(snapshot["counters"])
+        if len(counters) != len(self._counters):
+            logger.warning("Trending changes ignored: sketch dimensions changed")
+            return
+
+        if snapshot["landmark"] > self._landmark:
+            self._rescale(snapshot["landmark"])
+        factor = 2 ** ((snapshot["landmark"] - self._landmark) / self._half_life)
+        for slot, value in enumerate(counters):
+            self._counters[slot] += value * factor
+
+        # Oszacowania zmieniły się dla wszystkich kandydatów, więc top-k od nowa
+        candidates = set(self._top) | {event_id for event_id, _ in json.loads(snapshot["top"])}
+        estimates = {event_id: self._estimate(event_id) for event_id in candidates}
+        self._top = dict(sorted(estimates.items(), key=lambda entry: -entry[1])[:self._top_k])
+        self._floor = None
+
+    def load(self, snapshot: dict) -> None:
+        """A method restoring the sketch from a snapshot.
+
+        Snapshots taken with other dimensions are ignored.
+
+        Args:
+            snapshot (dict): The values returned by `dump`.
+        """
+        counters = array("d")
+        counters.frombytes(snapshot["counters"])
+        if len(counters) != len(self._counters):
+            logger.warning("Trending snapshot ignored: sketch dimensions changed")
+            return
+
+        self._counters = counters
+        self._flushed = array("d", counters)
+        self._landmark = snapshot["landmark"]
+        self._top = {event_id: estimate for event_id, estimate in json.loads(snapshot["top"])}
+        self._floor = None
+
+    def _slots(self, event_id: int) -> list[int]:
+        """A private method getting the counters of an event, one per row.
+
+        Args:
+            event_id (int): The id of the event.
+
+        Returns:
+            list[int]: The indexes of the counters.
+        """
+        return [
+            row * self._width + (a * event_id + b) % _PRIME % self._width
+            for row, (a, b) in enumerate(self._hashes)
+        ]
+
+    def _estimate(self, event_id: int) -> float:
+        """A private method getting the count estimate of an event.
+
+        Args:
+            event_id (int): The id of the event.
+
+        Returns:
+            float: The smallest of the event counters.
+        """
+        return min(self._counters[slot] for slot in self._slots(event_id))
+
+    def _offer(self, event_id: int, estimate: float) -> None:
+        """A private method updating the top-k with a new estimate.
+
+        Args:
+            event_id (int): The id of the event.
+            estimate (float): The current estimate of the event.
+        """
+        if event_id in self._top or len(self._top) < self._top_k:
+            self._top[event_id] = estimate
+            if self._floor is not None and self._floor[1] == event_id:
+                self._floor = None
+            return
+
+        # Najsłabszy wpis liczony leniwie, tylko gdy trzeba go porównać
+        if self._floor is None:
+            weakest = min(self._top, key=self._top.__getitem__)
+            self._floor = (self._top[weakest], weakest)
+        if estimate > self._floor[0]:
+            del self._top[self._floor[1]]
+            self._top[event_id] = estimate
+            self._floor = None
+
+    def _rescale(self, now: float) -> None:
+        """A private method moving the landmark so the values stay finite.
+
+        Args:
+            now (float): The new landmark.
+        """
+        factor = 2 ** ((self._landmark - now) / self._half_life)
+        for slot in range(len(self._counters)):
+            self._counters[slot] *= factor
+            self._flushed[slot] *= factor
+        self._top = {event_id: estimate * factor for event_id, estimate in self._top.items()}
+        self._floor = None
+        self._landmark = now
+
+
+async def load_trending_snapshot(sketch: TrendingSketch) -> None:
+    """A function restoring the sketch from the last snapshot, if any.
+
+    Args:
+        sketch (TrendingSketch): The sketch to restore.
+    """
+    query = select(trending_snapshot_table).where(trending_snapshot_table.c.name == SNAPSHOT_NAME)
+    if snapshot := await database.fetch_one(query):
+        sketch.load(dict(snapshot))
+
+
+async def save_trending_snapshot(sketch: TrendingSketch) -> None:
+    """A function adding the counts recorded since the last save to the snapshot.
+
+    Workers share one snapshot row, so it is read and rewritten under a
+    row lock and each worker adds only its own new counts.
+
+    Args:
+        sketch (TrendingSketch): The sketch to store.
+    """
+    changes = sketch.changes()
+    stored = sketch.blank()
+    async with database.transaction():
+        # Pusty wiersz przy pierwszym zapisie, aby zawsze było co zablokować
+        await database.execute(
+            insert(trending_snapshot_table)
+            .values(name=SNAPSHOT_NAME, taken_at=datetime.now(timezone.utc), **stored.dump())
+            .on_conflict_do_nothing(index_elements=[trending_snapshot_table.c.name])
+        )
+        snapshot = await database.fetch_one(
+            select(trending_snapshot_table)
+            .where(trending_snapshot_table.c.name == SNAPSHOT_NAME)
+            .with_for_update()
+        )
+        stored.load(dict(snapshot))
+        stored.merge(changes)
+        await database.execute(
+            update(trending_snapshot_table)
+            .where(trending_snapshot_table.c.name == SNAPSHOT_NAME)
+            .values(taken_at=datetime.now(timezone.utc), **stored.dump())
+        )
+
+    sketch.flushed(changes)
+
+
+async def run_trending_snapshot(sketch: TrendingSketch) -> None:
+    """Function snapshotting the sketch on a schedule.
+
+    Args:
+        sketch (TrendingSketch): The sketch to store.
+    """
+    while True:
+        await asyncio.sleep(config.TRENDING_SNAPSHOT_SECONDS)
+        try:
+            await save_trending_snapshot(sketch)
+        except (OSError, PostgresError) as e:
+            logger.warning("Trending snapshot failed: %s", e)
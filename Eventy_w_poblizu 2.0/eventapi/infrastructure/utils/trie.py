@@ -0,0 +1,115 @@
+"""A module containing the in-memory prefix index used for autocomplete."""
+
+from typing import Hashable, Iterable
+
+
+class _Node:
+    """A node of the trie, keyed by casefolded characters."""
+
+    __slots__ = ("children", "entries")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        # klucz rekordu -> oryginalna nazwa kończąca się w tym węźle
+        self.entries: dict[Hashable, str] = {}
+
+
+class PrefixIndex:
+    """A case-insensitive trie mapping names to the keys of their records.
+
+    Every key has at most one name, so adding a key again renames it. The
+    index is meant for a single event loop, so it does no locking.
+    """
+
+    def __init__(self) -> None:
+        """The initializer of the index."""
+        self._root = _Node()
+        self._names: dict[Hashable, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def replace(self, items: Iterable[tuple[Hashable, str]]) -> None:
+        """A method swapping the whole content of the index.
+
+        Args:
+            items (Iterable[tuple[Hashable, str]]): The keys and names.
+        """
+        root = _Node()
+        names = {}
+        for key, name in items:
+            self._insert(root, key, name)
+            names[key] = name
+
+        self._root, self._names = root, names
+
+    def add(self, key: Hashable, name: str) -> None:
+        """A method adding or renaming a record.
+
+        Args:
+            key (Hashable): The key of the record.
+            name (str): The name of the record.
+        """
+        self.discard(key)
+        self._insert(self._root, key, name)
+        self._names[key] = name
+
+    def discard(self, key: Hashable) -> None:
+        """A method removing a record if present.
+
+        Args:
+            key (Hashable): The key of the record.
+        """
+        name = self._names.pop(key, None)
+        if name is None:
+            return
+
+        chars = name.casefold()
+        path = [self._root]
+        for char in chars:
+            path.append(path[-1].children[char])
+        del path[-1].entries[key]
+
+        # Usuwanie pustych gałęzi od liścia w górę
+        for depth in range(len(chars), 0, -1):
+            if path[depth].children or path[depth].entries:
+                break
+            del path[depth - 1].children[chars[depth - 1]]
+
+    def search(self, prefix: str, limit: int) -> list[tuple[Hashable, str]]:
+        """A method getting records whose names start with the prefix.
+
+        Args:
+            prefix (str): The prefix, compared case-insensitively.
+            limit (int): The maximum number of records.
+
+        Returns:
+            list[tuple[Hashable, str]]: Keys and names in alphabetical order.
+        """
+        node = self._root
+        for char in prefix.casefold():
+            if (node := node.children.get(char)) is None:
+                return []
+
+        found: list[tuple[Hashable, str]] = []
+        stack = [node]
+        while stack and len(found) < limit:
+            node = stack.pop()
+            found.extend(sorted(node.entries.items(), key=lambda entry: entry[1]))
+            stack.extend(node.children[char] for char in sorted(node.children, reverse=True))
+
+        return found[:limit]
+
+    @staticmethod
+    def _insert(root: _Node, key: Hashable, name: str) -> None:
+        """A private method inserting a record below the given root.
+
+        Args:
+            root (_Node): The root of the trie.
+            key (Hashable): The key of the record.
+            name (str): The name of the record.
+        """
+        node = root
+        for char in name.casefold():
+            node = node.children.setdefault(char, _Node())
+        node.entries[key] = name
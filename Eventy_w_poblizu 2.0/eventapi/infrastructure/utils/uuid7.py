@@ -0,0 +1,48 @@
+"""A module containing the time-ordered UUID generator."""
+
+import os
+import threading
+import time
+import uuid
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    """A function generating a time-ordered UUID (version 7, RFC 9562).
+
+    The first 48 bits hold the Unix time in milliseconds, so new keys are
+    appended at the right edge of B-tree indexes instead of random pages.
+    The 12-bit `rand_a` field is used as a counter keeping UUIDs generated
+    within the same millisecond ordered.
+
+    Returns:
+        uuid.UUID: The generated UUID.
+    """
+    global _last_ms, _counter
+
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _counter = int.from_bytes(os.urandom(2)) & 0x7FF
+        else:
+            _counter += 1
+            if _counter > 0xFFF:
+                # Licznik wyczerpany: pożyczamy kolejną milisekundę
+                _last_ms += 1
+                _counter = 0
+        timestamp, counter = _last_ms, _counter
+
+    random_bits = int.from_bytes(os.urandom(8)) & 0x3FFFFFFFFFFFFFFF
+    value = (
+        (timestamp & 0xFFFFFFFFFFFF) << 80
+        | 0x7 << 76
+        | counter << 64
+        | 0b10 << 62
+        | random_bits
+    )
+
+    return uuid.UUID(int=value)
@@ -1,64 +1,162 @@
-"""Main module of the app"""
-
-from contextlib import asynccontextmanager
-from typing import AsyncGenerator
-
-from fastapi import FastAPI, HTTPException, Request, Response, Depends
-from fastapi.exception_handlers import http_exception_handler
-from fastapi.security import OAuth2PasswordBearer, HTTPBearer
-from fastapi.openapi.models import OAuthFlows as OAuthFlowsModel
-from fastapi.openapi.models import OAuthFlowPassword
-from fastapi.security import OAuth2
-
-from eventapi.api.routers.event_router import router as event_router
-from eventapi.api.routers.location_router import router as location_router
-from eventapi.api.routers.user_router import router as user_router
-from eventapi.api.routers.review_router import router as review_router
-from eventapi.container import Container
-from eventapi.db import database, init_db
-
-container = Container()
-container.wire(modules=[
-    "eventapi.api.routers.event_router",
-    "eventapi.api.routers.location_router",
-    "eventapi.api.routers.user_router",
-    "eventapi.api.routers.review_router",
-])
-
-
-@asynccontextmanager
-async def lifespan(_: FastAPI) -> AsyncGenerator:
-    """Lifespan function working on app startup."""
-    await init_db()
-    await database.connect()
-    yield
-    await database.disconnect()
-
-
-app = FastAPI(lifespan=lifespan)
-
-# Dodanie HTTPBearer dla lepszego zabezpieczenia
-bearer_scheme = HTTPBearer()
-
-# Dodanie routerów
-app.include_router(event_router, prefix="/event")
-app.include_router(location_router, prefix="/location")
-app.include_router(user_router, prefix="/user")
-app.include_router(review_router, prefix="/router")
-
-@app.exception_handler(HTTPException)
-async def http_exception_handle_logging(
-        request: Request,
-        exception: HTTPException,
-) -> Response:
-    """A function handling http exceptions for logging purposes.
-
-    Args:
-        request (Request): The incoming HTTP request.
-        exception (HTTPException): A related exception.
-
-    Returns:
-        Response: The HTTP response.
-    """
-    return await http_exception_handler(request, exception)
-
+"""Main module of the app"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncGenerator
+
+from fastapi import FastAPI, HTTPException, Request, Response, Depends
+from fastapi.exception_handlers import http_exception_handler
+from fastapi.security import OAuth2PasswordBearer, HTTPBearer
+from fastapi.openapi.models import OAuthFlows as OAuthFlowsModel
+from fastapi.openapi.models import OAuthFlowPassword
+from fastapi.security import OAuth2
+from asyncpg.exceptions import PostgresError  # type: ignore
+
+from eventapi.api.routers.event_router import router as event_router
+from eventapi.api.routers.location_router import router as location_router
+from eventapi.api.routers.user_router import router as user_router
+from eventapi.api.routers.review_router import router as review_router
+from eventapi.api.utils.idempotency import IdempotencyMiddleware
+from eventapi.api.utils.ratelimit import RateLimitMiddleware
+from eventapi.config import config
+from eventapi.container import Container
+from eventapi.db import (
+    database,
+    read_database,
+    init_db,
+    maintain_event_partitions,
+    run_event_partition_maintenance,
+)
+from eventapi.infrastructure.utils.counters import flush_counters, run_counter_flush
+from eventapi.infrastructure.utils.idempotency import run_idempotency_prune
+from eventapi.infrastructure.utils.trending import (
+    load_trending_snapshot,
+    run_trending_snapshot,
+    save_trending_snapshot,
+)
+from eventapi.infrastructure.utils.revocation import (
+    load_revocations,
+    run_revocation_listener,
+)
+from eventapi.infrastructure.utils.password import (
+    log_password_benchmark,
+    start_password_pool,
+    shutdown_password_pool,
+)
+
+container = Container()
+container.wire(modules=[
+    "eventapi.api.routers.event_router",
+    "eventapi.api.routers.location_router",
+    "eventapi.api.routers.user_router",
+    "eventapi.api.routers.review_router",
+    "eventapi.api.utils.auth",
+    "eventapi.api.utils.loaders",
+])
+
+logger = logging.getLogger(__name__)
+
+
+async def run_leaderboard_refresh() -> None:
+    """Function keeping the event rankings up to date on a schedule."""
+    service = container.event_service()
+    while True:
+        await asyncio.sleep(config.LEADERBOARD_REFRESH_SECONDS)
+        try:
+            await service.refresh_leaderboard()
+        except (OSError, PostgresError) as e:
+            logger.warning("Leaderboard refresh failed: %s", e)
+
+
+async def load_suggestions() -> None:
+    """Function rebuilding the autocomplete indexes from the DB."""
+    await container.location_repository().load_suggestions()
+    await container.user_repository().load_suggestions()
+
+
+async def run_suggestion_refresh() -> None:
+    """Function rebuilding the autocomplete indexes on a schedule.
+
+    Every worker updates its indexes on its own writes, the rebuild picks
+    up writes made by the other workers.
+    """
+    while True:
+        await asyncio.sleep(config.SUGGEST_INDEX_REFRESH_SECONDS)
+        try:
+            await load_suggestions()
+        except (OSError, PostgresError) as e:
+            logger.warning("Autocomplete index refresh failed: %s", e)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncGenerator:
+    """Lifespan function working on app startup."""
+    await init_db()
+    await database.connect()
+    await read_database.connect()
+    await maintain_event_partitions()
+    start_password_pool()
+    await load_revocations()
+    await load_suggestions()
+    await container.event_service().refresh_leaderboard()
+    await load_trending_snapshot(container.trending())
+    background_tasks = [
+        asyncio.create_task(run_event_partition_maintenance()),
+        asyncio.create_task(run_revocation_listener()),
+        asyncio.create_task(log_password_benchmark()),
+        asyncio.create_task(run_suggestion_refresh()),
+        asyncio.create_task(run_idempotency_prune()),
+        asyncio.create_task(run_leaderboard_refresh()),
+        asyncio.create_task(run_counter_flush(container.event_counters())),
+        asyncio.create_task(run_trending_snapshot(container.trending())),
+    ]
+    yield
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    # Zapis liczników zebranych od ostatniego cyklu
+    try:
+        await flush_counters(container.event_counters())
+    except (OSError, PostgresError) as e:
+        logger.warning("Event counters flush failed: %s", e)
+    try:
+        await save_trending_snapshot(container.trending())
+    except (OSError, PostgresError) as e:
+        logger.warning("Trending snapshot failed: %s", e)
+    shutdown_password_pool()
+    await read_database.disconnect()
+    await database.disconnect()
+
+
+app = FastAPI(lifespan=lifespan)
+# Ostatnie dodane działa pierwsze: limit obejmuje też powtórzenia żądań
+app.add_middleware(IdempotencyMiddleware)
+app.add_middleware(RateLimitMiddleware)
+
+# Dodanie HTTPBearer dla lepszego zabezpieczenia
+bearer_scheme = HTTPBearer()
+
+# Dodanie routerów
+app.include_router(event_router, prefix="/event")
+app.include_router(location_router, prefix="/location")
+app.include_router(user_router, prefix="/user")
+app.include_router(review_router, prefix="/router")
+
+@app.exception_handler(HTTPException)
+async def http_exception_handle_logging(
+        request: Request,
+        exception: HTTPException,
+) -> Response:
+    """A function handling http exceptions for logging purposes.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        exception (HTTPException): A related exception.
+
+    Returns:
+        Response: The HTTP response.
+    """
+    return await http_exception_handler(request, exception)
+
@@ -0,0 +1,20 @@
+-- Licznik zapisanych uczestników w tabeli wydarzeń.
+-- Uruchomienie: psql -U postgres -d app -f migrations/event_participants.sql
+--
+-- Tabelę event_participants tworzy init_db, kolumnę istniejącej tabeli
+-- events trzeba dodać ręcznie. Licznik jest przeliczany z zapisów, więc
+-- skrypt można uruchomić ponownie w razie rozbieżności.
+
+BEGIN;
+
+ALTER TABLE events ADD COLUMN IF NOT EXISTS participant_count integer NOT NULL DEFAULT 0;
+
+LOCK TABLE event_participants IN SHARE MODE;
+
+UPDATE events
+SET participant_count = coalesce(
+    (SELECT count(*) FROM event_participants WHERE event_participants.event_id = events.id),
+    0
+);
+
+COMMIT;
@@ -0,0 +1,31 @@
+-- Wypełnienie agregatów ocen dla recenzji dodanych przed ich wprowadzeniem.
+-- Uruchomienie: psql -U postgres -d app -f migrations/event_ratings.sql
+--
+-- Tabelę event_ratings tworzy init_db, dalej utrzymuje ją ReviewRepository
+-- w tych samych zapytaniach, które zmieniają recenzje. Skrypt przelicza
+-- agregaty od zera, więc można go uruchomić ponownie w razie rozbieżności.
+
+BEGIN;
+
+LOCK TABLE reviews IN SHARE MODE;
+
+TRUNCATE event_ratings;
+
+INSERT INTO event_ratings (
+    event_id, review_count, rating_sum,
+    rating_1, rating_2, rating_3, rating_4, rating_5, updated_at
+)
+SELECT
+    event_id,
+    count(*),
+    sum(rating),
+    count(*) FILTER (WHERE rating = 1),
+    count(*) FILTER (WHERE rating = 2),
+    count(*) FILTER (WHERE rating = 3),
+    count(*) FILTER (WHERE rating = 4),
+    count(*) FILTER (WHERE rating = 5),
+    now()
+FROM reviews
+GROUP BY event_id;
+
+COMMIT;
@@ -0,0 +1,37 @@
+-- Wypełnienie projekcji event_read dla wydarzeń dodanych przed jej wprowadzeniem.
+-- Uruchomienie: psql -U postgres -d app -f migrations/event_read.sql
+--
+-- Tabelę i wyzwalacze tworzy init_db, dalej projekcję utrzymują wyzwalacze
+-- na events, locations, event_ratings i users. Skrypt przelicza projekcję
+-- od zera, więc można go uruchomić ponownie w razie rozbieżności.
+
+BEGIN;
+
+LOCK TABLE events, locations, event_ratings, users IN SHARE MODE;
+
+TRUNCATE event_read;
+
+INSERT INTO event_read (
+    id, region, name, description, start_time, end_time,
+    location_id, location_name, latitude, longitude, address,
+    max_participants, participant_count, user_id, organiser_name,
+    review_count, rating_sum, rating_1, rating_2, rating_3, rating_4, rating_5
+)
+SELECT
+    events.id, events.region, events.name, events.description, events.start_time, events.end_time,
+    events.location_id, locations.name, locations.latitude, locations.longitude, locations.address,
+    events.max_participants, events.participant_count, events.user_id, users.username,
+    coalesce(event_ratings.review_count, 0),
+    coalesce(event_ratings.rating_sum, 0),
+    coalesce(event_ratings.rating_1, 0),
+    coalesce(event_ratings.rating_2, 0),
+    coalesce(event_ratings.rating_3, 0),
+    coalesce(event_ratings.rating_4, 0),
+    coalesce(event_ratings.rating_5, 0)
+FROM events
+LEFT JOIN locations
+    ON locations.id = events.location_id AND locations.region = events.region
+LEFT JOIN users ON users.id = events.user_id
+LEFT JOIN event_ratings ON event_ratings.event_id = events.id;
+
+COMMIT;
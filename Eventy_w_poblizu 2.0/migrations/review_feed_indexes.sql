@@ -0,0 +1,25 @@
+-- Indeksy stronicowania kluczem recenzji dla istniejących baz.
+-- Uruchomienie: psql -U postgres -d app -f migrations/review_feed_indexes.sql
+--
+-- Nowe bazy dostają indeksy z init_db (create_all). Kanały recenzji
+-- wydarzenia i użytkownika czytają strony w kolejności (id) albo
+-- (rating, id), więc każda z nich ma własny indeks złożony. Stary indeks
+-- reviews.event_id jest prefiksem nowych i zostaje usunięty.
+-- Operacje CONCURRENTLY nie blokują zapisów, ale nie mogą działać
+-- w transakcji, dlatego skrypt nie używa BEGIN/COMMIT. Przerwane budowanie
+-- zostawia nieważny indeks - wtedy należy go usunąć i uruchomić skrypt ponownie.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_reviews_event_id_id
+    ON reviews (event_id, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_reviews_event_id_rating_id
+    ON reviews (event_id, rating, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_reviews_user_id_id
+    ON reviews (user_id, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_reviews_user_id_rating_id
+    ON reviews (user_id, rating, id);
+
+-- Dopiero po zbudowaniu zastępców, aby zapytania po event_id miały indeks
+DROP INDEX CONCURRENTLY IF EXISTS ix_reviews_event_id;
@@ -0,0 +1,12 @@
+-- Indeks wyszukiwania użytkowników po prefiksie nazwy dla istniejących baz.
+-- Uruchomienie: psql -U postgres -d app -f migrations/users_username_pattern.sql
+--
+-- Nowe bazy dostają indeks z init_db (create_all). Unikalny indeks
+-- users.username używa sortowania bazy, więc LIKE 'prefiks%' nie może go
+-- wykorzystać poza kolacją "C"; text_pattern_ops porównuje bajty.
+-- CREATE INDEX CONCURRENTLY nie blokuje zapisów, ale nie może działać
+-- w transakcji, dlatego skrypt nie używa BEGIN/COMMIT. Przerwane budowanie
+-- zostawia nieważny indeks - wtedy należy go usunąć i uruchomić skrypt ponownie.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_username_pattern
+    ON users (username text_pattern_ops);
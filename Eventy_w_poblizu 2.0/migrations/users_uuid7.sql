@@ -0,0 +1,57 @@
+-- Migracja istniejących użytkowników na klucze UUIDv7.
+-- Uruchomienie: psql -U postgres -d app -f migrations/users_uuid7.sql
+--
+-- Nowe konta dostają UUIDv7 z aplikacji (UserRepository.register_user).
+-- Skrypt przepisuje klucze istniejących kont i przebudowuje indeksy
+-- rozbite przez losowe wstawienia. Tabela users nie przechowuje daty
+-- utworzenia konta, a losowy klucz v4 jej nie niesie, więc nowe klucze
+-- nie odtwarzają kolejności zakładania kont.
+-- Uwaga: wydane wcześniej tokeny zawierają stary identyfikator w "sub",
+-- więc po migracji użytkownicy muszą zalogować się ponownie.
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION uuid7(ts timestamptz DEFAULT clock_timestamp())
+RETURNS uuid AS $$
+    -- 48 bitów czasu w ms w miejsce początku losowego UUID, wersja 4 -> 7
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(
+                    uuid_send(gen_random_uuid())
+                    PLACING substring(int8send(floor(extract(epoch FROM ts) * 1000)::bigint) FROM 3)
+                    FROM 1 FOR 6
+                ),
+                52, 1
+            ),
+            53, 1
+        ),
+        'hex'
+    )::uuid;
+$$ LANGUAGE sql VOLATILE;
+
+-- Klucze obce muszą podążać za zmianą users.id
+ALTER TABLE events DROP CONSTRAINT IF EXISTS events_user_id_fkey;
+ALTER TABLE events ADD CONSTRAINT events_user_id_fkey
+    FOREIGN KEY (user_id) REFERENCES users (id) ON UPDATE CASCADE;
+
+ALTER TABLE reviews DROP CONSTRAINT IF EXISTS reviews_user_id_fkey;
+ALTER TABLE reviews ADD CONSTRAINT reviews_user_id_fkey
+    FOREIGN KEY (user_id) REFERENCES users (id) ON UPDATE CASCADE;
+
+-- Każde konto dostaje osobną milisekundę sprzed migracji, więc stare klucze
+-- są unikalne co do czasu i poprzedzają klucze nowych kont
+WITH ordered AS (
+    SELECT id, row_number() OVER (ORDER BY id) AS position
+    FROM users
+    WHERE substring(id::text FROM 15 FOR 1) <> '7'
+)
+UPDATE users
+SET id = uuid7(clock_timestamp() - interval '1 day' + ordered.position * interval '1 millisecond')
+FROM ordered
+WHERE users.id = ordered.id;
+
+COMMIT;
+
+-- Poza transakcją: usunięcie rozrostu indeksów po losowych wstawieniach
+REINDEX TABLE CONCURRENTLY users;
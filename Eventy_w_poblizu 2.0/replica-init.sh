@@ -0,0 +1,3 @@
+#!/bin/sh
+# Pozwala kontenerowi db_replica strumieniować WAL z bazy głównej.
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -0,0 +1,125 @@
+"""Concurrency tests of event registration against a live database.
+
+The tests create and remove their own rows, but should still be run
+against a disposable database configured with the DB_* variables:
+
+    DB_HOST=localhost DB_NAME=app DB_USER=postgres DB_PASSWORD=postgres \
+        python -m pytest tests
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import func, select
+
+from eventapi.config import config
+from eventapi.db import (
+    database,
+    engine,
+    ensure_event_partition,
+    event_participant_table,
+    event_table,
+    event_waitlist_table,
+    init_db,
+    user_table,
+)
+from eventapi.infrastructure.dto.participantdto import ParticipantDTO
+from eventapi.infrastructure.repositories.eventdb import EventRepository
+from eventapi.infrastructure.utils import geohash
+
+pytestmark = pytest.mark.skipif(not config.DB_HOST, reason="DB_HOST is not configured")
+
+ROUNDS = 100
+
+
+async def _create_user() -> UUID:
+    """Function inserting a throwaway user.
+
+    Returns:
+        UUID: The id of the user.
+    """
+    name = f"waitlist-{uuid4().hex}"
+    return await database.execute(
+        user_table.insert()
+        .values(username=name, email=f"{name}@example.com", password="x")
+        .returning(user_table.c.id)
+    )
+
+
+async def _cancel_while_registering(rounds: int) -> list[tuple]:
+    """Function racing a sign-up for a full event with a cancellation.
+
+    Every round creates an event with one seat taken by the holder, then
+    the waiter signs up while the holder cancels. Whichever runs first,
+    the waiter must end up with the seat.
+
+    Args:
+        rounds (int): The number of raced events.
+
+    Returns:
+        list[tuple]: Per round: the counter, the participants and the
+            number of waitlist entries.
+    """
+    await init_db()
+    # Pula silnika jest związana z pętlą zdarzeń tego testu
+    await engine.dispose()
+    await database.connect()
+    repository = EventRepository()
+    start_time = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=30)
+    event_ids = []
+    outcomes = []
+    try:
+        await ensure_event_partition(geohash.NO_REGION, start_time)
+        holder, waiter = await _create_user(), await _create_user()
+        for _ in range(rounds):
+            event_id = await database.execute(
+                event_table.insert()
+                .values(
+                    region=geohash.NO_REGION,
+                    name="Waitlist race",
+                    start_time=start_time,
+                    end_time=start_time + timedelta(hours=1),
+                    max_participants=1,
+                    user_id=holder,
+                )
+                .returning(event_table.c.id)
+            )
+            event_ids.append(event_id)
+            assert isinstance(await repository.register_participant(event_id, holder), ParticipantDTO)
+
+            await asyncio.gather(
+                repository.register_participant(event_id, waiter),
+                repository.unregister_participant(event_id, holder),
+            )
+
+            count = await database.fetch_val(
+                select(event_table.c.participant_count).where(event_table.c.id == event_id)
+            )
+            participants = await database.fetch_all(
+                select(event_participant_table.c.user_id)
+                .where(event_participant_table.c.event_id == event_id)
+            )
+            waiting = await database.fetch_val(
+                select(func.count())
+                .select_from(event_waitlist_table)
+                .where(event_waitlist_table.c.event_id == event_id)
+            )
+            outcomes.append((count, [row["user_id"] for row in participants], waiting, waiter))
+    finally:
+        for table in (event_participant_table, event_waitlist_table):
+            await database.execute(table.delete().where(table.c.event_id.in_(event_ids)))
+        await database.execute(event_table.delete().where(event_table.c.id.in_(event_ids)))
+        await database.execute(user_table.delete().where(user_table.c.username.like("waitlist-%")))
+        await database.disconnect()
+
+    return outcomes
+
+
+def test_freed_seat_goes_to_concurrent_signup() -> None:
+    """A seat freed during a sign-up for a full event is never lost."""
+    outcomes = asyncio.run(_cancel_while_registering(ROUNDS))
+
+    for count, participants, waiting, waiter in outcomes:
+        assert (count, participants, waiting) == (1, [waiter], 0)
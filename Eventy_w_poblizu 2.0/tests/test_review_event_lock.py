@@ -0,0 +1,133 @@
+"""Concurrency tests of reviews written while their event is deleted.
+
+Like the other database tests, they run against a disposable database
+configured with the DB_* variables:
+
+    DB_HOST=localhost DB_NAME=app DB_USER=postgres DB_PASSWORD=postgres \
+        python -m pytest tests
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from eventapi.config import config
+from eventapi.core.domain.review import ReviewBroker
+from eventapi.db import (
+    database,
+    engine,
+    ensure_event_partition,
+    event_rating_table,
+    event_table,
+    init_db,
+    review_table,
+    user_table,
+)
+from eventapi.infrastructure.repositories.eventdb import EventRepository
+from eventapi.infrastructure.repositories.reviewdb import ReviewRepository
+from eventapi.infrastructure.utils import geohash
+
+pytestmark = pytest.mark.skipif(not config.DB_HOST, reason="DB_HOST is not configured")
+
+ROUNDS = 100
+
+
+async def _write_while_deleting(rounds: int) -> list[tuple[int, int]]:
+    """Function racing review writes with the deletion of their event.
+
+    Every round creates an event, then adds a review for it and moves an
+    existing review to it while the event is deleted. Whichever runs
+    first, nothing may point at the deleted event afterwards.
+
+    Args:
+        rounds (int): The number of raced events.
+
+    Returns:
+        list[tuple[int, int]]: Per round: the number of reviews and of
+            rating aggregates left for the deleted event.
+    """
+    await init_db()
+    # Pula silnika jest związana z pętlą zdarzeń tego testu
+    await engine.dispose()
+    await database.connect()
+    events = EventRepository()
+    reviews = ReviewRepository()
+    start_time = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=30)
+    name = f"reviews-{uuid4().hex}"
+    user_id = None
+    kept_id = None
+    event_ids = []
+    outcomes = []
+    try:
+        await ensure_event_partition(geohash.NO_REGION, start_time)
+        user_id = await database.execute(
+            user_table.insert()
+            .values(username=name, email=f"{name}@example.com", password="x")
+            .returning(user_table.c.id)
+        )
+        insert_event = (
+            event_table.insert()
+            .values(
+                region=geohash.NO_REGION,
+                name="Review race",
+                start_time=start_time,
+                end_time=start_time + timedelta(hours=1),
+                user_id=user_id,
+            )
+            .returning(event_table.c.id)
+        )
+        kept_id = await database.execute(insert_event)
+        moved = await reviews.add_review(
+            ReviewBroker(content="moved", rating=4, event_id=kept_id, user_id=user_id)
+        )
+        for _ in range(rounds):
+            event_id = await database.execute(insert_event)
+            event_ids.append(event_id)
+
+            await asyncio.gather(
+                events.delete_event(event_id),
+                reviews.add_review(
+                    ReviewBroker(content="new", rating=5, event_id=event_id, user_id=user_id)
+                ),
+                reviews.update_review(
+                    moved.id,
+                    ReviewBroker(content="moved", rating=4, event_id=event_id, user_id=user_id),
+                ),
+                return_exceptions=True,
+            )
+
+            left = await database.fetch_val(
+                select(func.count()).select_from(review_table).where(review_table.c.event_id == event_id)
+            )
+            rated = await database.fetch_val(
+                select(func.count())
+                .select_from(event_rating_table)
+                .where(event_rating_table.c.event_id == event_id)
+            )
+            outcomes.append((left, rated))
+            # Recenzja wraca do zachowanego wydarzenia przed kolejną rundą
+            await reviews.update_review(
+                moved.id,
+                ReviewBroker(content="moved", rating=4, event_id=kept_id, user_id=user_id),
+            )
+    finally:
+        await database.execute(review_table.delete().where(review_table.c.user_id == user_id))
+        for table, column in ((event_rating_table, "event_id"), (event_table, "id")):
+            await database.execute(
+                table.delete().where(table.c[column].in_([kept_id, *event_ids]))
+            )
+        await database.execute(user_table.delete().where(user_table.c.username == name))
+        await database.disconnect()
+
+    return outcomes
+
+
+def test_deleted_event_keeps_no_reviews() -> None:
+    """Reviews written during an event deletion never outlive the event."""
+    outcomes = asyncio.run(_write_while_deleting(ROUNDS))
+
+    assert all(outcome == (0, 0) for outcome in outcomes), outcomes